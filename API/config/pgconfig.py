@@ -10,3 +10,29 @@ pg_config = {
     "dbname": os.environ.get("DB_NAME"),
     "port": int(os.environ.get("DB_PORT")),
 }
+
+# Process-wide connection pool settings (see API/config/pgpool.py)
+pool_config = {
+    "minconn": int(os.environ.get("DB_POOL_MIN", 1)),
+    "maxconn": int(os.environ.get("DB_POOL_MAX", 10)),
+    # seconds to wait for a free connection before giving up
+    "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 5)),
+    # connections idle longer than this are pinged before being handed out
+    "healthcheck_interval": float(os.environ.get("DB_POOL_HEALTHCHECK", 30)),
+}
+
+# Syllabus vector search defaults (see SyllabusDAO.getFragments)
+vector_config = {
+    # "l2", "cosine" or "ip"; must match the opclass of the index to use it
+    "metric": os.environ.get("VECTOR_METRIC", "l2"),
+    # HNSW candidate list size at query time (pgvector default is 40)
+    "ef_search": int(os.environ.get("VECTOR_EF_SEARCH", 40)),
+    # IVFFlat lists scanned per query (pgvector default is 1)
+    "probes": int(os.environ.get("VECTOR_PROBES", 10)),
+    # "pgvector" searches in Postgres, "memory" in a NumPy matrix inside the process
+    "backend": os.environ.get("VECTOR_BACKEND", "pgvector"),
+    # optional .npy cache the in-process matrix is memory-mapped from
+    "index_path": os.environ.get("VECTOR_INDEX_PATH"),
+    # seconds between syllabus_version checks of the in-process index
+    "check_interval": float(os.environ.get("VECTOR_INDEX_CHECK", 5)),
+}
@@ -0,0 +1,163 @@
+import threading
+import time
+
+import psycopg2
+from psycopg2 import pool
+
+from API.config.pgconfig import pg_config, pool_config
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection became available within the borrow timeout."""
+
+
+class WarmConnectionPool(pool.ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool that keeps every returned connection open.
+
+    psycopg2 closes connections returned beyond `minconn`, so under load a
+    DB_POOL_MIN=1 pool would still connect on almost every borrow. Here
+    `minconn` only sets how many connections are opened up front; once
+    opened, up to `maxconn` stay idle in the pool for the next borrow.
+    """
+
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        # _putconn keeps a returned connection while fewer than minconn sit idle
+        self.minconn = maxconn
+
+
+class PgPool:
+    """
+    Thread-safe PostgreSQL connection pool shared by every DAO in the process.
+
+    Wraps a WarmConnectionPool and adds a bounded wait when the
+    pool is exhausted, a liveness check on connections that sat idle, and
+    counters that can be exposed through the API.
+    """
+
+    def __init__(self, minconn, maxconn, timeout=5.0, healthcheck_interval=30.0):
+        dsn = "dbname=%s user=%s password=%s port=%d host=%s" % (
+            pg_config["dbname"],
+            pg_config["user"],
+            pg_config["password"],
+            pg_config["port"],
+            pg_config["host"],
+        )
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.healthcheck_interval = healthcheck_interval
+        self._pool = WarmConnectionPool(minconn, maxconn, dsn)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._last_used = {}
+        # Mirrors WarmConnectionPool, which keeps at most maxconn idle connections
+        self._in_use = 0
+        self._idle = minconn
+        self._stats = {
+            "borrowed": 0,
+            "returned": 0,
+            "discarded": 0,
+            "timeouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+        }
+
+    def getconn(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["waits"] += 1
+            if not self._slots.acquire(timeout=timeout):
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                raise PoolTimeout(
+                    "No database connection available after %.1f seconds" % timeout
+                )
+        try:
+            conn = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._stats["borrowed"] += 1
+            self._stats["wait_seconds"] += time.monotonic() - start
+            self._in_use += 1
+        return conn
+
+    def putconn(self, conn, close=False):
+        with self._lock:
+            self._last_used[id(conn)] = time.monotonic()
+            self._stats["returned"] += 1
+            self._in_use -= 1
+            if close:
+                self._stats["discarded"] += 1
+            elif not conn.closed:
+                self._idle = min(self._idle + 1, self.maxconn)
+        try:
+            # psycopg2 rolls back any open transaction before pooling the connection
+            self._pool.putconn(conn, close=close or bool(conn.closed))
+        finally:
+            self._slots.release()
+
+    def _checkout(self):
+        # Stale idle connections are dropped until a live one (or a new one) comes out
+        for _ in range(self.maxconn):
+            conn = self._take()
+            if self._is_healthy(conn):
+                return conn
+            with self._lock:
+                self._stats["discarded"] += 1
+                self._last_used.pop(id(conn), None)
+            self._pool.putconn(conn, close=True)
+        return self._take()
+
+    def _take(self):
+        conn = self._pool.getconn()
+        with self._lock:
+            self._idle = max(self._idle - 1, 0)
+        return conn
+
+    def _is_healthy(self, conn):
+        if conn.closed:
+            return False
+        last_used = self._last_used.get(id(conn))
+        if last_used is None or time.monotonic() - last_used < self.healthcheck_interval:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1;")
+            cursor.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def stats(self):
+        with self._lock:
+            result = dict(self._stats)
+            result["in_use"] = self._in_use
+            result["idle"] = self._idle
+        result["wait_seconds"] = round(result["wait_seconds"], 4)
+        result["minconn"] = self.minconn
+        result["maxconn"] = self.maxconn
+        return result
+
+    def closeall(self):
+        self._pool.closeall()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Returns the process-wide pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PgPool(**pool_config)
+    return _pool
@@ -0,0 +1,76 @@
+from psycopg2 import sql
+
+from API.config.pgpool import get_pool
+
+
+class BaseDAO:
+    """
+    Borrows a connection from the shared pool for the lifetime of the DAO.
+
+    Handlers create a DAO per request, so the connection goes back to the pool
+    as soon as the DAO is released (or explicitly via close()/with-block).
+    """
+
+    def __init__(self):
+        self._pool = get_pool()
+        self.conn = self._pool.getconn()
+
+    def close(self):
+        conn = getattr(self, "conn", None)
+        if conn is not None:
+            self.conn = None
+            self._pool.putconn(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def getPage(self, table, keys, fields, after=None, limit=100):
+        """
+        Keyset-paginated, projected read of `table` ordered by its `keys`.
+
+        `fields` and `keys` must come from the caller's column whitelist;
+        `after` is the tuple of key values of the last row already seen.
+        """
+        cursor = self.conn.cursor()
+        columns = sql.SQL(", ").join(sql.Identifier(f) for f in fields)
+        keyColumns = sql.SQL(", ").join(sql.Identifier(k) for k in keys)
+        query = sql.SQL("SELECT {columns} FROM {table}").format(
+            columns=columns, table=sql.Identifier(table)
+        )
+        params = []
+        if after is not None:
+            placeholders = sql.SQL(", ").join(sql.Placeholder() for _ in keys)
+            query += sql.SQL(" WHERE ({keys}) > ({values})").format(
+                keys=keyColumns, values=placeholders
+            )
+            params.extend(after)
+        query += sql.SQL(" ORDER BY {keys} LIMIT %s;").format(keys=keyColumns)
+        params.append(limit)
+        cursor.execute(query, params)
+        result = cursor.fetchall()
+        self.conn.commit()
+        return result
+
+    def streamQuery(self, name, query, params=(), itersize=2000):
+        """
+        Yields rows from a server-side (named) cursor, fetching `itersize`
+        rows per round trip so memory stays flat for large result sets.
+        """
+        cursor = self.conn.cursor(name=name)
+        cursor.itersize = itersize
+        try:
+            cursor.execute(query, params)
+            for row in cursor:
+                yield row
+        finally:
+            cursor.close()
+            self.conn.commit()
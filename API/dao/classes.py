@@ -1,18 +1,8 @@
-from API.config.pgconfig import pg_config
-import psycopg2
+from API.dao.base import BaseDAO
 from psycopg2 import IntegrityError
 
 
-class ClassDAO:
-    def __init__(self):
-        connection_url = "dbname=%s user=%s password=%s port=%d host=%s" % (
-            pg_config["dbname"],
-            pg_config["user"],
-            pg_config["password"],
-            pg_config["port"],
-            pg_config["host"],
-        )
-        self.conn = psycopg2.connect(connection_url)
+class ClassDAO(BaseDAO):
 
     def getAllClasses(self):
         cursor = self.conn.cursor()
@@ -143,4 +133,15 @@ class ClassDAO:
         result=cursor.fetchone()
         if result:
             return result[0]
-        return None
\ No newline at end of file
+        return None
+
+    def getClassesPage(self, fields, after=None, limit=100):
+        return self.getPage("class", ["cid"], fields, after, limit)
+
+    def streamClasses(self, itersize=2000):
+        query = """
+        SELECT cid, cname, ccode, cdesc, term, years, cred, csyllabus
+        FROM class
+        ORDER BY cid;
+        """
+        return self.streamQuery("export_classes", query, itersize=itersize)
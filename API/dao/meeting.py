@@ -1,17 +1,7 @@
-from API.config.pgconfig import pg_config
-import psycopg2
+from API.dao.base import BaseDAO
 
 
-class MeetingDAO:
-    def __init__(self):
-        connection_url = "dbname=%s user=%s password=%s port=%d host=%s" % (
-            pg_config["dbname"],
-            pg_config["user"],
-            pg_config["password"],
-            pg_config["port"],
-            pg_config["host"],
-        )
-        self.conn = psycopg2.connect(connection_url)
+class MeetingDAO(BaseDAO):
 
     def getAllMeetings(self):
         cursor = self.conn.cursor()
@@ -98,3 +88,6 @@ class MeetingDAO:
             return -1  # Not found
         self.conn.commit()
         return mid
+
+    def getMeetingsPage(self, fields, after=None, limit=100):
+        return self.getPage("meeting", ["mid"], fields, after, limit)
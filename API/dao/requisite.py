@@ -1,16 +1,6 @@
-from API.config.pgconfig import pg_config
-import psycopg2
+from API.dao.base import BaseDAO
 
-class RequisiteDAO:
-    def __init__(self):
-        connection_url = "dbname=%s user=%s password=%s port=%d host=%s" % (
-            pg_config["dbname"],
-            pg_config["user"],
-            pg_config["password"],
-            pg_config["port"],
-            pg_config["host"]
-        )
-        self.conn = psycopg2.connect(connection_url)
+class RequisiteDAO(BaseDAO):
 
 
 # CRUD Operations for Requisites 
@@ -41,16 +31,35 @@ class RequisiteDAO:
         return result
     
     def insertRequisite(self,classid,reqid,prereq):
+        """
+        Inserts classid -> reqid unless reqid already reaches classid through
+        existing requisites (the edge would close a cycle); returns -1 then.
+        Requisite inserts take a transaction-level advisory lock first, so
+        two API workers cannot each add one half of a cycle.
+        """
         cursor = self.conn.cursor()
         query = """
+            WITH RECURSIVE reachable(cid) AS (
+                SELECT %(reqid)s
+                UNION
+                SELECT r.reqid
+                FROM requisite r
+                INNER JOIN reachable ON r.classid = reachable.cid
+            )
             INSERT INTO requisite (classid, reqid, prereq)
-            VALUES (%s, %s, %s)
+            SELECT %(classid)s, %(reqid)s, %(prereq)s
+            WHERE NOT EXISTS (SELECT 1 FROM reachable WHERE cid = %(classid)s)
             RETURNING classid, reqid, prereq;
         """
-        cursor.execute(query, (classid, reqid, prereq))
-        result = cursor.fetchone()
-        self.conn.commit()
-        return result 
+        try:
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext('requisite'));")
+            cursor.execute(query, {"classid": classid, "reqid": reqid, "prereq": prereq})
+            result = cursor.fetchone()
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        return result if result is not None else -1
     
     def deleteRequisite(self, classid, reqid):
         cursor = self.conn.cursor()
@@ -89,14 +98,5 @@ class RequisiteDAO:
         result = cursor.fetchone()
         return result 
     
-    def twoCycleExist(self,classid, reqid):
-        cursor = self.conn.cursor()
-        query = """
-            SELECT 1
-            FROM requisite
-            WHERE classid = %s AND reqid = %s;
-        """
-        cursor.execute(query, (reqid, classid))
-        result = cursor.fetchone()
-        cursor.close()
-        return result   
\ No newline at end of file
+    def getRequisitesPage(self, fields, after=None, limit=100):
+        return self.getPage("requisite", ["classid", "reqid"], fields, after, limit)
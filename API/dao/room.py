@@ -1,16 +1,6 @@
-from API.config.pgconfig import pg_config
-import psycopg2
+from API.dao.base import BaseDAO
 
-class RoomDAO:
-    def __init__(self):
-        connection_url = "dbname=%s user=%s password=%s port=%d host=%s" % (
-            pg_config["dbname"],
-            pg_config["user"],
-            pg_config["password"],
-            pg_config["port"],
-            pg_config["host"],
-        )
-        self.conn = psycopg2.connect(connection_url)
+class RoomDAO(BaseDAO):
     def getAllRooms(self):
         cursor=self.conn.cursor()
         query="""
@@ -84,4 +74,6 @@ class RoomDAO:
             return -1
         self.conn.commit()
         return rid
-    
\ No newline at end of file
+
+    def getRoomsPage(self, fields, after=None, limit=100):
+        return self.getPage("room", ["rid"], fields, after, limit)
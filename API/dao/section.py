@@ -1,23 +1,16 @@
-from API.config.pgconfig import pg_config
-import psycopg2
-
-
-class SectionDAO:
-    def __init__(self):
-        connection_url = "dbname=%s user=%s password=%s port=%d host=%s" % (
-            pg_config["dbname"],
-            pg_config["user"],
-            pg_config["password"],
-            pg_config["port"],
-            pg_config["host"],
-        )
-        self.conn = psycopg2.connect(connection_url)
+from API.dao.base import BaseDAO
+from psycopg2 import IntegrityError
+from psycopg2.extras import execute_values
+
+
+class SectionDAO(BaseDAO):
 
     def getAllSections(self):
         cursor = self.conn.cursor()
         query = """
         SELECT sid, roomid, cid, mid, semester, years, capacity
-        FROM section;
+        FROM section
+        ORDER BY sid;
         """
         cursor.execute(query)
         result = []
@@ -141,3 +134,231 @@ class SectionDAO:
         result = cursor.fetchone()
         self.conn.commit()
         return result  # returns conflicting sid or None
+
+    def getSectionsPage(self, fields, after=None, limit=100):
+        return self.getPage("section", ["sid"], fields, after, limit)
+
+    def streamSections(self, itersize=2000):
+        query = """
+        SELECT sid, roomid, cid, mid, semester, years, capacity
+        FROM section
+        ORDER BY sid;
+        """
+        return self.streamQuery("export_sections", query, itersize=itersize)
+
+    # Validated write path: every check and the write run in one statement, after lockRooms
+
+    VALIDATED_WRITE_CHECKS = """
+        r AS (
+            SELECT capacity FROM room WHERE rid = %(roomid)s
+        ),
+        conflict AS (
+            SELECT s.sid
+            FROM section AS s
+            INNER JOIN meeting AS m_existing ON s.mid = m_existing.mid
+            INNER JOIN meeting AS m_new ON m_new.mid = %(mid)s
+            WHERE s.roomid = %(roomid)s
+            AND (%(sid)s IS NULL OR s.sid <> %(sid)s)
+            AND m_existing.cdays = m_new.cdays
+            AND m_existing.starttime < m_new.endtime
+            AND m_existing.endtime > m_new.starttime
+            LIMIT 1
+        ),
+        checks AS (
+            SELECT
+                EXISTS (SELECT 1 FROM class WHERE cid = %(cid)s) AS class_ok,
+                EXISTS (SELECT 1 FROM meeting WHERE mid = %(mid)s) AS meeting_ok,
+                EXISTS (SELECT 1 FROM r) AS room_ok,
+                (SELECT capacity FROM r) AS room_capacity,
+                (SELECT sid FROM conflict) AS conflict_sid
+        )
+    """
+
+    VALIDATED_WRITE_ALLOWED = """
+        %(valid)s
+        AND checks.class_ok AND checks.meeting_ok AND checks.room_ok
+        AND %(capacity)s >= 0 AND %(capacity)s <= checks.room_capacity
+        AND checks.conflict_sid IS NULL
+    """
+
+    def insertSectionValidated(self, roomid, cid, mid, semester, years, capacity, valid=True):
+        """
+        Validates FKs, room capacity and schedule conflicts and inserts the
+        section in one statement. `valid` carries the caller's own checks;
+        when False nothing is written but the DB checks are still reported.
+        Returns a dict of check results plus the inserted row (sid is None
+        when nothing was inserted), or None on a database error.
+        """
+        query = "WITH" + self.VALIDATED_WRITE_CHECKS + """,
+        ins AS (
+            INSERT INTO section (roomid, cid, mid, semester, years, capacity)
+            SELECT %(roomid)s, %(cid)s, %(mid)s, %(semester)s, %(years)s, %(capacity)s
+            FROM checks
+            WHERE""" + self.VALIDATED_WRITE_ALLOWED + """
+            RETURNING sid, roomid, cid, mid, semester, years, capacity
+        )
+        SELECT checks.*, ins.*
+        FROM checks
+        LEFT JOIN ins ON TRUE;
+        """
+        params = {
+            "sid": None, "roomid": roomid, "cid": cid, "mid": mid,
+            "semester": semester, "years": years, "capacity": capacity, "valid": valid,
+        }
+        return self._validatedWrite(query, params)
+
+    def updateSectionValidated(self, sid, roomid, cid, mid, semester, years, capacity, valid=True):
+        """
+        Same as insertSectionValidated for an update of section `sid`. Also
+        reports whether the section exists and its previous semester/years.
+        """
+        query = "WITH" + self.VALIDATED_WRITE_CHECKS + """,
+        target AS (
+            SELECT sid, semester AS old_semester, years AS old_years
+            FROM section
+            WHERE sid = %(sid)s
+        ),
+        upd AS (
+            UPDATE section
+            SET roomid = %(roomid)s, cid = %(cid)s, mid = %(mid)s,
+                semester = %(semester)s, years = %(years)s, capacity = %(capacity)s
+            FROM checks
+            WHERE section.sid = %(sid)s AND""" + self.VALIDATED_WRITE_ALLOWED + """
+            RETURNING section.sid, section.roomid, section.cid, section.mid,
+                      section.semester, section.years, section.capacity
+        )
+        SELECT
+            EXISTS (SELECT 1 FROM target) AS section_ok,
+            (SELECT old_semester FROM target) AS old_semester,
+            (SELECT old_years FROM target) AS old_years,
+            checks.*, upd.*
+        FROM checks
+        LEFT JOIN upd ON TRUE;
+        """
+        params = {
+            "sid": sid, "roomid": roomid, "cid": cid, "mid": mid,
+            "semester": semester, "years": years, "capacity": capacity, "valid": valid,
+        }
+        return self._validatedWrite(query, params)
+
+    def _validatedWrite(self, query, params):
+        cursor = self.conn.cursor()
+        try:
+            self.lockRooms(cursor, [params["roomid"]])
+            cursor.execute(query, params)
+            row = cursor.fetchone()
+            result = dict(zip([col[0] for col in cursor.description], row))
+            self.conn.commit()
+            return result
+        except IntegrityError as e:
+            # A concurrent write won the (roomid/cid, mid, semester, years) unique key
+            print("IntegrityError:", e)
+            self.conn.rollback()
+            return {"integrity_error": True}
+        except Exception as e:
+            print("DB error:", e)
+            self.conn.rollback()
+            return None
+
+    # Set-based lookups for bulk section creation
+
+    def getExistingClassIDs(self, cids):
+        cursor = self.conn.cursor()
+        query = """
+        SELECT cid
+        FROM class
+        WHERE cid = ANY(%s);
+        """
+        cursor.execute(query, (list(cids),))
+        result = {row[0] for row in cursor}
+        self.conn.commit()
+        return result
+
+    def getMeetingsByIDs(self, mids):
+        cursor = self.conn.cursor()
+        query = """
+        SELECT mid, cdays, starttime, endtime
+        FROM meeting
+        WHERE mid = ANY(%s);
+        """
+        cursor.execute(query, (list(mids),))
+        result = {row[0]: row[1:] for row in cursor}
+        self.conn.commit()
+        return result
+
+    def getRoomCapacities(self, roomids):
+        cursor = self.conn.cursor()
+        query = """
+        SELECT rid, capacity
+        FROM room
+        WHERE rid = ANY(%s);
+        """
+        cursor.execute(query, (list(roomids),))
+        result = {row[0]: row[1] for row in cursor}
+        self.conn.commit()
+        return result
+
+    def lockRooms(self, cursor, roomids):
+        """
+        Row-locks the rooms about to receive sections until the transaction
+        ends. Writers to the same room queue up here, and the write statement
+        that follows runs on a snapshot that already includes the previous
+        writer's sections, so the overlap check cannot miss them.
+        """
+        cursor.execute(
+            "SELECT rid FROM room WHERE rid = ANY(%s) ORDER BY rid FOR NO KEY UPDATE;",
+            (sorted({r for r in roomids if r is not None}),),
+        )
+
+    def insertSections(self, rows):
+        """
+        Inserts (roomid, cid, mid, semester, years, capacity) rows in one
+        statement and transaction. Rows that hit a unique key or overlap an
+        existing section of the same room (the `conflict` rule of the single
+        write path) are skipped; returns the inserted rows.
+        """
+        cursor = self.conn.cursor()
+        query = """
+        INSERT INTO section (roomid, cid, mid, semester, years, capacity)
+        SELECT v.roomid, v.cid, v.mid, v.semester, v.years, v.capacity
+        FROM (VALUES %s) AS v (roomid, cid, mid, semester, years, capacity)
+        INNER JOIN meeting AS m_new ON m_new.mid = v.mid
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM section AS s
+            INNER JOIN meeting AS m_existing ON s.mid = m_existing.mid
+            WHERE s.roomid = v.roomid
+            AND m_existing.cdays = m_new.cdays
+            AND m_existing.starttime < m_new.endtime
+            AND m_existing.endtime > m_new.starttime
+        )
+        ON CONFLICT DO NOTHING
+        RETURNING sid, roomid, cid, mid, semester, years, capacity;
+        """
+        try:
+            self.lockRooms(cursor, [row[0] for row in rows])
+            result = execute_values(
+                cursor, query, rows,
+                template="(%s::int, %s::int, %s::int, %s, %s, %s::int)",
+                page_size=len(rows), fetch=True,
+            )
+            self.conn.commit()
+            return result
+        except Exception as e:
+            print("DB error:", e)
+            self.conn.rollback()
+            return None
+
+    def getSectionsWithMeetings(self, cids, semester, years):
+        cursor = self.conn.cursor()
+        query = """
+        SELECT s.sid, s.cid, s.roomid, s.capacity, m.mid, m.cdays, m.starttime, m.endtime
+        FROM section AS s
+        INNER JOIN meeting AS m ON s.mid = m.mid
+        WHERE s.cid = ANY(%s) AND s.semester = %s AND s.years = %s
+        ORDER BY s.cid, m.starttime, s.sid;
+        """
+        cursor.execute(query, (list(cids), semester, years))
+        result = cursor.fetchall()
+        self.conn.commit()
+        return result
@@ -1,16 +1,45 @@
-from API.config.pgconfig import pg_config
-import psycopg2
-
-class SyllabusDAO:
-    def __init__(self):
-        connection_url = "dbname=%s user=%s password=%s port=%d host=%s" % (
-            pg_config["dbname"],
-            pg_config["user"],
-            pg_config["password"],
-            pg_config["port"],
-            pg_config["host"],
-        )
-        self.conn = psycopg2.connect(connection_url)
+import numpy as np
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+
+from API.config.pgconfig import vector_config
+from API.dao.base import BaseDAO
+
+# metric -> (distance operator, index operator class)
+VECTOR_METRICS={
+    "l2":("<->","vector_l2_ops"),
+    "cosine":("<=>","vector_cosine_ops"),
+    "ip":("<#>","vector_ip_ops"),
+}
+VECTOR_INDEX_METHODS={"hnsw","ivfflat"}
+
+
+def to_vector_literal(embedding):
+    """
+    pgvector input text for a query embedding. psycopg2 only sends text
+    parameters, so values are narrowed to float32 first, whose shortest
+    repr is about half as long as that of Python floats.
+
+    Unlike results (vector_send, decoded by from_vector_binary), query and
+    insert vectors stay text: pgvector's binary input (vector_recv) is only
+    reachable through the binary protocol, which psycopg2 does not use, and
+    there is no bytea-to-vector cast to route an adapter through.
+    """
+    return "["+",".join(map(str,np.asarray(embedding,dtype=np.float32)))+"]"
+
+
+def from_vector_binary(data):
+    """float32 array from vector_send() output: int16 dim, int16 unused, dim big-endian float4."""
+    if data is None:
+        return None
+    dim=int.from_bytes(data[:2],"big")
+    return np.frombuffer(data,dtype=">f4",count=dim,offset=4).astype(np.float32)
+
+
+# Embeddings are read with vector_send() and decoded by from_vector_binary instead of parsing text
+EMBEDDING_COLUMN={True:"vector_send(embedding_text)",False:"NULL"}
+
+class SyllabusDAO(BaseDAO):
     
     def insertChunk(self,courseid,chunk,embedding):
         cursor=self.conn.cursor()
@@ -23,51 +52,213 @@ class SyllabusDAO:
         chunkid=cursor.fetchone()[0]
         self.conn.commit()
         return chunkid
-    def getChunkByID(self,chunkid):
+    def decodeRows(self,rows):
+        # Rows keep the (chunkid, courseid, chunk, embedding) shape; embedding is a float32 array or None
+        return [row[:3]+(from_vector_binary(row[3]),) for row in rows]
+
+    def getChunkByID(self,chunkid,include_embedding=False):
         cursor=self.conn.cursor()
-        query="""
-        SELECT chunkid,courseid,chunk,embedding_text 
+        query=f"""
+        SELECT chunkid,courseid,chunk,{EMBEDDING_COLUMN[include_embedding]}
         FROM syllabus
         WHERE chunkid=%s;
         """
         cursor.execute(query,(chunkid,))
         result=cursor.fetchone()
-        return result
+        self.conn.commit()
+        return self.decodeRows([result])[0] if result else None
 
-    def getChunksByCourseID(self,courseid):
+    def getChunksByCourseID(self,courseid,include_embedding=False):
         cursor=self.conn.cursor()
-        query="""
-        SELECT chunkid,courseid,chunk,embedding_text 
+        query=f"""
+        SELECT chunkid,courseid,chunk,{EMBEDDING_COLUMN[include_embedding]}
         FROM syllabus
         WHERE courseid=%s;
         """
         cursor.execute(query,(courseid,))
         result=cursor.fetchall()
-        return result
+        self.conn.commit()
+        return self.decodeRows(result)
     
-    def getFragments(self,embedding,limit=5):
+    def setSearchKnobs(self,cursor,ef_search=None,probes=None,exact=False,filtered=False):
+        # SET LOCAL only lasts until the commit at the end of the search
+        cursor.execute("SET LOCAL hnsw.ef_search = %s;",(ef_search or vector_config["ef_search"],))
+        cursor.execute("SET LOCAL ivfflat.probes = %s;",(probes or vector_config["probes"],))
+        # The ANN index applies WHERE courseid=... after collecting ef_search/probes candidates,
+        # so a course filter would usually return fewer than `limit` rows. A course only has a
+        # few dozen chunks: a bitmap scan of syllabus_courseid_idx plus an exact sort is cheap.
+        if exact or filtered:
+            cursor.execute("SET LOCAL enable_indexscan = off;")
+
+    def searchFragments(self,embedding,limit,courseid=None,metric=None,ef_search=None,probes=None,exact=False,include_embedding=False):
+        """
+        Nearest chunks to `embedding` by `metric` (default vector_config). An
+        HNSW/IVFFlat index built with the matching opclass is used when present;
+        exact=True forces the sequential scan (used for recall measurements).
+        Searches within a course always rank that course's chunks exactly.
+        """
+        operator=VECTOR_METRICS[metric or vector_config["metric"]][0]
         cursor=self.conn.cursor()
-        embedding_str="["+",".join(map(str,embedding))+"]"
-        query=f"""
-        SELECT chunkid,courseid,chunk,embedding_text
+        embedding_str=to_vector_literal(embedding)
+        query=sql.SQL("""
+        SELECT chunkid,courseid,chunk,{embedding}
         FROM syllabus
-        ORDER BY embedding_text <-> %s::vector
+        {where}
+        ORDER BY embedding_text {operator} %s::vector
         LIMIT %s;
-        """
-        cursor.execute(query,(embedding_str,limit))
-        return cursor.fetchall()
-    def getFragmentsByCourseAndEmbedding(self,courseid,embedding,limit=5):
+        """).format(
+            where=sql.SQL("WHERE courseid=%s" if courseid is not None else ""),
+            operator=sql.SQL(operator),
+            embedding=sql.SQL(EMBEDDING_COLUMN[include_embedding]),
+        )
+        params=([courseid] if courseid is not None else [])+[embedding_str,limit]
+        try:
+            self.setSearchKnobs(cursor,ef_search,probes,exact,courseid is not None)
+            cursor.execute(query,params)
+            return self.decodeRows(cursor.fetchall())
+        finally:
+            self.conn.commit()
+            cursor.close()
+
+    def getFragments(self,embedding,limit=5,metric=None,ef_search=None,probes=None,exact=False,include_embedding=False):
+        return self.searchFragments(embedding,limit,None,metric,ef_search,probes,exact,include_embedding)
+    def getFragmentsByCourseAndEmbedding(self,courseid,embedding,limit=5,metric=None,ef_search=None,probes=None,exact=False,include_embedding=False):
+        return self.searchFragments(embedding,limit,courseid,metric,ef_search,probes,exact,include_embedding)
+
+    # Incremental ingestion
+
+    def getIngestedFiles(self):
+        """{courseid: (filename, file_hash, model)} of the last ingested PDF per course."""
         cursor=self.conn.cursor()
-        embedding_str="["+",".join(map(str,embedding))+"]"
-        query=f"""
-        SELECT chunkid,courseid,chunk,embedding_text
+        cursor.execute("SELECT courseid,filename,file_hash,model FROM syllabus_file;")
+        result={row[0]:row[1:] for row in cursor}
+        self.conn.commit()
+        return result
+
+    def getChunkHashes(self,courseid):
+        """(chunkid, chunk_hash, model) of the ingested chunks of a course."""
+        cursor=self.conn.cursor()
+        query="""
+        SELECT chunkid,chunk_hash,model
         FROM syllabus
-        WHERE courseid=%s
-        ORDER BY embedding_text <-> %s::vector
-        LIMIT %s;
+        WHERE courseid=%s AND chunk_hash IS NOT NULL
+        ORDER BY chunkid;
         """
-        cursor.execute(query,(courseid,embedding_str,limit))
-        return cursor.fetchall()
+        cursor.execute(query,(courseid,))
+        result=cursor.fetchall()
+        self.conn.commit()
+        return result
+
+    def syncCourseChunks(self,courseid,delete_ids,new_rows,filename,file_hash,model,page_size=500,replace=False):
+        """
+        Applies one course's ingestion diff in a single transaction: stale
+        chunks are deleted, new (chunk, chunk_hash, embedding) rows inserted
+        with multi-row INSERTs and the file record updated. Readers never see
+        a half-updated course. replace=True deletes every chunk of the course
+        first, hashed or not. Returns the number of chunks the course has.
+        """
+        cursor=self.conn.cursor()
+        try:
+            if replace:
+                cursor.execute("DELETE FROM syllabus WHERE courseid=%s;",(courseid,))
+            elif delete_ids:
+                cursor.execute("DELETE FROM syllabus WHERE chunkid = ANY(%s);",(list(delete_ids),))
+            rows=[(courseid,chunk,chunk_hash,model,to_vector_literal(embedding)) for chunk,chunk_hash,embedding in new_rows]
+            execute_values(cursor,"""
+            INSERT INTO syllabus(courseid,chunk,chunk_hash,model,embedding_text)
+            VALUES %s;
+            """,rows,template="(%s,%s,%s,%s,%s::vector)",page_size=page_size)
+            cursor.execute("""
+            INSERT INTO syllabus_file(courseid,filename,file_hash,model,chunk_count)
+            SELECT %s,%s,%s,%s,count(*) FROM syllabus WHERE courseid=%s AND chunk_hash IS NOT NULL
+            ON CONFLICT (courseid) DO UPDATE
+            SET filename=EXCLUDED.filename,file_hash=EXCLUDED.file_hash,model=EXCLUDED.model,
+                chunk_count=EXCLUDED.chunk_count,ingested_at=now()
+            RETURNING chunk_count;
+            """,(courseid,filename,file_hash,model,courseid))
+            count=cursor.fetchone()[0]
+            self.conn.commit()
+            return count
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def deleteIngestedCourse(self,courseid):
+        """Removes a course's ingested chunks and file record together (its PDF is gone)."""
+        cursor=self.conn.cursor()
+        try:
+            cursor.execute("DELETE FROM syllabus WHERE courseid=%s AND chunk_hash IS NOT NULL;",(courseid,))
+            deleted=cursor.rowcount
+            cursor.execute("DELETE FROM syllabus_file WHERE courseid=%s;",(courseid,))
+            self.conn.commit()
+            return deleted
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def getChunkVersion(self):
+        cursor=self.conn.cursor()
+        cursor.execute("SELECT version FROM syllabus_version;")
+        result=cursor.fetchone()
+        self.conn.commit()
+        return result[0] if result else 0
+
+    # Vector index management
+
+    def getVectorIndexes(self):
+        cursor=self.conn.cursor()
+        query="""
+        SELECT indexname,indexdef
+        FROM pg_indexes
+        WHERE tablename='syllabus' AND (indexdef ILIKE '%USING hnsw%' OR indexdef ILIKE '%USING ivfflat%')
+        ORDER BY indexname;
+        """
+        cursor.execute(query)
+        result=cursor.fetchall()
+        self.conn.commit()
+        return result
+
+    def createVectorIndex(self,method="hnsw",metric="l2",m=16,ef_construction=64,lists=100):
+        """Builds syllabus_embedding_<method>_<metric>; returns its name."""
+        name=f"syllabus_embedding_{method}_{metric}"
+        if method=="hnsw":
+            options=sql.SQL("WITH (m = {}, ef_construction = {})").format(sql.Literal(m),sql.Literal(ef_construction))
+        else:
+            options=sql.SQL("WITH (lists = {})").format(sql.Literal(lists))
+        query=sql.SQL("CREATE INDEX IF NOT EXISTS {name} ON syllabus USING {method} (embedding_text {opclass}) {options};").format(
+            name=sql.Identifier(name),
+            method=sql.SQL(method),
+            opclass=sql.SQL(VECTOR_METRICS[metric][1]),
+            options=options,
+        )
+        cursor=self.conn.cursor()
+        try:
+            cursor.execute(query)
+            self.conn.commit()
+            return name
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def dropVectorIndex(self,name):
+        if name not in {row[0] for row in self.getVectorIndexes()}:
+            return -1
+        cursor=self.conn.cursor()
+        try:
+            cursor.execute(sql.SQL("DROP INDEX IF EXISTS {name};").format(name=sql.Identifier(name)))
+            self.conn.commit()
+            return name
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
     
     def deleteChunksByCourseID(self,courseid):
         cursor=self.conn.cursor()
@@ -80,10 +271,23 @@ class SyllabusDAO:
             if cursor.rowcount==0:
                 self.conn.rollback()
                 return -1
+            # Forget the ingested file too, so the next ingestion run re-embeds the course
+            cursor.execute("DELETE FROM syllabus_file WHERE courseid=%s;",(courseid,))
             self.conn.commit()
             return courseid
         except Exception:
             self.conn.rollback()
             raise
         finally:
-            cursor.close()
\ No newline at end of file
+            cursor.close()
+
+    def streamChunks(self,courseid=None,include_embedding=False,itersize=500,binary=False):
+        # binary=True yields vector_send() bytes for from_vector_binary instead of the text vector
+        embedding=",vector_send(embedding_text)" if binary else ",embedding_text"
+        query="""
+        SELECT chunkid,courseid,chunk{embedding}
+        FROM syllabus
+        WHERE (%s IS NULL OR courseid=%s)
+        ORDER BY chunkid;
+        """.format(embedding=embedding if include_embedding else "")
+        return self.streamQuery("export_syllabus",query,(courseid,courseid),itersize)
@@ -1,23 +1,14 @@
-from API.config.pgconfig import pg_config
-import psycopg2
+from API.dao.base import BaseDAO
 import bcrypt
 
-class UserDAO:
-    def __init__(self):
-        connection_url = "dbname=%s user=%s password=%s port=%d host=%s" % (
-            pg_config["dbname"],
-            pg_config["user"],
-            pg_config["password"],
-            pg_config["port"],
-            pg_config["host"],
-        )
-        self.conn = psycopg2.connect(connection_url)
+class UserDAO(BaseDAO):
 
     def getAllUsers(self):
         cursor = self.conn.cursor()
         query = """
         SELECT uid, username, password
-        FROM db_user;
+        FROM db_user
+        ORDER BY uid;
         """
         cursor.execute(query)
         result = []
@@ -113,4 +104,7 @@ class UserDAO:
         if bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8')):
             return row[0]  # return user id if OK
         else:
-            return -1     # incorrect password
\ No newline at end of file
+            return -1     # incorrect password
+
+    def getUsersPage(self, fields, after=None, limit=100):
+        return self.getPage("db_user", ["uid"], fields, after, limit)
@@ -1,13 +1,82 @@
+import json
+
 import flask
-from Chatbot.llm.chatbot_for_Collection import chatbot_reply
+from Chatbot.llm.chatbot_for_Collection import chatbot_reply, chatbot_stream
+from Chatbot.llm.query_cache import embedding_cache
+from Chatbot.llm.answer_cache import answer_cache
+from Chatbot.llm.encode_batcher import query_batcher
+from API.services.chatbot_scheduler import chatbot_scheduler, ChatbotTimeout
 
 class ChatbotHandler:
-    def getChatbotReply(self, payload):
+    def validateMessage(self, payload):
         if not payload or "message" not in payload:
             return flask.jsonify({"error": "BAD REQUEST: Missing field 'message'"}), 400
         message = payload["message"]
 
         if not isinstance(message, str) or message.strip() == "":
             return flask.jsonify({"error": "BAD REQUEST: 'message' must be a non-empty string"}), 400
-        reply = chatbot_reply(message)
-        return flask.jsonify({"question":message, "reply": reply}), 200
\ No newline at end of file
+        return None
+
+    def wantsStream(self):
+        """Server-Sent Events are used with ?stream=1 or Accept: text/event-stream."""
+        if flask.request.args.get("stream", "0").lower() in {"1", "true"}:
+            return True
+        return "text/event-stream" in flask.request.headers.get("Accept", "")
+
+    def getChatbotReply(self, payload):
+        error = self.validateMessage(payload)
+        if error:
+            return error
+        message = payload["message"]
+        # Raises ChatbotBusy (429) when the queue is full
+        ticket = chatbot_scheduler.admit()
+        if self.wantsStream():
+            return self.streamChatbotReply(message, ticket)
+        with ticket:
+            reply = chatbot_reply(message, ticket)
+        return flask.jsonify({"question":message, "reply": reply}), 200
+
+    def streamChatbotReply(self, message, ticket):
+        """
+        One "token" event per LLM chunk, then a "done" event with the full
+        reply (or an "error" event if generation fails part way).
+        """
+
+        def event(name, data):
+            return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+        def generate():
+            parts = []
+            tokens = chatbot_stream(message, ticket)
+            try:
+                for token in tokens:
+                    parts.append(token)
+                    yield event("token", {"token": token})
+            except ChatbotTimeout:
+                yield event("error", {"error": "SERVICE UNAVAILABLE: chatbot timed out, try again"})
+                return
+            except Exception as e:
+                print(f"Chatbot stream failed: {e}")
+                yield event("error", {"error": "Chatbot failed to generate a reply"})
+                return
+            finally:
+                # Closing the bot's generator frees its llm slot if the client went away
+                tokens.close()
+                ticket.release()
+            yield event("done", {"question": message, "reply": "".join(parts)})
+
+        # X-Accel-Buffering keeps nginx-style proxies from holding tokens back
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        response = flask.Response(flask.stream_with_context(generate()), mimetype="text/event-stream", headers=headers)
+        # Frees the slot even if the client disconnects before the stream starts
+        response.call_on_close(ticket.release)
+        return response
+
+    def getCacheStats(self):
+        return flask.jsonify({
+            "query_embeddings": embedding_cache.stats(),
+            "answers": answer_cache.stats(),
+        }), 200
+
+    def getSchedulerStats(self):
+        return flask.jsonify(dict(chatbot_scheduler.stats(), encode_batcher=query_batcher.stats())), 200
@@ -1,5 +1,13 @@
-from flask import jsonify
+from flask import jsonify, request
 from API.dao.classes import ClassDAO
+from API.handlers.pagination import wants_page, parse_page_args, page_response
+from API.services.stats_cache import stats_cache
+from API.services.stats_cube import stats_cube
+from API.services.planner import curriculum_planner
+
+
+CLASS_COLUMNS = ["cid", "cname", "ccode", "cdesc", "term", "years", "cred", "csyllabus"]
+CLASS_KEYS = ["cid"]
 
 
 class ClassHandler:
@@ -24,16 +32,23 @@ class ClassHandler:
         return parts.issubset(valid_single_terms) and len(parts) > 0
 
     def getAllClasses(self):
-        dao = ClassDAO()
-        classes = dao.getAllClasses()
+        if wants_page(request.args):
+            error, page = parse_page_args(request.args, CLASS_COLUMNS, CLASS_KEYS)
+            if error:
+                return error
+            with ClassDAO() as dao:
+                rows = dao.getClassesPage(page["fields"], page["after"], page["limit"])
+            return page_response(rows, page, CLASS_KEYS)
+        with ClassDAO() as dao:
+            classes = dao.getAllClasses()
         result = []
         for c in classes:
             result.append(self.mapClass(c))
         return jsonify(result), 200
 
     def getClassByID(self, cid):
-        dao = ClassDAO()
-        cclass = dao.getClassByID(cid)
+        with ClassDAO() as dao:
+            cclass = dao.getClassByID(cid)
         if not cclass:
             return jsonify("NOT FOUND"), 404
         else:
@@ -69,31 +84,31 @@ class ClassHandler:
             ), 400
 
         # Check concatenation unique
-        dao = ClassDAO()
-        if dao.getClassByNameAndCode(cname, ccode):
-            return (
-                jsonify(
-                    f"BAD REQUEST: Class with name+code {cname + ccode} already exists."
-                ),
-                400,
-            )
-        if len(cname) != 4:
-            return jsonify("BAD REQUEST: Class name must be 4 characters long."), 400
-        if not ccode.isdigit() or len(ccode) != 4:
-            return (
-                jsonify("BAD REQUEST: Class code must be a 4-digits."),
-                400,
-            )
-        if not self.is_valid_term(term):
-            return jsonify("BAD REQUEST: Invalid term value."), 400
-        if not isinstance(cred, int) or cred < 0:
-            return (
-                jsonify("BAD REQUEST: Credits must be a non-negative integer."),
-                400,
-            )
-        if years not in ["Every Year", "According to Demand", "Odd Years"]:
-            return jsonify("BAD REQUEST: Invalid years value."), 400
-        cid = dao.insertClass(cname, ccode, cdesc, term, years, cred, csyllabus)
+        with ClassDAO() as dao:
+            if dao.getClassByNameAndCode(cname, ccode):
+                return (
+                    jsonify(
+                        f"BAD REQUEST: Class with name+code {cname + ccode} already exists."
+                    ),
+                    400,
+                )
+            if len(cname) != 4:
+                return jsonify("BAD REQUEST: Class name must be 4 characters long."), 400
+            if not ccode.isdigit() or len(ccode) != 4:
+                return (
+                    jsonify("BAD REQUEST: Class code must be a 4-digits."),
+                    400,
+                )
+            if not self.is_valid_term(term):
+                return jsonify("BAD REQUEST: Invalid term value."), 400
+            if not isinstance(cred, int) or cred < 0:
+                return (
+                    jsonify("BAD REQUEST: Credits must be a non-negative integer."),
+                    400,
+                )
+            if years not in ["Every Year", "According to Demand", "Odd Years"]:
+                return jsonify("BAD REQUEST: Invalid years value."), 400
+            cid = dao.insertClass(cname, ccode, cdesc, term, years, cred, csyllabus)
         row = (cid, cname, ccode, cdesc, term, years, cred, csyllabus)
         if cid is None:
             return jsonify("INTERNAL SERVER ERROR"), 500
@@ -106,65 +121,68 @@ class ClassHandler:
                 ),
                 400,
             )
+        stats_cube.invalidate("class")
+        stats_cache.invalidate("class")
+        curriculum_planner.invalidate()
         return jsonify(self.mapClass(row)), 201
 
     def updateClass(self, cid, c):
-        dao = ClassDAO()
-        old_class_data = dao.getClassByID(cid)
-        if not old_class_data:
-            return jsonify("NOT FOUND"), 404
-
-        # Create a dictionary from the old data for easier access
-        prev_class_data = self.mapClass(old_class_data)
-
-        cname = c.get("cname", prev_class_data["cname"])
-        ccode = c.get("ccode", prev_class_data["ccode"])
-        cdesc = c.get("cdesc", prev_class_data["cdesc"])
-        term = c.get("term", prev_class_data["term"])
-        years = c.get("years", prev_class_data["years"])
-        cred = c.get("cred", prev_class_data["cred"])
-        csyllabus = c.get("csyllabus", prev_class_data["csyllabus"])
-
-        # Validate only the fields that are present in the request
-        if "cname" in c and len(cname) != 4:
-            return jsonify("BAD REQUEST: Class name must be 4 characters long."), 400
-        if "ccode" in c and (not ccode.isdigit() or len(ccode) != 4):
-            return jsonify("BAD REQUEST: Class code must be a 4-digit string."), 400
-        if "term" in c and not self.is_valid_term(term):
-            return jsonify("BAD REQUEST: Invalid term value."), 400
-        if "cred" in c and (not isinstance(cred, int) or cred < 0):
-            return (
-                jsonify("BAD REQUEST: Credits must be a non-negative integer."),
-                400,
+        with ClassDAO() as dao:
+            old_class_data = dao.getClassByID(cid)
+            if not old_class_data:
+                return jsonify("NOT FOUND"), 404
+
+            # Create a dictionary from the old data for easier access
+            prev_class_data = self.mapClass(old_class_data)
+
+            cname = c.get("cname", prev_class_data["cname"])
+            ccode = c.get("ccode", prev_class_data["ccode"])
+            cdesc = c.get("cdesc", prev_class_data["cdesc"])
+            term = c.get("term", prev_class_data["term"])
+            years = c.get("years", prev_class_data["years"])
+            cred = c.get("cred", prev_class_data["cred"])
+            csyllabus = c.get("csyllabus", prev_class_data["csyllabus"])
+
+            # Validate only the fields that are present in the request
+            if "cname" in c and len(cname) != 4:
+                return jsonify("BAD REQUEST: Class name must be 4 characters long."), 400
+            if "ccode" in c and (not ccode.isdigit() or len(ccode) != 4):
+                return jsonify("BAD REQUEST: Class code must be a 4-digit string."), 400
+            if "term" in c and not self.is_valid_term(term):
+                return jsonify("BAD REQUEST: Invalid term value."), 400
+            if "cred" in c and (not isinstance(cred, int) or cred < 0):
+                return (
+                    jsonify("BAD REQUEST: Credits must be a non-negative integer."),
+                    400,
+                )
+            if "years" in c and years not in [
+                "Every Year",
+                "According to Demand",
+                "Odd Years",
+            ]:
+                return jsonify("BAD REQUEST: Invalid years value."), 400
+
+            # If cname or ccode were provided (or effectively changed), ensure they are non-empty
+            if ("cname" in c and (not isinstance(cname, str) or cname.strip() == "")) or (
+                "ccode" in c and (not isinstance(ccode, str) or ccode.strip() == "")
+            ):
+                return jsonify(
+                    "BAD REQUEST: cname and ccode must be non-empty strings."
+                ), 400
+
+            # Ensure concatenation of cname+ccode is unique across classes (exclude current cid)
+            existing = dao.getClassByNameAndCode(cname, ccode)
+            if existing and existing[0] != cid:
+                return (
+                    jsonify(
+                        f"BAD REQUEST: Class with name+code {cname + ccode} already exists."
+                    ),
+                    400,
+                )
+
+            updated_cid = dao.updateClass(
+                cid, cname, ccode, cdesc, term, years, cred, csyllabus
             )
-        if "years" in c and years not in [
-            "Every Year",
-            "According to Demand",
-            "Odd Years",
-        ]:
-            return jsonify("BAD REQUEST: Invalid years value."), 400
-
-        # If cname or ccode were provided (or effectively changed), ensure they are non-empty
-        if ("cname" in c and (not isinstance(cname, str) or cname.strip() == "")) or (
-            "ccode" in c and (not isinstance(ccode, str) or ccode.strip() == "")
-        ):
-            return jsonify(
-                "BAD REQUEST: cname and ccode must be non-empty strings."
-            ), 400
-
-        # Ensure concatenation of cname+ccode is unique across classes (exclude current cid)
-        existing = dao.getClassByNameAndCode(cname, ccode)
-        if existing and existing[0] != cid:
-            return (
-                jsonify(
-                    f"BAD REQUEST: Class with name+code {cname + ccode} already exists."
-                ),
-                400,
-            )
-
-        updated_cid = dao.updateClass(
-            cid, cname, ccode, cdesc, term, years, cred, csyllabus
-        )
         row = (cid, cname, ccode, cdesc, term, years, cred, csyllabus)
         if updated_cid is None:
             return jsonify("INTERNAL SERVER ERROR"), 500
@@ -177,15 +195,21 @@ class ClassHandler:
                 ),
                 400,
             )
+        stats_cube.invalidate("class")
+        stats_cache.invalidate("class")
+        curriculum_planner.invalidate()
         return jsonify(self.mapClass(row)), 200
 
     def deleteClass(self, cid):
-        dao = ClassDAO()
-        deleted_cid = dao.deleteClass(cid)
+        with ClassDAO() as dao:
+            deleted_cid = dao.deleteClass(cid)
         if deleted_cid is None:
             return jsonify("INTERNAL SERVER ERROR"), 500
         elif deleted_cid == -1:
             return jsonify("NOT FOUND"), 404
         elif deleted_cid == -2:
             return jsonify("CONFLICT: CLASS IS REFERENCED BY A SECTION/REQUISITE"), 409
+        stats_cube.invalidate("class")
+        stats_cache.invalidate("class")
+        curriculum_planner.invalidate()
         return jsonify(deleted_cid), 204
@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+
+from flask import Response, jsonify, request, stream_with_context
+from API.dao.classes import ClassDAO
+from API.dao.section import SectionDAO
+from API.dao.syllabus import SyllabusDAO, from_vector_binary
+from API.handlers.syllabus import encode_embedding
+
+# Rows buffered per chunk written to the response
+ROWS_PER_CHUNK = 500
+
+SECTION_COLUMNS = ["sid", "roomid", "cid", "mid", "semester", "years", "capacity"]
+CLASS_COLUMNS = ["cid", "cname", "ccode", "cdesc", "term", "years", "cred", "csyllabus"]
+SYLLABUS_COLUMNS = ["chunkid", "courseid", "chunk"]
+
+
+class ExportHandler:
+    def streamRows(self, dao, rows, columns, fmt):
+        """
+        Encodes rows as NDJSON or CSV chunks. The DAO (and its pooled
+        connection) is kept until the last row is sent or the client goes away.
+        """
+
+        def generate():
+            try:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer) if fmt == "csv" else None
+                if writer:
+                    writer.writerow(columns)
+                    # Send the header right away so clients get the first byte early
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                count = 0
+                for row in rows:
+                    if writer:
+                        writer.writerow(row)
+                    else:
+                        buffer.write(json.dumps(dict(zip(columns, row)), default=str))
+                        buffer.write("\n")
+                    count += 1
+                    if count % ROWS_PER_CHUNK == 0:
+                        yield buffer.getvalue()
+                        buffer.seek(0)
+                        buffer.truncate()
+                if buffer.tell():
+                    yield buffer.getvalue()
+            finally:
+                rows.close()
+                dao.close()
+
+        mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+        response = Response(stream_with_context(generate()), mimetype=mimetype)
+        # A body that is never iterated never reaches the finally above
+        response.call_on_close(dao.close)
+        return response
+
+    def getFormat(self):
+        fmt = request.args.get("format", "ndjson").lower()
+        if fmt not in {"ndjson", "csv"}:
+            return None
+        return fmt
+
+    def exportSections(self):
+        fmt = self.getFormat()
+        if fmt is None:
+            return jsonify("BAD REQUEST: format must be 'ndjson' or 'csv'"), 400
+        dao = SectionDAO()
+        return self.streamRows(dao, dao.streamSections(), SECTION_COLUMNS, fmt)
+
+    def exportClasses(self):
+        fmt = self.getFormat()
+        if fmt is None:
+            return jsonify("BAD REQUEST: format must be 'ndjson' or 'csv'"), 400
+        dao = ClassDAO()
+        return self.streamRows(dao, dao.streamClasses(), CLASS_COLUMNS, fmt)
+
+    def exportSyllabus(self):
+        fmt = self.getFormat()
+        if fmt is None:
+            return jsonify("BAD REQUEST: format must be 'ndjson' or 'csv'"), 400
+        courseid = request.args.get("courseid", type=int)
+        include_embedding = request.args.get("include_embedding", "0") in {"1", "true"}
+        columns = SYLLABUS_COLUMNS + (["embedding"] if include_embedding else [])
+        dao = SyllabusDAO()
+        rows = dao.streamChunks(courseid, include_embedding, binary=True)
+        if include_embedding:
+            rows = self.encodeEmbeddings(rows)
+        return self.streamRows(dao, rows, columns, fmt)
+
+    def encodeEmbeddings(self, rows):
+        """Same base64 float32 embedding the other syllabus endpoints return."""
+        try:
+            for chunkid, courseid, chunk, data in rows:
+                vector = from_vector_binary(data)
+                yield chunkid, courseid, chunk, encode_embedding(vector) if vector is not None else None
+        finally:
+            rows.close()
@@ -1,8 +1,16 @@
-from flask import jsonify
+from flask import jsonify, request
 from API.dao.meeting import MeetingDAO
+from API.handlers.pagination import wants_page, parse_page_args, page_response
+from API.services.stats_cache import stats_cache
+from API.services.stats_cube import stats_cube
+from API.services.room_schedule import room_schedule
 from datetime import datetime
 
 
+MEETING_COLUMNS = ["mid", "ccode", "starttime", "endtime", "cdays"]
+MEETING_KEYS = ["mid"]
+
+
 class MeetingHandler:
     def mapMeeting(self, meeting) -> dict:
         result = {}
@@ -39,16 +47,23 @@ class MeetingHandler:
         return None, None
 
     def getAllMeetings(self):
-        dao = MeetingDAO()
-        meetings = dao.getAllMeetings()
+        if wants_page(request.args):
+            error, page = parse_page_args(request.args, MEETING_COLUMNS, MEETING_KEYS)
+            if error:
+                return error
+            with MeetingDAO() as dao:
+                rows = dao.getMeetingsPage(page["fields"], page["after"], page["limit"])
+            return page_response(rows, page, MEETING_KEYS)
+        with MeetingDAO() as dao:
+            meetings = dao.getAllMeetings()
         result = []
         for meeting in meetings:
             result.append(self.mapMeeting(meeting))
         return jsonify(result), 200
 
     def getMeetingByID(self, mid):
-        dao = MeetingDAO()
-        meeting = dao.getMeetingByID(mid)
+        with MeetingDAO() as dao:
+            meeting = dao.getMeetingByID(mid)
         if not meeting:
             return jsonify("NOT FOUND"), 404
         else:
@@ -92,22 +107,23 @@ class MeetingHandler:
         if error:
             return error, status_code
 
-        dao = MeetingDAO()
-        if dao.getMeetingByCcode(str(ccode)):
-            return jsonify(
-                f"BAD REQUEST: Meeting with ccode {ccode} already exists."
-            ), 400
+        with MeetingDAO() as dao:
+            if dao.getMeetingByCcode(str(ccode)):
+                return jsonify(
+                    f"BAD REQUEST: Meeting with ccode {ccode} already exists."
+                ), 400
 
-        mid = dao.insertMeeting(ccode, starttime, endtime, cdays)
+            mid = dao.insertMeeting(ccode, starttime, endtime, cdays)
         row = (mid, ccode, starttime, endtime, cdays)
         if mid is None:
             return jsonify("INTERNAL SERVER ERROR"), 500
+        room_schedule.putMeeting(mid, cdays, starttime, endtime)
         return jsonify(self.mapMeeting(row)), 201
 
     def updateMeeting(self, mid, meeting):
-        dao = MeetingDAO()
-        if not dao.getMeetingByID(mid):
-            return jsonify("NOT FOUND"), 404
+        with MeetingDAO() as dao:
+            if not dao.getMeetingByID(mid):
+                return jsonify("NOT FOUND"), 404
 
         if (
             "ccode" not in meeting
@@ -138,26 +154,33 @@ class MeetingHandler:
         if error:
             return error, status_code
 
-        existing_meeting = dao.getMeetingByCcode(str(ccode))
-        if existing_meeting and existing_meeting[0] != mid:
-            return (
-                jsonify(f"BAD REQUEST: Meeting with ccode {ccode} already exists."),
-                400,
-            )
+        with MeetingDAO() as dao:
+            existing_meeting = dao.getMeetingByCcode(str(ccode))
+            if existing_meeting and existing_meeting[0] != mid:
+                return (
+                    jsonify(f"BAD REQUEST: Meeting with ccode {ccode} already exists."),
+                    400,
+                )
 
-        updated_mid = dao.updateMeeting(mid, ccode, starttime, endtime, cdays)
+            updated_mid = dao.updateMeeting(mid, ccode, starttime, endtime, cdays)
         row = (mid, ccode, starttime, endtime, cdays)
         if updated_mid is None:
             return jsonify("INTERNAL SERVER ERROR"), 500
+        stats_cube.invalidate("meeting")
+        stats_cache.invalidate("meeting")
+        room_schedule.putMeeting(mid, cdays, starttime, endtime)
         return jsonify(self.mapMeeting(row)), 200
 
     def deleteMeeting(self, mid):
-        dao = MeetingDAO()
-        deleted_mid = dao.deleteMeeting(mid)
+        with MeetingDAO() as dao:
+            deleted_mid = dao.deleteMeeting(mid)
         if deleted_mid is None:
             return jsonify("INTERNAL SERVER ERROR"), 500
         elif deleted_mid == -1:
             return jsonify("NOT FOUND"), 404
         elif deleted_mid == -2:
             return jsonify("CONFLICT: MEETING IS REFERENCED BY A SECTION"), 409
+        stats_cube.invalidate("meeting")
+        stats_cache.invalidate("meeting")
+        room_schedule.removeMeeting(mid)
         return jsonify(deleted_mid), 204
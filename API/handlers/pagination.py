@@ -0,0 +1,53 @@
+from flask import jsonify
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def wants_page(args):
+    """List endpoints keep returning the full table unless paging/projection is requested."""
+    return any(name in args for name in ("after", "limit", "fields"))
+
+
+def parse_page_args(args, columns, keys):
+    """
+    Parses ?after=&limit=&fields= for a keyset-paginated list endpoint.
+
+    `columns` is the whitelist of selectable columns and `keys` the ordering
+    key; composite keys take a comma-separated `after` (e.g. after=3,2).
+    Returns (error_response, page) where page has fields, after and limit.
+    """
+    fields = list(columns)
+    if args.get("fields"):
+        requested = [f.strip() for f in args.get("fields").split(",") if f.strip()]
+        unknown = [f for f in requested if f not in columns]
+        if unknown:
+            return (jsonify(f"BAD REQUEST: Unknown fields {unknown}; valid fields are {list(columns)}"), 400), None
+        # The key is always returned so the client can request the next page
+        fields = [k for k in keys if k not in requested] + requested
+
+    try:
+        limit = int(args.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return (jsonify("BAD REQUEST: limit must be an integer"), 400), None
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        return (jsonify(f"BAD REQUEST: limit must be between 1 and {MAX_PAGE_SIZE}"), 400), None
+
+    after = None
+    if args.get("after"):
+        try:
+            after = tuple(int(v) for v in args.get("after").split(","))
+        except ValueError:
+            after = ()
+        if len(after) != len(keys):
+            return (jsonify(f"BAD REQUEST: after must be {','.join(keys)} of the last row seen"), 400), None
+
+    return None, {"fields": fields, "after": after, "limit": limit}
+
+
+def page_response(rows, page, keys):
+    results = [dict(zip(page["fields"], row)) for row in rows]
+    next_after = None
+    if len(results) == page["limit"]:
+        next_after = ",".join(str(results[-1][k]) for k in keys)
+    return jsonify({"count": len(results), "results": results, "next_after": next_after}), 200
@@ -0,0 +1,47 @@
+from flask import jsonify
+from API.services.planner import curriculum_planner, SEMESTERS
+
+MAX_PLAN_SEMESTERS = 20
+
+
+class PlannerHandler:
+    def resolveClasses(self, values, field):
+        """Maps cids or codes ("CIIC 4151") to cids; returns (error_response, cids)."""
+        if not isinstance(values, list):
+            values = [values]
+        cids = []
+        for value in values:
+            cid = curriculum_planner.resolve(value)
+            if cid is None:
+                return (jsonify(f"NOT FOUND: {field} class {value} does not exist"), 404), None
+            cids.append(cid)
+        return None, cids
+
+    def getPlan(self, payload):
+        if not payload or "targets" not in payload:
+            return jsonify("BAD REQUEST: Missing field targets"), 400
+
+        error, targets = self.resolveClasses(payload["targets"], "target")
+        if error:
+            return error
+        if not targets:
+            return jsonify("BAD REQUEST: targets must not be empty"), 400
+        error, completed = self.resolveClasses(payload.get("completed", []), "completed")
+        if error:
+            return error
+
+        max_credits = payload.get("max_credits", 18)
+        start_semester = payload.get("start_semester", "Fall")
+        start_year = payload.get("start_year", 2025)
+        max_semesters = payload.get("max_semesters", 12)
+        if not isinstance(max_credits, int) or max_credits < 1:
+            return jsonify("BAD REQUEST: max_credits must be a positive integer"), 400
+        if start_semester not in SEMESTERS:
+            return jsonify(f"BAD REQUEST: start_semester must be one of {SEMESTERS}"), 400
+        if not isinstance(start_year, int):
+            return jsonify("BAD REQUEST: start_year must be an integer"), 400
+        if not isinstance(max_semesters, int) or not 1 <= max_semesters <= MAX_PLAN_SEMESTERS:
+            return jsonify(f"BAD REQUEST: max_semesters must be between 1 and {MAX_PLAN_SEMESTERS}"), 400
+
+        result = curriculum_planner.plan(targets, completed, max_credits, start_semester, start_year, max_semesters)
+        return jsonify({"targets": targets, "completed": completed, "max_credits": max_credits, **result}), 200
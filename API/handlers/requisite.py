@@ -1,5 +1,13 @@
 from flask import jsonify, request
 from API.dao.requisite import RequisiteDAO
+from API.handlers.pagination import wants_page, parse_page_args, page_response
+from API.services.stats_cache import stats_cache
+from API.services.stats_cube import stats_cube
+from API.services.requisite_graph import requisite_graph
+
+REQUISITE_COLUMNS = ["classid", "reqid", "prereq"]
+REQUISITE_KEYS = ["classid", "reqid"]
+
 
 class RequisiteHandler:
     def mapRequisite(self, requisite) -> dict:
@@ -10,8 +18,15 @@ class RequisiteHandler:
         return result
     
     def getAllRequisites(self):
-        dao = RequisiteDAO()
-        requisites = dao.getAllRequisites()
+        if wants_page(request.args):
+            error, page = parse_page_args(request.args, REQUISITE_COLUMNS, REQUISITE_KEYS)
+            if error:
+                return error
+            with RequisiteDAO() as dao:
+                rows = dao.getRequisitesPage(page["fields"], page["after"], page["limit"])
+            return page_response(rows, page, REQUISITE_KEYS)
+        with RequisiteDAO() as dao:
+            requisites = dao.getAllRequisites()
         result = []
         for rows in requisites:
             result.append(self.mapRequisite(rows))
@@ -22,8 +37,8 @@ class RequisiteHandler:
 
     
     def getRequisite(self, classid, reqid):
-        dao = RequisiteDAO()
-        requisite = dao.getRequisite(classid, reqid)
+        with RequisiteDAO() as dao:
+            requisite = dao.getRequisite(classid, reqid)
 
         if not requisite:
             return jsonify("NOT FOUND"), 404
@@ -43,59 +58,82 @@ class RequisiteHandler:
         reqid = data["reqid"]
         prereq = data["prereq"]
 
-        dao = RequisiteDAO()
-
-        # FK existence: classid must exist
-        if dao.classExists(classid) is None:
-            return jsonify("NOT FOUND: classid does not exist"), 404
-
-        # FK existence: reqid must exist
-        if dao.classExists(reqid) is None:
-            return jsonify("NOT FOUND: reqid does not exist"), 404
-
-        # Rule: no self-requisite
-        if classid == reqid:
-            return jsonify("CONFLICT: class cannot be its own prerequisite"), 409
-
-        # Rule: no duplicate pair
-        if dao.pairExists(classid, reqid) is not None:
-            return jsonify("CONFLICT: requisite already exists"), 409
-
-        # Rule: no simple 2-cycle
-        if dao.twoCycleExist(classid, reqid) is not None:
-            return jsonify("CONFLICT: simple cycle detected"), 409
-
-        # Insert
-        inserted = dao.insertRequisite(classid, reqid, prereq)
-
-        if inserted is None:
-            return jsonify("INTERNAL SERVER ERROR"), 500
-
+        with RequisiteDAO() as dao:
+            # FK existence: classid must exist
+            if dao.classExists(classid) is None:
+                return jsonify("NOT FOUND: classid does not exist"), 404
+
+            # FK existence: reqid must exist
+            if dao.classExists(reqid) is None:
+                return jsonify("NOT FOUND: reqid does not exist"), 404
+
+            # Rule: no self-requisite
+            if classid == reqid:
+                return jsonify("CONFLICT: class cannot be its own prerequisite"), 409
+
+            # Rule: no duplicate pair
+            if dao.pairExists(classid, reqid) is not None:
+                return jsonify("CONFLICT: requisite already exists"), 409
+
+        # Rule: no cycle of any length. The in-memory closure answers (and names the
+        # cycle) fast; the insert re-checks reachability in SQL, which also covers
+        # edges other workers added since this process loaded its graph
+        with requisite_graph.lock:
+            path = requisite_graph.cyclePath(classid, reqid)
+            if path is None:
+                # Insert (the graph may have borrowed a connection to load, so borrow after it)
+                with RequisiteDAO() as dao:
+                    inserted = dao.insertRequisite(classid, reqid, prereq)
+                if inserted == -1:
+                    requisite_graph.invalidate()
+                    path = requisite_graph.cyclePath(classid, reqid) or [reqid, classid]
+            if path is not None:
+                cycle = " -> ".join(str(cid) for cid in [classid] + path)
+                return jsonify(f"CONFLICT: cycle detected ({cycle})"), 409
+
+            if inserted is None:
+                return jsonify("INTERNAL SERVER ERROR"), 500
+            requisite_graph.addEdge(classid, reqid, prereq)
+
+        stats_cube.invalidate("requisite")
+        stats_cache.invalidate("requisite")
         return jsonify(self.mapRequisite(inserted)), 201
     
 
     def deleteRequisite(self, classid, reqid):
-        dao = RequisiteDAO()
+        with RequisiteDAO() as dao:
+            # FK validation
+            if dao.classExists(classid) is None:
+                return jsonify("NOT FOUND: classid does not exist"), 404
 
-        # FK validation
-        if dao.classExists(classid) is None:
-            return jsonify("NOT FOUND: classid does not exist"), 404
-        
-        if dao.classExists(reqid) is None:
-            return jsonify("NOT FOUND: reqid does not exist"), 404
+            if dao.classExists(reqid) is None:
+                return jsonify("NOT FOUND: reqid does not exist"), 404
 
-        # Pair existence validation
-        if dao.pairExists(classid, reqid) is None:
-            return jsonify("NOT FOUND: requisite does not exist"), 404
+            # Pair existence validation
+            if dao.pairExists(classid, reqid) is None:
+                return jsonify("NOT FOUND: requisite does not exist"), 404
 
-        # Delete
-        deleted = dao.deleteRequisite(classid, reqid)
+            # Delete
+            deleted = dao.deleteRequisite(classid, reqid)
 
         if deleted is None:
             return jsonify("INTERNAL SERVER ERROR"), 500
 
+        stats_cube.invalidate("requisite")
+        stats_cache.invalidate("requisite")
+        requisite_graph.removeEdge(classid, reqid)
+
         # Successful delete → no content
         return "", 204
 
+    def getClosure(self, classid):
+        with RequisiteDAO() as dao:
+            if dao.classExists(classid) is None:
+                return jsonify("NOT FOUND: classid does not exist"), 404
 
-    
\ No newline at end of file
+        result = {}
+        result["classid"] = classid
+        result["requisites"] = [{"reqid": reqid, "prereq": prereq} for reqid, prereq in requisite_graph.requisites(classid)]
+        result["all_requisites"] = requisite_graph.ancestors(classid)
+        result["required_by"] = requisite_graph.descendants(classid)
+        return jsonify(result), 200
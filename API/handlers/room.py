@@ -1,5 +1,14 @@
 from flask import request,jsonify
 from API.dao.room import RoomDAO
+from API.handlers.pagination import wants_page, parse_page_args, page_response
+from API.services.stats_cache import stats_cache
+from API.services.stats_cube import stats_cube
+from API.services.room_schedule import room_schedule
+from datetime import datetime
+
+ROOM_COLUMNS = ["rid", "building", "room_number", "capacity"]
+ROOM_KEYS = ["rid"]
+
 
 class RoomHandler:
     def mapRoom(self,room)->dict:
@@ -31,14 +40,21 @@ class RoomHandler:
         return None,{"building":building.strip(),"room_number":room_number.strip(),"capacity":capacity_int}
 
     def getAllRooms(self):
-        dao=RoomDAO()
-        rooms=dao.getAllRooms()
+        if wants_page(request.args):
+            error, page = parse_page_args(request.args, ROOM_COLUMNS, ROOM_KEYS)
+            if error:
+                return error
+            with RoomDAO() as dao:
+                rows = dao.getRoomsPage(page["fields"], page["after"], page["limit"])
+            return page_response(rows, page, ROOM_KEYS)
+        with RoomDAO() as dao:
+            rooms=dao.getAllRooms()
         result=[self.mapRoom(r) for r in rooms]
         return jsonify(result),200
     
     def getRoomByID(self,rid):
-        dao=RoomDAO()
-        room=dao.getRoomByID(rid)
+        with RoomDAO() as dao:
+            room=dao.getRoomByID(rid)
         if not room:
             return jsonify({"error":"NOT FOUND"}),404
         return jsonify(self.mapRoom(room)),200
@@ -51,43 +67,120 @@ class RoomHandler:
         room_number=parsed["room_number"]
         capacity=parsed["capacity"]
 
-        dao=RoomDAO()
-        if dao.getRoomByBuildingNumber(building,room_number):
-            return jsonify({"error":f"BAD REQUEST: Room {building} {room_number} already exists."}),409
-        rid = dao.insertRoom(building,room_number,capacity)
-        if rid is None:
-            return jsonify({"error":"INTERNAL SERVER ERROR"}),500
-        room=dao.getRoomByID(rid)
+        with RoomDAO() as dao:
+            if dao.getRoomByBuildingNumber(building,room_number):
+                return jsonify({"error":f"BAD REQUEST: Room {building} {room_number} already exists."}),409
+            rid = dao.insertRoom(building,room_number,capacity)
+            if rid is None:
+                return jsonify({"error":"INTERNAL SERVER ERROR"}),500
+            room=dao.getRoomByID(rid)
+        stats_cube.invalidate("room")
+        stats_cache.invalidate("room")
+        room_schedule.putRoom(rid,building,room_number,capacity)
         return jsonify(self.mapRoom(room)),201
     def updateRoom(self,rid,room_payload):
-        dao=RoomDAO()
-        if not dao.getRoomByID(rid):
-            return jsonify({"error":"NOT FOUND"}),404
-        error,parsed=self.validate_room_payload(room_payload)
-        if error:
-            return error,parsed
-        building=parsed["building"]
-        room_number=parsed["room_number"]
-        capacity=parsed["capacity"]
+        with RoomDAO() as dao:
+            if not dao.getRoomByID(rid):
+                return jsonify({"error":"NOT FOUND"}),404
+            error,parsed=self.validate_room_payload(room_payload)
+            if error:
+                return error,parsed
+            building=parsed["building"]
+            room_number=parsed["room_number"]
+            capacity=parsed["capacity"]
 
-        existing_room=dao.getRoomByBuildingNumber(building,room_number)
-        if existing_room and existing_room[0]!=rid:
-            return jsonify({"error":f"BAD REQUEST: Room {building} {room_number} already exists."}),409
-        updated_rid=dao.updateRoom(rid,building,room_number,capacity)
-        if updated_rid is None:
-            return jsonify({"error":"INTERNAL SERVER ERROR"}),500
-        updated_room=dao.getRoomByID(rid)
+            existing_room=dao.getRoomByBuildingNumber(building,room_number)
+            if existing_room and existing_room[0]!=rid:
+                return jsonify({"error":f"BAD REQUEST: Room {building} {room_number} already exists."}),409
+            updated_rid=dao.updateRoom(rid,building,room_number,capacity)
+            if updated_rid is None:
+                return jsonify({"error":"INTERNAL SERVER ERROR"}),500
+            updated_room=dao.getRoomByID(rid)
+        stats_cube.invalidate("room")
+        stats_cache.invalidate("room")
+        room_schedule.putRoom(rid,building,room_number,capacity)
         return jsonify(self.mapRoom(updated_room)),200
 
     
     def deleteRoom(self,rid):
-        dao=RoomDAO()
-        deleted=dao.deleteRoom(rid)
+        with RoomDAO() as dao:
+            deleted=dao.deleteRoom(rid)
         if deleted is None:
             return jsonify({"error": "SERVER ERROR"}),500
         elif deleted==-1:
             return jsonify({"error": "NOT FOUND"}),404
         elif deleted==-2:
             return jsonify({"error": "delete room; room is referenced by a section"}),409
+        stats_cube.invalidate("room")
+        stats_cache.invalidate("room")
+        room_schedule.removeRoom(rid)
         return "",204
- 
\ No newline at end of file
+
+    def parse_clock(self,value):
+        """Seconds since midnight of an HH:MM string."""
+        t=datetime.strptime(value,"%H:%M")
+        return t.hour*3600+t.minute*60
+
+    def format_clock(self,seconds):
+        return "%02d:%02d"%(seconds//3600,seconds%3600//60)
+
+    def getFreeSlots(self,rid):
+        cdays=request.args.get("cdays",type=str)
+        semester=request.args.get("semester",type=str)
+        years=request.args.get("year",type=str)
+        min_minutes=request.args.get("min_minutes",type=int,default=0)
+        if cdays not in {"MJ","LWV"}:
+            return jsonify({"error":"BAD REQUEST: cdays must be 'MJ' or 'LWV'"}),400
+        if not semester or not years:
+            return jsonify({"error":"BAD REQUEST: semester and year are required"}),400
+        try:
+            day_start=self.parse_clock(request.args.get("from","07:30"))
+            day_end=self.parse_clock(request.args.get("to","19:45"))
+        except ValueError:
+            return jsonify({"error":"BAD REQUEST: from/to must be in HH:MM format"}),400
+        if day_start>=day_end:
+            return jsonify({"error":"BAD REQUEST: from must be before to"}),400
+        slots=room_schedule.freeSlots(rid,cdays,semester,years,day_start,day_end,min_minutes*60)
+        result=[{"start":self.format_clock(a),"end":self.format_clock(b),"minutes":(b-a)//60} for a,b in slots]
+        return jsonify({"rid":rid,"cdays":cdays,"semester":semester,"year":years,"free_slots":result}),200
+
+    def getConflict(self,rid):
+        mid=request.args.get("mid",type=int)
+        semester=request.args.get("semester",type=str)
+        years=request.args.get("year",type=str)
+        exclude_sid=request.args.get("exclude_sid",type=int)
+        if mid is None:
+            return jsonify({"error":"BAD REQUEST: mid is required"}),400
+        meeting=room_schedule.meeting(mid)
+        if meeting is None:
+            return jsonify({"error":"NOT FOUND: mid does not exist"}),404
+        cdays,start,end=meeting
+        sid=room_schedule.findConflict(rid,cdays,start,end,semester,years,exclude_sid)
+        return jsonify({"rid":rid,"mid":mid,"conflict":sid is not None,"sid":sid}),200
+
+    def getAvailableRooms(self):
+        cdays=request.args.get("cdays",type=str)
+        semester=request.args.get("semester",type=str)
+        years=request.args.get("year",type=str)
+        building=request.args.get("building",type=str)
+        if cdays not in {"MJ","LWV"}:
+            return jsonify({"error":"BAD REQUEST: cdays must be 'MJ' or 'LWV'"}),400
+        if not request.args.get("start") or not request.args.get("end"):
+            return jsonify({"error":"BAD REQUEST: start and end are required"}),400
+        try:
+            start=self.parse_clock(request.args.get("start"))
+            end=self.parse_clock(request.args.get("end"))
+        except ValueError:
+            return jsonify({"error":"BAD REQUEST: start/end must be in HH:MM format"}),400
+        if start>=end:
+            return jsonify({"error":"BAD REQUEST: start must be before end"}),400
+        try:
+            min_capacity=int(request.args.get("min_capacity",0))
+            limit=int(request.args["limit"]) if "limit" in request.args else None
+        except ValueError:
+            return jsonify({"error":"BAD REQUEST: min_capacity and limit must be integers"}),400
+        if min_capacity<0 or (limit is not None and limit<1):
+            return jsonify({"error":"BAD REQUEST: min_capacity must be >= 0 and limit >= 1"}),400
+        rooms=room_schedule.availableRooms(cdays,start,end,semester,years,min_capacity,building,limit)
+        result=[self.mapRoom(r) for r in rooms]
+        return jsonify({"count":len(result),"results":result}),200
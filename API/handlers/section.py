@@ -1,5 +1,18 @@
-from flask import jsonify
+from flask import jsonify, request
 from API.dao.section import SectionDAO
+from API.handlers.pagination import wants_page, parse_page_args, page_response
+from API.services.stats_cache import stats_cache
+from API.services.stats_cube import stats_cube
+from API.services.intervals import IntervalList, to_seconds
+from API.services.room_schedule import room_schedule
+
+SECTION_COLUMNS = ["sid", "roomid", "cid", "mid", "semester", "years", "capacity"]
+SECTION_KEYS = ["sid"]
+SECTION_FIELDS = ["roomid", "cid", "mid", "semester", "years", "capacity"]
+
+# Upper bound on sections accepted by one bulk request
+MAX_BULK_SECTIONS = 1000
+
 
 class SectionHandler:
     def mapSection(self, s) -> dict:
@@ -13,17 +26,70 @@ class SectionHandler:
         result["capacity"] = s[6]
         return result
 
+    def rowFromResult(self, result):
+        return tuple(
+            result[k] for k in ("sid", "roomid", "cid", "mid", "semester", "years", "capacity")
+        )
+
+    def validate_term(self, semester, years):
+        valid_semesters = {"Fall", "Spring", "V1", "V2"}
+        if semester not in valid_semesters:
+            return "Invalid semester"
+        if not (isinstance(years, str) and len(years) == 4 and years.isdigit()):
+            return "Invalid year format (YYYY expected)"
+        return None
+
+    def check_section_write(self, result, capacity, term_error):
+        """
+        Maps the checks reported by a validated section write to the API
+        errors, in the same order the handler has always checked them.
+        """
+        # 1. FK existence
+        if not result["class_ok"]:
+            return jsonify("cid does not exist"), 404
+        if not result["meeting_ok"]:
+            return jsonify("mid does not exist"), 404
+        if not result["room_ok"]:
+            return jsonify("roomid does not exist"), 404
+
+        # 2. Capacity
+        room_capacity = result["room_capacity"]
+        if (
+            not isinstance(capacity, int)
+            or room_capacity is None
+            or capacity < 0
+            or capacity > room_capacity
+        ):
+            return jsonify("Section capacity is invalid or exceeds room capacity"), 400
+
+        # 3. Term & Year
+        if term_error:
+            return jsonify(term_error), 400
+
+        # 4. Scheduling conflict
+        if result["conflict_sid"] is not None:
+            conflicting_sid = result["conflict_sid"]
+            return jsonify(f"Scheduling conflict with section {conflicting_sid}"), 409
+        return None
+
     def getAllSections(self):
-        dao = SectionDAO()
-        sections = dao.getAllSections()
+        if wants_page(request.args):
+            error, page = parse_page_args(request.args, SECTION_COLUMNS, SECTION_KEYS)
+            if error:
+                return error
+            with SectionDAO() as dao:
+                rows = dao.getSectionsPage(page["fields"], page["after"], page["limit"])
+            return page_response(rows, page, SECTION_KEYS)
+        with SectionDAO() as dao:
+            sections = dao.getAllSections()
         result = []
         for s in sections:
             result.append(self.mapSection(s))
         return jsonify(result), 200
 
     def getSectionByID(self, sid):
-        dao = SectionDAO()
-        section = dao.getSectionByID(sid)
+        with SectionDAO() as dao:
+            section = dao.getSectionByID(sid)
         if not section:
             return jsonify("NOT FOUND"), 404
         else:
@@ -47,44 +113,32 @@ class SectionHandler:
         years = s["years"]
         capacity = s["capacity"]
 
-        dao = SectionDAO()
-
-        # --- Validations ---
-        # 1. FK existence
-        if dao.classExists(cid) is None:
-            return jsonify("cid does not exist"), 404
-        if dao.meetingExists(mid) is None:
-            return jsonify("mid does not exist"), 404
-        if dao.roomExists(roomid) is None:
-            return jsonify("roomid does not exist"), 404
-
-        # 2. Capacity
-        room_capacity = dao.getRoomCapacity(roomid)
-        if capacity < 0 or capacity > room_capacity[0]:
-            return jsonify("Section capacity is invalid or exceeds room capacity"), 400
-
-        # 3. Term & Year
-        valid_semesters = {"Fall", "Spring", "V1", "V2"}
-        if semester not in valid_semesters:
-            return jsonify("Invalid semester"), 400
-        if not (isinstance(years, str) and len(years) == 4 and years.isdigit()):
-            return jsonify("Invalid year format (YYYY expected)"), 400
-
-        # 4. Scheduling conflict
-        conflict = dao.hasScheduleConflict(roomid, mid)
-        if conflict:
-            conflicting_sid = conflict[0]
-            return jsonify(f"Scheduling conflict with section {conflicting_sid}"), 409
+        # Term & year are checked locally; the rest is validated by the database
+        term_error = self.validate_term(semester, years)
 
-        # --- Insert ---
-        sid = dao.insertSection(roomid, cid, mid, semester, years, capacity)
-        if sid is None:
+        # Released before the room schedule and stats cube borrow their own connections
+        with SectionDAO() as dao:
+            result = dao.insertSectionValidated(
+                roomid, cid, mid, semester, years,
+                capacity if isinstance(capacity, int) else None,
+                valid=term_error is None,
+            )
+        if result is None:
             return jsonify("Internal server error"), 500
-        elif sid == -1:
+        if result.get("integrity_error"):
+            return jsonify("Scheduling conflict with an existing section"), 409
+
+        error = self.check_section_write(result, capacity, term_error)
+        if error:
+            return error
+        if result["sid"] is None:
             return jsonify("Bad request"), 400
-        
-        new_section = dao.getSectionByID(sid)
-        return jsonify(self.mapSection(new_section)), 201
+
+        sid = result["sid"]
+        room_schedule.putSection(sid, roomid, mid, semester, years)
+        stats_cube.refreshSection(sid)
+        stats_cache.invalidate("section", [(years, semester)])
+        return jsonify(self.mapSection(self.rowFromResult(result))), 201
 
     def updateSection(self, sid, s):
         if (
@@ -102,56 +156,144 @@ class SectionHandler:
         semester = s["semester"]
         years = s["years"]
         capacity = s["capacity"]
-        dao = SectionDAO()
+        term_error = self.validate_term(semester, years)
 
-        # --- Validations ---
+        with SectionDAO() as dao:
+            result = dao.updateSectionValidated(
+                sid, roomid, cid, mid, semester, years,
+                capacity if isinstance(capacity, int) else None,
+                valid=term_error is None,
+            )
+        if result is None:
+            return jsonify("INTERNAL SERVER ERROR"), 500
+        if result.get("integrity_error"):
+            return jsonify("Scheduling conflict with an existing section"), 409
 
         # --- 0. Check if section exists ---
-        existing_section = dao.getSectionByID(sid)
-        if existing_section is None:
+        if not result["section_ok"]:
             return jsonify("Section not found"), 404
-    
-        # 1. FK existence
-        if dao.classExists(cid) is None:
-            return jsonify("cid does not exist"), 404
-        if dao.meetingExists(mid) is None:
-            return jsonify("mid does not exist"), 404
-        if dao.roomExists(roomid) is None:
-            return jsonify("roomid does not exist"), 404
 
-        # 2. Capacity
-        room_capacity = dao.getRoomCapacity(roomid)
-        if capacity < 0 or capacity > room_capacity[0]:
-            return jsonify("Section capacity is invalid or exceeds room capacity"), 400
+        error = self.check_section_write(result, capacity, term_error)
+        if error:
+            return error
+        if result["sid"] is None:
+            return jsonify("NOT FOUND"), 404
 
-        # 3. Term & Year
-        valid_semesters = {"Fall", "Spring", "V1", "V2"}
-        if semester not in valid_semesters:
-            return jsonify("Invalid semester"), 400
-        if not (isinstance(years, str) and len(years) == 4 and years.isdigit()):
-            return jsonify("Invalid year format (YYYY expected)"), 400
+        room_schedule.putSection(sid, roomid, mid, semester, years)
+        stats_cube.refreshSection(sid)
+        stats_cache.invalidate(
+            "section", [(result["old_years"], result["old_semester"]), (years, semester)]
+        )
+        return jsonify(self.mapSection(self.rowFromResult(result))), 200
 
-        # 4. Scheduling conflict
-        conflict = dao.hasScheduleConflict(roomid, mid, sid)
-        if conflict:
-            conflicting_sid = conflict[0]
-            return jsonify(f"Scheduling conflict with section {conflicting_sid}"), 409
-        
-        # --- Update ---
-        updated_sid = dao.updateSection(sid, roomid, cid, mid, semester, years, capacity)
-        if updated_sid is None:
-            return jsonify("INTERNAL SERVER ERROR"), 500
-        elif updated_sid == -1:
-            return jsonify("NOT FOUND"), 404
-        
-        updated_section = dao.getSectionByID(sid)
-        return jsonify(self.mapSection(updated_section)), 200
+    def insertSections(self, payload):
+        """
+        Bulk creation. FKs and capacities are fetched with one set-based query
+        each; conflicts with existing sections and within the batch are found
+        with the room schedule index plus per-(room, days) sorted interval
+        lists of the batch's own accepted items. Survivors are inserted in one
+        statement that re-checks room overlaps in SQL, since the index may not
+        have seen other workers' writes. Reports a status per item.
+        """
+        items = payload.get("sections") if isinstance(payload, dict) else payload
+        if not isinstance(items, list) or len(items) == 0:
+            return jsonify("BAD REQUEST: 'sections' must be a non-empty list"), 400
+        if len(items) > MAX_BULK_SECTIONS:
+            return jsonify(f"BAD REQUEST: at most {MAX_BULK_SECTIONS} sections per request"), 400
+
+        results = [None] * len(items)
+
+        def fail(i, message, status):
+            results[i] = {"index": i, "status": status, "error": message}
+
+        candidates = []
+        for i, s in enumerate(items):
+            if not isinstance(s, dict) or any(f not in s for f in SECTION_FIELDS):
+                fail(i, "BAD REQUEST: MISSING VALUES", 400)
+            else:
+                candidates.append(i)
+
+        def ids(field):
+            return {items[i][field] for i in candidates}
+
+        with SectionDAO() as dao:
+            classes = dao.getExistingClassIDs(ids("cid"))
+            meetings = dao.getMeetingsByIDs(ids("mid"))
+            rooms = dao.getRoomCapacities(ids("roomid"))
+
+        batch_schedules = {}
+        accepted = []
+        for i in candidates:
+            s = items[i]
+            capacity = s["capacity"]
+            term_error = self.validate_term(s["semester"], s["years"])
+            # Same checks, order and messages as POST /section
+            if s["cid"] not in classes:
+                fail(i, "cid does not exist", 404)
+            elif s["mid"] not in meetings:
+                fail(i, "mid does not exist", 404)
+            elif s["roomid"] not in rooms:
+                fail(i, "roomid does not exist", 404)
+            elif (
+                not isinstance(capacity, int)
+                or rooms[s["roomid"]] is None
+                or capacity < 0
+                or capacity > rooms[s["roomid"]]
+            ):
+                fail(i, "Section capacity is invalid or exceeds room capacity", 400)
+            elif term_error:
+                fail(i, term_error, 400)
+            else:
+                cdays, start, end = meetings[s["mid"]]
+                start, end = to_seconds(start), to_seconds(end)
+                intervals = batch_schedules.setdefault((s["roomid"], cdays), IntervalList())
+                conflicting_sid = room_schedule.findConflict(s["roomid"], cdays, start, end)
+                conflicting_item = intervals.firstOverlap(start, end)
+                if conflicting_sid is not None:
+                    fail(i, f"Scheduling conflict with section {conflicting_sid}", 409)
+                elif conflicting_item is not None:
+                    fail(i, f"Scheduling conflict with item {conflicting_item} of this request", 409)
+                else:
+                    intervals.add(start, end, i)
+                    accepted.append(i)
+
+        if accepted:
+            rows = [tuple(items[i][f] for f in SECTION_FIELDS) for i in accepted]
+            with SectionDAO() as dao:
+                inserted = dao.insertSections(rows)
+            if inserted is None:
+                return jsonify("INTERNAL SERVER ERROR"), 500
+            # (roomid, mid, semester, years) is unique, so it identifies each inserted row
+            by_key = {(r[1], r[3], r[4], r[5]): r for r in inserted}
+            for i in accepted:
+                s = items[i]
+                row = by_key.get((s["roomid"], s["mid"], s["semester"], s["years"]))
+                if row is None:
+                    # Skipped by the insert: a unique key or a room overlap written since the checks above
+                    fail(i, "Scheduling conflict with an existing section", 409)
+                else:
+                    results[i] = {"index": i, "status": 201, "section": self.mapSection(row)}
+                    room_schedule.putSection(row[0], row[1], row[3], row[4], row[5])
+            if inserted:
+                stats_cube.invalidate("section")
+                stats_cache.invalidate("section", {(r[5], r[4]) for r in inserted})
+
+        created = sum(1 for r in results if r["status"] == 201)
+        return jsonify({
+            "created": created,
+            "failed": len(results) - created,
+            "results": results,
+        }), 200
 
     def deleteSection(self, sid):
-        dao = SectionDAO()
-        deleted_sid = dao.deleteSection(sid)
+        with SectionDAO() as dao:
+            existing_section = dao.getSectionByID(sid)
+            deleted_sid = dao.deleteSection(sid)
 
         if deleted_sid == -1:
             return jsonify("Section not found"), 404
+        room_schedule.removeSection(sid)
+        stats_cube.refreshSection(sid)
+        stats_cache.invalidate("section", [(existing_section[5], existing_section[4])])
         return jsonify(f"Section {deleted_sid} deleted successfully"), 204
 
@@ -1,35 +1,38 @@
 from flask import jsonify, request
-from API.dao.stats import StatsDAO
+from werkzeug.datastructures import MultiDict
+from API.services.stats_cube import stats_cube
+from API.services.stats_cache import stats_cache
 
-class StatsHandler:
+# Upper bound on stat specs accepted by /stats/batch
+MAX_BATCH_STATS = 20
 
-    def getSectionsByDay(self):
-        semester = request.args.get("semester")
-        years = request.args.get("year")
 
-        dao = StatsDAO()
-        rows = dao.getSectionsByDay(semester, years)
+class StatsHandler:
 
-        # Initialize counters for all days in problem statement
-        day_count = { d: 0 for d in ["L","M","W","J","V","S","D"] }
+    def getSectionsByDay(self, args=None):
+        args = request.args if args is None else args
+        semester = args.get("semester")
+        years = args.get("year")
 
-        for (cdays,) in rows:
-            for d in cdays:   # each letter increments individually
-                if d in day_count:
-                    day_count[d] += 1
+        def compute():
+            # Counts every letter of each section's cdays, for all days in problem statement
+            day_count = stats_cube.getSectionsByDay(semester, years)
+            return [{"day": d, "sections": day_count[d]} for d in day_count]
 
-        result = [{"day": d, "sections": day_count[d]} for d in day_count]
+        result = stats_cache.getOrCompute(
+            "sections-by-day", compute, year=years, semester=semester
+        )
         return jsonify(result), 200
 
 
-    def getTopDepartments(self):
-        semester = request.args.get("semester")
-        years = request.args.get("year")
-        limit = request.args.get("limit", 1)
+    def getTopDepartments(self, args=None):
+        args = request.args if args is None else args
+        semester = args.get("semester")
+        years = args.get("year")
 
         # Try to parse limit, default = 1
         try:
-            limit = int(request.args.get("limit", 1))
+            limit = int(args.get("limit", 1))
         except ValueError:
             return jsonify("limit must be an integer"), 400
 
@@ -37,38 +40,46 @@ class StatsHandler:
         if limit < 1 or limit > 5:
             return jsonify("limit must be between 1 and 5"), 400
 
-        dao = StatsDAO()
-        rows = dao.getTopDepartments(semester, years, limit)
+        def compute():
+            rows = stats_cube.getTopDepartments(semester, years, limit)
+            return [{"fullcode": dept, "sections": count} for dept, count in rows]
 
-        result = [{"fullcode": dept, "sections": count} for dept, count in rows]
+        result = stats_cache.getOrCompute(
+            "top-departments-by-sections", compute, year=years, semester=semester, limit=limit
+        )
         return jsonify(result), 200
      
-    def getTopRoomsByUtilization(self):
-        year=request.args.get("year",type=int)
-        semester = request.args.get("semester",type=str)
-        limit=request.args.get("limit",type=int,default=5)
+    def getTopRoomsByUtilization(self, args=None):
+        args = request.args if args is None else args
+        year=args.get("year",type=int)
+        semester = args.get("semester",type=str)
+        limit=args.get("limit",type=int,default=5)
 
         if limit<1 or limit>10:
             return jsonify("BAD REQUEST: Limit must be between 1 and 10"),400
         valid_semesters={"Fall","Spring","V1","V2"}
         if semester and semester not in valid_semesters:
             return jsonify("BAD REQUEST: Invalid semester value"),400
-        dao=StatsDAO()
-        stats=dao.getTopRoomsByUtilization(year,semester,limit)
-
-        result=[{
-            "rid":stat[0],
-            "building":stat[1],
-            "room_number":stat[2],
-            "utilization":float(stat[3]) if stat[3] is not None else 0.0
-        } for stat in stats]
+        def compute():
+            stats=stats_cube.getTopRoomsByUtilization(year,semester,limit)
+            return [{
+                "rid":stat[0],
+                "building":stat[1],
+                "room_number":stat[2],
+                "utilization":float(stat[3]) if stat[3] is not None else 0.0
+            } for stat in stats]
+
+        result=stats_cache.getOrCompute(
+            "top-rooms-by-utilization",compute,year=year,semester=semester,limit=limit
+        )
         return jsonify(result),200
     
-    def getMultiRoomClasses(self):
-        year=request.args.get("year",type=int)
-        semester=request.args.get("semester",type=str)
-        limit=request.args.get("limit",type=int,default=5)
-        orderby=request.args.get("orderby",type=str,default="desc")
+    def getMultiRoomClasses(self, args=None):
+        args = request.args if args is None else args
+        year=args.get("year",type=int)
+        semester=args.get("semester",type=str)
+        limit=args.get("limit",type=int,default=5)
+        orderby=args.get("orderby",type=str,default="desc")
 
         if limit<1 or limit>10:
             return jsonify("BAD REQUEST: Limit must be between 1 and 10"),400
@@ -77,21 +88,24 @@ class StatsHandler:
             return jsonify("BAD REQUEST: Invalid semester value"),400
         if orderby.lower() not in {"asc","desc"}:
             return jsonify("BAD REQUEST: orderby must be 'asc' or 'desc'"),400
-        dao=StatsDAO()
-        stats=dao.getMultiRoomClasses(year,semester,limit,orderby)
-
-        result=[
-            {"cid":stat[0],
-            "fullcode":stat[1],
-            "distinct_room_count":stat[2]} for stat in stats]
-
+        def compute():
+            stats=stats_cube.getMultiRoomClasses(year,semester,limit,orderby)
+            return [
+                {"cid":stat[0],
+                "fullcode":stat[1],
+                "distinct_room_count":stat[2]} for stat in stats]
+
+        result=stats_cache.getOrCompute(
+            "multi-room-classes",compute,year=year,semester=semester,limit=limit,orderby=orderby
+        )
         return jsonify(result),200
 
 
-    def getLongestAverageMeetingDuration(self):
-        year = request.args.get("year", type=int)
-        semester = request.args.get("semester", type=str)
-        limit = request.args.get("limit", type=int, default=5)
+    def getLongestAverageMeetingDuration(self, args=None):
+        args = request.args if args is None else args
+        year = args.get("year", type=int)
+        semester = args.get("semester", type=str)
+        limit = args.get("limit", type=int, default=5)
 
         # Validate limit range
         if limit < 1 or limit > 10:
@@ -101,20 +115,60 @@ class StatsHandler:
         if semester and semester not in valid_semesters:
             return jsonify("BAD REQUEST: Invalid semester value"), 400
 
-        dao = StatsDAO()
-        rows = dao.getLongestAverageMeetingDuration(year, semester, limit)
+        def compute():
+            rows = stats_cube.getLongestAverageMeetingDuration(year, semester, limit)
+            return [{
+                "cid": row[0],
+                "fullcode": row[1],
+                "average_minutes": float(row[2]) if row[2] is not None else 0.0
+            } for row in rows]
+
+        result = stats_cache.getOrCompute(
+            "top-classes-by-avg-duration", compute, year=year, semester=semester, limit=limit
+        )
+        return jsonify(result), 200
+    
 
-        result = [{
-            "cid": row[0],
-            "fullcode": row[1],
-            "average_minutes": float(row[2]) if row[2] is not None else 0.0
-        } for row in rows]
+    def getClassesWithoutPrerequisites(self, args=None):
+        def compute():
+            rows = stats_cube.getClassesWithoutPrereqs()
+            return [{"cid": row[0], "fullcode": row[1]} for row in rows]
 
+        result = stats_cache.getOrCompute("classes-without-prereqs", compute)
         return jsonify(result), 200
-    
 
-    def getClassesWithoutPrerequisites(self):
-        dao = StatsDAO()
-        rows = dao.getClassesWithoutPrereqs()
-        result = [{"cid": row[0], "fullcode": row[1]} for row in rows]
-        return jsonify(result), 200
\ No newline at end of file
+    def getBatch(self, payload):
+        specs = payload.get("stats") if isinstance(payload, dict) else payload
+        if not isinstance(specs, list) or len(specs) == 0:
+            return jsonify("BAD REQUEST: 'stats' must be a non-empty list"), 400
+        if len(specs) > MAX_BATCH_STATS:
+            return jsonify(f"BAD REQUEST: at most {MAX_BATCH_STATS} stats per batch"), 400
+
+        stats = {
+            "sections-by-day": self.getSectionsByDay,
+            "top-departments-by-sections": self.getTopDepartments,
+            "top-rooms-by-utilization": self.getTopRoomsByUtilization,
+            "multi-room-classes": self.getMultiRoomClasses,
+            "top-classes-by-avg-duration": self.getLongestAverageMeetingDuration,
+            "classes-without-prereqs": self.getClassesWithoutPrerequisites,
+        }
+
+        results = []
+        # Every stat in the batch is answered from the same cube snapshot. Specs run
+        # in order: cube queries share its lock, so threads measured no faster
+        # (benchmarks/bench_stats_batch.py)
+        with stats_cube.snapshot():
+            for spec in specs:
+                if not isinstance(spec, dict) or spec.get("stat") not in stats:
+                    results.append({"stat": spec.get("stat") if isinstance(spec, dict) else None,
+                                    "status": 400,
+                                    "data": f"BAD REQUEST: 'stat' must be one of {sorted(stats)}"})
+                    continue
+                args = MultiDict({k: v for k, v in spec.items() if k != "stat" and v is not None})
+                response, status = stats[spec["stat"]](args)
+                results.append({"stat": spec["stat"], "status": status, "data": response.get_json()})
+
+        return jsonify({"count": len(results), "results": results}), 200
+
+    def getCacheStats(self):
+        return jsonify(stats_cache.stats()), 200
\ No newline at end of file
@@ -1,31 +1,47 @@
+import base64
+
 from flask import jsonify, request
-from API.dao.syllabus import SyllabusDAO
+from API.dao.syllabus import SyllabusDAO, VECTOR_METRICS, VECTOR_INDEX_METHODS
+from API.services.vector_index import vector_index
+from Chatbot.llm.answer_cache import answer_cache
+
+def encode_embedding(vector):
+    """base64 of the little-endian float32 values (3 KB for 768 dims instead of ~15 KB of text)."""
+    return base64.b64encode(vector.astype("<f4").tobytes()).decode("ascii")
 
 class SyllabusHandler:
     def mapChunk(self,row)->dict:
-        return {
+        result={
         "chunkid":row[0],
         "courseid":row[1],
         "chunk":row[2],
-        "embedding_text":row[3]
         }
+        if row[3] is not None:
+            result["embedding"]=encode_embedding(row[3])
+        return result
+
+    def wants_embedding(self):
+        """Embeddings are only returned with ?include_embedding=1."""
+        return request.args.get("include_embedding","0").lower() in {"1","true"}
     
     def insertChunk(self,chunk_payload):
         error,parsed=self.validate_chunk_payload(chunk_payload)
         if error:
             return error
-        dao=SyllabusDAO()
-        chunkid=dao.insertChunk(
-            parsed["courseid"],
-            parsed["chunk"],
-            parsed["embedding_text"]
-        )
-        chunk=dao.getChunkByID(chunkid)
+        with SyllabusDAO() as dao:
+            chunkid=dao.insertChunk(
+                parsed["courseid"],
+                parsed["chunk"],
+                parsed["embedding_text"]
+            )
+            chunk=dao.getChunkByID(chunkid,self.wants_embedding())
+        vector_index.invalidate()
+        answer_cache.invalidateCourse(parsed["courseid"])
         return jsonify(self.mapChunk(chunk)),201
 
     def getChunksByCourseID(self,courseid):
-        dao=SyllabusDAO()
-        chunks=dao.getChunksByCourseID(courseid)
+        with SyllabusDAO() as dao:
+            chunks=dao.getChunksByCourseID(courseid,self.wants_embedding())
         if not chunks:
             return jsonify({"error":"NOT FOUND"}),404
         result=[self.mapChunk(c) for c in chunks]
@@ -63,6 +79,19 @@ class SyllabusHandler:
         }
         return None,parsed
     
+    def parse_search_knobs(self,payload):
+        """Optional metric, ef_search, probes and exact fields of a search payload."""
+        metric=payload.get("metric")
+        if metric is not None and metric not in VECTOR_METRICS:
+            return (jsonify({"error":f"BAD REQUEST: metric must be one of {sorted(VECTOR_METRICS)}"}),400),None
+        knobs={"metric":metric,"exact":bool(payload.get("exact",False))}
+        for field in ("ef_search","probes"):
+            value=payload.get(field)
+            if value is not None and (not isinstance(value,int) or value<1 or value>1000):
+                return (jsonify({"error":f"BAD REQUEST: {field} must be an integer between 1 and 1000"}),400),None
+            knobs[field]=value
+        return None,knobs
+
     def searchSimilar(self,payload):
         if "embedding_text" not in payload:
             return jsonify({"error":"BAD REQUEST: Missing field embedding_text"}),400
@@ -75,8 +104,11 @@ class SyllabusHandler:
             limit_int=int(limit)
         except(ValueError,TypeError):
             return jsonify({"error":"BAD REQUEST: embedding_text must be a list of floats and limit must be an integer"}),400
-        dao=SyllabusDAO()
-        results=dao.getFragments(embedding,limit_int)
+        error,knobs=self.parse_search_knobs(payload)
+        if error:
+            return error
+        with SyllabusDAO() as dao:
+            results=dao.getFragments(embedding,limit_int,include_embedding=self.wants_embedding(),**knobs)
         mapped=[self.mapChunk(r) for r in results]
         return jsonify({
             "count":len(mapped),
@@ -88,8 +120,11 @@ class SyllabusHandler:
             return jsonify({"error":"BAD REQUEST: Missing field embedding_text"}),400
         embedding=payload["embedding"]
         limit=payload.get("limit",5)
-        dao=SyllabusDAO()
-        results=dao.getFragmentsByCourseAndEmbedding(courseid,embedding,limit)
+        error,knobs=self.parse_search_knobs(payload)
+        if error:
+            return error
+        with SyllabusDAO() as dao:
+            results=dao.getFragmentsByCourseAndEmbedding(courseid,embedding,limit,include_embedding=self.wants_embedding(),**knobs)
         mapped=[self.mapChunk(r) for r in results]
         return jsonify({
             "count":len(mapped),
@@ -97,8 +132,40 @@ class SyllabusHandler:
         }),200
     
     def deleteChunksByCourseID(self,courseid):
-        dao=SyllabusDAO()
-        result=dao.deleteChunksByCourseID(courseid)
+        with SyllabusDAO() as dao:
+            result=dao.deleteChunksByCourseID(courseid)
+        if result==-1:
+            return jsonify({"error":"NOT FOUND"}),404
+        vector_index.invalidate()
+        answer_cache.invalidateCourse(courseid)
+        return "",204
+
+    def getVectorIndexes(self):
+        with SyllabusDAO() as dao:
+            indexes=dao.getVectorIndexes()
+        return jsonify([{"name":name,"definition":definition} for name,definition in indexes]),200
+
+    def createVectorIndex(self,payload):
+        payload=payload or {}
+        method=payload.get("method","hnsw")
+        metric=payload.get("metric","l2")
+        if method not in VECTOR_INDEX_METHODS:
+            return jsonify({"error":f"BAD REQUEST: method must be one of {sorted(VECTOR_INDEX_METHODS)}"}),400
+        if metric not in VECTOR_METRICS:
+            return jsonify({"error":f"BAD REQUEST: metric must be one of {sorted(VECTOR_METRICS)}"}),400
+        params={"m":16,"ef_construction":64,"lists":100}
+        for field in params:
+            value=payload.get(field,params[field])
+            if not isinstance(value,int) or value<1:
+                return jsonify({"error":f"BAD REQUEST: {field} must be a positive integer"}),400
+            params[field]=value
+        with SyllabusDAO() as dao:
+            name=dao.createVectorIndex(method,metric,**params)
+        return jsonify({"name":name,"method":method,"metric":metric}),201
+
+    def dropVectorIndex(self,name):
+        with SyllabusDAO() as dao:
+            result=dao.dropVectorIndex(name)
         if result==-1:
             return jsonify({"error":"NOT FOUND"}),404
-        return "",204
\ No newline at end of file
+        return "",204
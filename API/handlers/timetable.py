@@ -0,0 +1,66 @@
+from flask import jsonify
+from API.dao.section import SectionDAO
+from API.handlers.section import SectionHandler
+from API.services.planner import curriculum_planner
+from API.services.timetable import build_options, generate_timetables
+
+MAX_TIMETABLE_CLASSES = 10
+MAX_TIMETABLE_RESULTS = 100
+
+
+def format_clock(seconds):
+    return "%02d:%02d" % (seconds // 3600, seconds % 3600 // 60)
+
+
+class TimetableHandler:
+    def mapTimetable(self, gaps, earliest, chosen) -> dict:
+        result = {}
+        result["gap_minutes"] = gaps
+        result["earliest_start"] = format_clock(earliest * 60)
+        result["sections"] = [
+            {
+                "cid": option.cid,
+                "sids": option.sids,
+                "mid": option.mid,
+                "cdays": option.cdays,
+                "starttime": format_clock(option.start),
+                "endtime": format_clock(option.end),
+            }
+            for option in sorted(chosen, key=lambda o: (o.start, o.cdays))
+        ]
+        return result
+
+    def generateTimetables(self, payload):
+        if not payload or "classes" not in payload or "semester" not in payload or "years" not in payload:
+            return jsonify("BAD REQUEST: Missing field classes, semester or years"), 400
+
+        classes = payload["classes"]
+        if not isinstance(classes, list) or not 1 <= len(classes) <= MAX_TIMETABLE_CLASSES:
+            return jsonify(f"BAD REQUEST: classes must be a list of 1 to {MAX_TIMETABLE_CLASSES} classes"), 400
+        cids = []
+        for value in classes:
+            cid = curriculum_planner.resolve(value)
+            if cid is None:
+                return jsonify(f"NOT FOUND: class {value} does not exist"), 404
+            if cid not in cids:
+                cids.append(cid)
+
+        semester = payload["semester"]
+        years = payload["years"]
+        term_error = SectionHandler().validate_term(semester, years)
+        if term_error:
+            return jsonify(term_error), 400
+
+        limit = payload.get("limit", 20)
+        if not isinstance(limit, int) or not 1 <= limit <= MAX_TIMETABLE_RESULTS:
+            return jsonify(f"BAD REQUEST: limit must be between 1 and {MAX_TIMETABLE_RESULTS}"), 400
+
+        with SectionDAO() as dao:
+            options = build_options(dao.getSectionsWithMeetings(cids, semester, years))
+        unavailable = [cid for cid in cids if cid not in options]
+        if unavailable:
+            return jsonify({"count": 0, "truncated": False, "results": [], "unavailable": unavailable}), 200
+
+        count, truncated, best = generate_timetables(options, limit)
+        results = [self.mapTimetable(gaps, earliest, chosen) for gaps, earliest, chosen in best]
+        return jsonify({"count": count, "truncated": truncated, "results": results, "unavailable": []}), 200
@@ -1,5 +1,11 @@
-from flask import jsonify
+from flask import jsonify, request
 from API.dao.user import UserDAO
+from API.handlers.pagination import wants_page, parse_page_args, page_response
+
+# Password hashes are never projectable through ?fields or keyset pages
+USER_COLUMNS = ["uid", "username"]
+USER_KEYS = ["uid"]
+
 
 class UserHandler:
     def mapUser(self, u) -> dict:
@@ -10,21 +16,28 @@ class UserHandler:
         return result
 
     def getAllUsers(self):
-        dao = UserDAO()
-        users = dao.getAllUsers()
+        if wants_page(request.args):
+            error, page = parse_page_args(request.args, USER_COLUMNS, USER_KEYS)
+            if error:
+                return error
+            with UserDAO() as dao:
+                rows = dao.getUsersPage(page["fields"], page["after"], page["limit"])
+            return page_response(rows, page, USER_KEYS)
+        with UserDAO() as dao:
+            users = dao.getAllUsers()
         result = [self.mapUser(u) for u in users]
         return jsonify(result), 200
 
     def getUserByID(self, uid):
-        dao = UserDAO()
-        user = dao.getUserByID(uid)
+        with UserDAO() as dao:
+            user = dao.getUserByID(uid)
         if not user:
             return jsonify("NOT FOUND"), 404
         return jsonify(self.mapUser(user)), 200
     
     def getUserByUsername(self, username):
-        dao = UserDAO()
-        user = dao.getUserByUsername(username)
+        with UserDAO() as dao:
+            user = dao.getUserByUsername(username)
         if not user:
             return jsonify("NOT FOUND"), 404
         return jsonify(self.mapUser(user)), 200
@@ -36,13 +49,12 @@ class UserHandler:
         username = body["username"]
         password = body["password"]
 
-        dao = UserDAO()
-
-        if dao.getUserByUsername(username) is not None:
-            return jsonify("Username already exists"), 409
+        with UserDAO() as dao:
+            if dao.getUserByUsername(username) is not None:
+                return jsonify("Username already exists"), 409
 
-        uid = dao.insertUser(username, password)
-        new_user = dao.getUserByID(uid)
+            uid = dao.insertUser(username, password)
+            new_user = dao.getUserByID(uid)
         return jsonify(self.mapUser(new_user)), 201
 
     def updateUser(self, uid, body):
@@ -52,19 +64,18 @@ class UserHandler:
         username = body["username"]
         password = body["password"]
 
-        dao = UserDAO()
+        with UserDAO() as dao:
+            existing = dao.getUserByID(uid)
+            if not existing:
+                return jsonify("NOT FOUND"), 404
 
-        existing = dao.getUserByID(uid)
-        if not existing:
-            return jsonify("NOT FOUND"), 404
-
-        dao.updateUser(uid, username, password)
-        updated = dao.getUserByID(uid)
+            dao.updateUser(uid, username, password)
+            updated = dao.getUserByID(uid)
         return jsonify(self.mapUser(updated)), 200
 
     def deleteUser(self, uid):
-        dao = UserDAO()
-        deleted = dao.deleteUser(uid)
+        with UserDAO() as dao:
+            deleted = dao.deleteUser(uid)
 
         if deleted == -1:
             return jsonify("User not found"), 404
@@ -72,12 +83,11 @@ class UserHandler:
         return jsonify(f"User {deleted} deleted successfully"), 204
     
     def login(self, credentials):
-        dao = UserDAO()
-
         username = credentials.get("username")
         password = credentials.get("password")
 
-        result = dao.verifyUser(username, password)
+        with UserDAO() as dao:
+            result = dao.verifyUser(username, password)
 
         if result is None:
             return {"User not found"}, 404
@@ -12,6 +12,11 @@ from API.handlers.stats import StatsHandler
 from API.handlers.user import UserHandler
 from API.handlers.chatbot import ChatbotHandler
 from API.handlers.syllabus import SyllabusHandler
+from API.handlers.export import ExportHandler
+from API.handlers.planner import PlannerHandler
+from API.handlers.timetable import TimetableHandler
+from API.config.pgpool import get_pool, PoolTimeout
+from API.services.chatbot_scheduler import ChatbotBusy, ChatbotTimeout
 
 app = Flask(__name__)
 CORS(app)
@@ -68,6 +73,48 @@ def index():
     )
 
 
+@api.get("/db/pool")
+def db_pool_stats():
+    """
+    Database Connection Pool Statistics
+    ---
+    tags:
+      - Health
+    responses:
+      200:
+        description: Counters for the shared PostgreSQL connection pool
+        schema:
+          type: object
+          properties:
+            borrowed:
+              type: integer
+            returned:
+              type: integer
+            discarded:
+              type: integer
+            timeouts:
+              type: integer
+            waits:
+              type: integer
+            wait_seconds:
+              type: number
+            minconn:
+              type: integer
+            maxconn:
+              type: integer
+            in_use:
+              type: integer
+            idle:
+              type: integer
+    """
+    return jsonify(get_pool().stats()), 200
+
+
+@app.errorhandler(PoolTimeout)
+def handle_pool_timeout(e):
+    return jsonify({"error": "SERVICE UNAVAILABLE: database is busy, try again"}), 503
+
+
 # ======= Class Routes =======
 chandler = ClassHandler()
 
@@ -79,6 +126,22 @@ def get_all_classes():
     ---
     tags:
       - Classes
+    parameters:
+      - name: after
+        in: query
+        type: string
+        required: false
+        description: 'Keyset cursor: cid of the last row of the previous page (next_after)'
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Page size (1-500, default 100). Any paging parameter switches the response to a page object
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Comma-separated columns to return; the key is always included
     responses:
       200:
         description: List of all classes
@@ -332,6 +395,22 @@ def get_all_meetings():
     ---
     tags:
       - Meetings
+    parameters:
+      - name: after
+        in: query
+        type: string
+        required: false
+        description: 'Keyset cursor: mid of the last row of the previous page (next_after)'
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Page size (1-500, default 100). Any paging parameter switches the response to a page object
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Comma-separated columns to return; the key is always included
     responses:
       200:
         description: List of all meetings
@@ -537,6 +616,22 @@ def get_all_sections():
     ---
     tags:
       - Sections
+    parameters:
+      - name: after
+        in: query
+        type: string
+        required: false
+        description: 'Keyset cursor: sid of the last row of the previous page (next_after)'
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Page size (1-500, default 100). Any paging parameter switches the response to a page object
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Comma-separated columns to return; the key is always included
     responses:
       200:
         description: List of all sections
@@ -647,6 +742,67 @@ def create_section():
     return shandler.insertSection(s)
 
 
+@api.post("/section/bulk")
+def create_sections_bulk():
+    """
+    Create Many Sections
+    ---
+    tags:
+      - Sections
+    parameters:
+      - in: body
+        name: body
+        required: true
+        description: Sections to create, validated like POST /section
+        schema:
+          type: object
+          required:
+            - sections
+          properties:
+            sections:
+              type: array
+              items:
+                type: object
+                properties:
+                  roomid:
+                    type: integer
+                    example: 1
+                  cid:
+                    type: integer
+                    example: 5
+                  mid:
+                    type: integer
+                    example: 3
+                  semester:
+                    type: string
+                    example: "Fall"
+                  years:
+                    type: string
+                    example: "2025"
+                  capacity:
+                    type: integer
+                    example: 35
+    responses:
+      200:
+        description: 'Per-item results: 201 with the created section, or 400/404/409 with an error'
+        schema:
+          type: object
+          properties:
+            created:
+              type: integer
+            failed:
+              type: integer
+            results:
+              type: array
+              items:
+                type: object
+      400:
+        description: Missing or too many sections
+    """
+    data = request.get_json()
+    return shandler.insertSections(data)
+
+
 @api.get("/section/<int:sid>")
 def handle_section_by_id(sid):
     """
@@ -778,6 +934,22 @@ def get_all_rooms():
     ---
     tags:
       - Rooms
+    parameters:
+      - name: after
+        in: query
+        type: string
+        required: false
+        description: 'Keyset cursor: rid of the last row of the previous page (next_after)'
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Page size (1-500, default 100). Any paging parameter switches the response to a page object
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Comma-separated columns to return; the key is always included
     responses:
       200:
         description: List of all rooms
@@ -856,6 +1028,68 @@ def create_room():
     return rhandler.insertRoom(room)
 
 
+@api.get("/rooms/available")
+def handle_rooms_available():
+    """
+    Search Available Rooms
+    ---
+    tags:
+      - Rooms
+    description: >
+      Rooms that have no section overlapping the given time window, answered
+      from the in-memory room schedule index. Without semester/year a room is
+      only returned if it is free in every term. Results are ranked by tightest
+      fit (smallest capacity first), then building and room number.
+    parameters:
+      - name: cdays
+        in: query
+        type: string
+        required: true
+        description: '"MJ" or "LWV"'
+      - name: start
+        in: query
+        type: string
+        required: true
+        example: "10:30"
+      - name: end
+        in: query
+        type: string
+        required: true
+        example: "11:20"
+      - name: semester
+        in: query
+        type: string
+        required: false
+        example: "Fall"
+      - name: year
+        in: query
+        type: string
+        required: false
+        example: "2025"
+      - name: min_capacity
+        in: query
+        type: integer
+        required: false
+        description: Minimum room capacity
+      - name: building
+        in: query
+        type: string
+        required: false
+        description: Only rooms in this building
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Maximum number of rooms to return
+    responses:
+      200:
+        description: Ranked list of free rooms
+      400:
+        description: Missing or invalid parameters
+    """
+    return rhandler.getAvailableRooms()
+
+
 @api.get("/room/<int:rid>")
 def handle_room_by_id(rid):
     """
@@ -889,6 +1123,102 @@ def handle_room_by_id(rid):
     return rhandler.getRoomByID(rid)
 
 
+@api.get("/room/<int:rid>/free-slots")
+def handle_room_free_slots(rid):
+    """
+    Get Free Time Slots of a Room
+    ---
+    tags:
+      - Rooms
+    parameters:
+      - name: rid
+        in: path
+        type: integer
+        required: true
+        description: Room ID
+      - name: cdays
+        in: query
+        type: string
+        required: true
+        description: '"MJ" or "LWV"'
+      - name: semester
+        in: query
+        type: string
+        required: true
+        example: "Fall"
+      - name: year
+        in: query
+        type: string
+        required: true
+        example: "2025"
+      - name: from
+        in: query
+        type: string
+        required: false
+        description: Start of the day window in HH:MM (default 07:30)
+      - name: to
+        in: query
+        type: string
+        required: false
+        description: End of the day window in HH:MM (default 19:45)
+      - name: min_minutes
+        in: query
+        type: integer
+        required: false
+        description: Only return gaps at least this long
+    responses:
+      200:
+        description: Gaps between the room's meetings for that term and days
+      400:
+        description: Missing or invalid parameters
+    """
+    return rhandler.getFreeSlots(rid)
+
+
+@api.get("/room/<int:rid>/conflicts")
+def handle_room_conflicts(rid):
+    """
+    Check a Meeting Against a Room's Schedule
+    ---
+    tags:
+      - Rooms
+    parameters:
+      - name: rid
+        in: path
+        type: integer
+        required: true
+        description: Room ID
+      - name: mid
+        in: query
+        type: integer
+        required: true
+        description: Meeting whose time slot is checked
+      - name: semester
+        in: query
+        type: string
+        required: false
+        description: Only consider sections of this semester
+      - name: year
+        in: query
+        type: string
+        required: false
+        description: Only consider sections of this year
+      - name: exclude_sid
+        in: query
+        type: integer
+        required: false
+        description: Section to ignore (e.g. the one being updated)
+    responses:
+      200:
+        description: Whether the slot is taken and by which section
+      400:
+        description: Missing mid
+      404:
+        description: Meeting not found
+    """
+    return rhandler.getConflict(rid)
+
+
 @api.put("/room/<int:rid>")
 def handle_room_update(rid):
     """
@@ -971,6 +1301,22 @@ def handle_all_requisites():
     ---
     tags:
       - Requisites
+    parameters:
+      - name: after
+        in: query
+        type: string
+        required: false
+        description: 'Keyset cursor: classid,reqid of the last row of the previous page (next_after)'
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Page size (1-500, default 100). Any paging parameter switches the response to a page object
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Comma-separated columns to return; the key is always included
     responses:
       200:
         description: List of all prerequisite relationships
@@ -1046,6 +1392,53 @@ def handle_requisite():
     return requisitehandler.insertRequisite(data)
 
 
+@api.get("/requisite/<int:classid>/closure")
+def handle_requisite_closure(classid):
+    """
+    Get All Requisites of a Class
+    ---
+    tags:
+      - Requisites
+    description: >
+      Direct and transitive requisites of a class, and every class that depends
+      on it, served from the in-memory requisite graph.
+    parameters:
+      - name: classid
+        in: path
+        type: integer
+        required: true
+        description: Class ID
+    responses:
+      200:
+        description: Requisite closure
+        schema:
+          type: object
+          properties:
+            classid:
+              type: integer
+            requisites:
+              type: array
+              items:
+                type: object
+                properties:
+                  reqid:
+                    type: integer
+                  prereq:
+                    type: boolean
+            all_requisites:
+              type: array
+              items:
+                type: integer
+            required_by:
+              type: array
+              items:
+                type: integer
+      404:
+        description: Class not found
+    """
+    return requisitehandler.getClosure(classid)
+
+
 @api.get("/requisite/<int:classid>/<int:reqid>")
 def handle_get_requisite(classid, reqid):
     """
@@ -1120,6 +1513,22 @@ def get_all_users():
     ---
     tags:
       - Users
+    parameters:
+      - name: after
+        in: query
+        type: string
+        required: false
+        description: 'Keyset cursor: uid of the last row of the previous page (next_after)'
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Page size (1-500, default 100). Any paging parameter switches the response to a page object
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Comma-separated columns to return (uid, username); the key is always included
     responses:
       200:
         description: List of all users
@@ -1351,6 +1760,120 @@ def handle_login():
     return uhandler.login(user_data)
 
 
+# ======= Planner Routes =======
+planhandler = PlannerHandler()
+timetablehandler = TimetableHandler()
+
+
+@api.post("/planner/plan")
+def handle_planner_plan():
+    """
+    Plan the Semesters to Reach a Class
+    ---
+    tags:
+      - Planner
+    description: >
+      Builds a semester-by-semester plan that reaches the target classes,
+      taking prerequisites in earlier semesters and co-requisites in the same
+      or an earlier one, honoring the credit cap and each class's term/years
+      availability. Requisites of completed classes count as completed.
+      lower_bound is the number of semesters needed if credit caps did not
+      apply. Classes that are not offered in any semester within
+      max_semesters (or that need one that is not) are listed in infeasible
+      and lower_bound is null; every class that could not be placed, for
+      that or credit-cap reasons, is listed in unscheduled.
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - targets
+          properties:
+            targets:
+              type: array
+              description: Class IDs or codes such as "CIIC 4151"
+              items: {}
+              example: ["CIIC 4151"]
+            completed:
+              type: array
+              description: Class IDs or codes already passed
+              items: {}
+              example: ["CIIC 3015", "MATE 3031"]
+            max_credits:
+              type: integer
+              example: 18
+            start_semester:
+              type: string
+              example: "Fall"
+            start_year:
+              type: integer
+              example: 2025
+            max_semesters:
+              type: integer
+              example: 12
+    responses:
+      200:
+        description: Ordered plan, its length and lower bound
+      400:
+        description: Missing or invalid fields
+      404:
+        description: A target or completed class does not exist
+    """
+    return planhandler.getPlan(request.get_json(silent=True))
+
+
+@api.post("/planner/timetables")
+def handle_planner_timetables():
+    """
+    Generate Conflict-Free Timetables
+    ---
+    tags:
+      - Planner
+    description: >
+      Every combination of one section per requested class whose meetings do
+      not overlap, ranked by fewest idle minutes between classes and then by
+      earliest start. Sections of a class that meet at the same time are
+      returned together in sids. Enumeration stops after 100000 timetables
+      (truncated is then true).
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - classes
+            - semester
+            - years
+          properties:
+            classes:
+              type: array
+              description: Class IDs or codes such as "CIIC 4020"
+              items: {}
+              example: ["CIIC 4020", "CIIC 4050", "MATE 3031"]
+            semester:
+              type: string
+              example: "Fall"
+            years:
+              type: string
+              example: "2025"
+            limit:
+              type: integer
+              description: Number of ranked timetables to return (max 100)
+              example: 20
+    responses:
+      200:
+        description: Number of valid timetables and the best ranked ones
+      400:
+        description: Missing or invalid fields
+      404:
+        description: A class does not exist
+    """
+    return timetablehandler.generateTimetables(request.get_json(silent=True))
+
+
 # ======= Stats Routes =======
 standler = StatsHandler()
 
@@ -1439,6 +1962,87 @@ def handle_classes_without_prerequisites():
     return standler.getClassesWithoutPrerequisites()
 
 
+@api.post("/stats/batch")
+def handle_stats_batch():
+    """
+    Get Several Statistics in One Request
+    ---
+    tags:
+      - Statistics
+    parameters:
+      - in: body
+        name: body
+        required: true
+        description: List of stat specs, evaluated against the same data snapshot
+        schema:
+          type: object
+          required:
+            - stats
+          properties:
+            stats:
+              type: array
+              items:
+                type: object
+                required:
+                  - stat
+                properties:
+                  stat:
+                    type: string
+                    description: 'One of "sections-by-day", "top-departments-by-sections", "top-rooms-by-utilization", "multi-room-classes", "top-classes-by-avg-duration", "classes-without-prereqs"'
+                    example: "top-rooms-by-utilization"
+                  year:
+                    type: integer
+                    example: 2025
+                  semester:
+                    type: string
+                    example: "Fall"
+                  limit:
+                    type: integer
+                    example: 5
+                  orderby:
+                    type: string
+                    example: "desc"
+    responses:
+      200:
+        description: One result per spec, in request order, each with its own status
+      400:
+        description: Missing or too many stat specs
+    """
+    data = request.get_json()
+    return standler.getBatch(data)
+
+
+@api.get("/stats/cache")
+def handle_stats_cache():
+    """
+    Get Statistics Cache Counters
+    ---
+    tags:
+      - Statistics
+    responses:
+      200:
+        description: Hit/miss counters and size of the /stats result cache
+        schema:
+          type: object
+          properties:
+            hits:
+              type: integer
+            misses:
+              type: integer
+            hit_rate:
+              type: number
+            invalidations:
+              type: integer
+            entries:
+              type: integer
+            max_entries:
+              type: integer
+            ttl:
+              type: number
+    """
+    return standler.getCacheStats()
+
+
 # ======= Syllabus Routes =======
 syllabushandler = SyllabusHandler()
 
@@ -1456,6 +2060,11 @@ def handle_syllabus_by_course(cid):
         type: integer
         required: true
         description: Course ID
+      - name: include_embedding
+        in: query
+        type: string
+        required: false
+        description: Set to 1 to include each chunk's embedding (base64 little-endian float32)
     responses:
       200:
         description: List of syllabus chunks for the course
@@ -1473,9 +2082,9 @@ def handle_syllabus_by_course(cid):
               chunk:
                 type: string
                 description: Text chunk from syllabus
-              embedding_text:
+              embedding:
                 type: string
-                description: Vector embedding as string
+                description: Base64 little-endian float32 embedding (only with include_embedding=1)
       404:
         description: No chunks found for this course
     """
@@ -1490,6 +2099,11 @@ def handle_insert_syllabus():
     tags:
       - Syllabus
     parameters:
+      - name: include_embedding
+        in: query
+        type: string
+        required: false
+        description: Set to 1 to include each chunk's embedding (base64 little-endian float32)
       - in: body
         name: body
         required: true
@@ -1525,8 +2139,9 @@ def handle_insert_syllabus():
               type: integer
             chunk:
               type: string
-            embedding_text:
+            embedding:
               type: string
+              description: Only with include_embedding=1
       400:
         description: Missing fields or validation error
     """
@@ -1542,6 +2157,11 @@ def handle_search_similar():
     tags:
       - Syllabus
     parameters:
+      - name: include_embedding
+        in: query
+        type: string
+        required: false
+        description: Set to 1 to include each chunk's embedding (base64 little-endian float32)
       - in: body
         name: body
         required: true
@@ -1561,6 +2181,22 @@ def handle_search_similar():
               type: integer
               description: Maximum number of results to return (default 5)
               example: 5
+            metric:
+              type: string
+              description: Distance metric ("l2", "cosine" or "ip"; default VECTOR_METRIC)
+              example: "l2"
+            ef_search:
+              type: integer
+              description: HNSW candidate list size (higher = better recall, slower)
+              example: 40
+            probes:
+              type: integer
+              description: IVFFlat lists scanned (higher = better recall, slower)
+              example: 10
+            exact:
+              type: boolean
+              description: Skip the ANN index and run the exact scan
+              example: false
     responses:
       200:
         description: Similar syllabus chunks
@@ -1581,8 +2217,9 @@ def handle_search_similar():
                     type: integer
                   chunk:
                     type: string
-                  embedding_text:
+                  embedding:
                     type: string
+                    description: Only with include_embedding=1
       400:
         description: Missing or invalid embedding_text
     """
@@ -1603,6 +2240,11 @@ def handle_search_similar_by_course(cid):
         type: integer
         required: true
         description: Course ID
+      - name: include_embedding
+        in: query
+        type: string
+        required: false
+        description: Set to 1 to include each chunk's embedding (base64 little-endian float32)
       - in: body
         name: body
         required: true
@@ -1622,6 +2264,22 @@ def handle_search_similar_by_course(cid):
               type: integer
               description: Maximum number of results (default 5)
               example: 5
+            metric:
+              type: string
+              description: Distance metric ("l2", "cosine" or "ip"; default VECTOR_METRIC)
+              example: "l2"
+            ef_search:
+              type: integer
+              description: HNSW candidate list size (higher = better recall, slower)
+              example: 40
+            probes:
+              type: integer
+              description: IVFFlat lists scanned (higher = better recall, slower)
+              example: 10
+            exact:
+              type: boolean
+              description: Skip the ANN index and run the exact scan
+              example: false
     responses:
       200:
         description: Similar syllabus chunks for the course
@@ -1641,6 +2299,87 @@ def handle_search_similar_by_course(cid):
     return syllabushandler.searchSimilarByCourse(cid, data)
 
 
+@api.get("/syllabus/index")
+def handle_get_vector_indexes():
+    """
+    List Syllabus Vector Indexes
+    ---
+    tags:
+      - Syllabus
+    responses:
+      200:
+        description: HNSW/IVFFlat indexes on syllabus.embedding_text
+    """
+    return syllabushandler.getVectorIndexes()
+
+
+@api.post("/syllabus/index")
+def handle_create_vector_index():
+    """
+    Build a Syllabus Vector Index
+    ---
+    tags:
+      - Syllabus
+    description: >
+      Builds an approximate nearest-neighbour index on syllabus.embedding_text.
+      Searches only use it when they ask for the same metric.
+    parameters:
+      - in: body
+        name: body
+        required: false
+        schema:
+          type: object
+          properties:
+            method:
+              type: string
+              description: '"hnsw" (default) or "ivfflat"'
+              example: "hnsw"
+            metric:
+              type: string
+              description: '"l2" (default), "cosine" or "ip"'
+              example: "l2"
+            m:
+              type: integer
+              description: HNSW links per node
+              example: 16
+            ef_construction:
+              type: integer
+              description: HNSW candidate list size while building
+              example: 64
+            lists:
+              type: integer
+              description: IVFFlat number of lists (build after loading data)
+              example: 100
+    responses:
+      201:
+        description: Index created (or already present)
+      400:
+        description: Invalid method, metric or parameters
+    """
+    return syllabushandler.createVectorIndex(request.get_json(silent=True))
+
+
+@api.delete("/syllabus/index/<string:name>")
+def handle_drop_vector_index(name):
+    """
+    Drop a Syllabus Vector Index
+    ---
+    tags:
+      - Syllabus
+    parameters:
+      - name: name
+        in: path
+        type: string
+        required: true
+    responses:
+      204:
+        description: Index dropped
+      404:
+        description: No such vector index on syllabus
+    """
+    return syllabushandler.dropVectorIndex(name)
+
+
 @api.delete("/syllabus/course/<int:cid>")
 def handle_delete_syllabus_by_course(cid):
     """
@@ -1663,6 +2402,86 @@ def handle_delete_syllabus_by_course(cid):
     return syllabushandler.deleteChunksByCourseID(cid)
 
 
+# ======= Export Routes =======
+exporthandler = ExportHandler()
+
+
+@api.get("/export/sections")
+def handle_export_sections():
+    """
+    Export All Sections
+    ---
+    tags:
+      - Export
+    parameters:
+      - name: format
+        in: query
+        type: string
+        required: false
+        description: '"ndjson" (default) or "csv"'
+    responses:
+      200:
+        description: Streamed sections, one JSON object per line (or CSV rows)
+      400:
+        description: Invalid format
+    """
+    return exporthandler.exportSections()
+
+
+@api.get("/export/classes")
+def handle_export_classes():
+    """
+    Export All Classes
+    ---
+    tags:
+      - Export
+    parameters:
+      - name: format
+        in: query
+        type: string
+        required: false
+        description: '"ndjson" (default) or "csv"'
+    responses:
+      200:
+        description: Streamed classes, one JSON object per line (or CSV rows)
+      400:
+        description: Invalid format
+    """
+    return exporthandler.exportClasses()
+
+
+@api.get("/export/syllabus")
+def handle_export_syllabus():
+    """
+    Export Syllabus Chunks
+    ---
+    tags:
+      - Export
+    parameters:
+      - name: format
+        in: query
+        type: string
+        required: false
+        description: '"ndjson" (default) or "csv"'
+      - name: courseid
+        in: query
+        type: integer
+        required: false
+        description: Only export chunks of this course
+      - name: include_embedding
+        in: query
+        type: string
+        required: false
+        description: Set to 1 to include each chunk's embedding (base64 little-endian float32)
+    responses:
+      200:
+        description: Streamed syllabus chunks, one JSON object per line (or CSV rows)
+      400:
+        description: Invalid format
+    """
+    return exporthandler.exportSyllabus()
+
+
 # ======= Chatbot Routes =======
 
 chatbothandler = ChatbotHandler()
@@ -1686,14 +2505,72 @@ def handle_chatbot():
             message:
               type: string
               example: "What classes are available in ICOM?"
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: >
+          Stream the reply as Server-Sent Events (also selected by
+          Accept: text/event-stream). Emits "token" events with {"token"},
+          then a "done" event with {"question", "reply"}.
+    produces:
+      - application/json
+      - text/event-stream
     responses:
       200:
         description: Chatbot response
+      429:
+        description: Chatbot queue is full (see Retry-After)
+      503:
+        description: Request timed out waiting for or running the model
     """
     data = request.get_json()
     return chatbothandler.getChatbotReply(data)
 
 
+@api.get("/chatbot/cache")
+def handle_chatbot_cache():
+    """
+    Chatbot Cache Statistics
+    ---
+    tags:
+      - Chatbot
+    responses:
+      200:
+        description: Hit/miss counters of the query-embedding and answer caches
+    """
+    return chatbothandler.getCacheStats()
+
+
+@api.get("/chatbot/scheduler")
+def handle_chatbot_scheduler():
+    """
+    Chatbot Scheduler Statistics
+    ---
+    tags:
+      - Chatbot
+    responses:
+      200:
+        description: >
+          Admitted/rejected/timed-out request counters, queue depth,
+          running requests and wait times of the llm stage, and batch
+          sizes of the query encoder
+    """
+    return chatbothandler.getSchedulerStats()
+
+
+@app.errorhandler(ChatbotBusy)
+def handle_chatbot_busy(e):
+    response = jsonify({"error": "TOO MANY REQUESTS: chatbot queue is full, try again"})
+    response.headers["Retry-After"] = "5"
+    return response, 429
+
+
+@app.errorhandler(ChatbotTimeout)
+def handle_chatbot_timeout(e):
+    return jsonify({"error": "SERVICE UNAVAILABLE: chatbot timed out, try again"}), 503
+
+
 # --end--------------------------------------------
 app.register_blueprint(api)
 
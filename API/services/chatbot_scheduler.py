@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ChatbotBusy(Exception):
+    """Raised when the chatbot queue is full; the request should be retried later."""
+
+
+class ChatbotTimeout(Exception):
+    """Raised when a chatbot request runs past its deadline."""
+
+
+class Stage:
+    """A named concurrency limit (e.g. llm) with wait/run counters."""
+
+    def __init__(self, concurrency):
+        self.concurrency = concurrency
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+
+class Ticket:
+    """An admitted request: its deadline and the scheduler slot it holds."""
+
+    def __init__(self, scheduler, deadline):
+        self.scheduler = scheduler
+        self.deadline = deadline
+        self._released = False
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+    def check(self):
+        if self.remaining() <= 0:
+            raise ChatbotTimeout("Chatbot request exceeded %.0f seconds" % self.scheduler.timeout)
+
+    def stage(self, name):
+        return self.scheduler.stage(name, self)
+
+    def release(self):
+        # Safe to call more than once (e.g. generator cleanup and response close)
+        self.scheduler._release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class ChatbotScheduler:
+    """
+    Admission control for chatbot requests.
+
+    At most `llm_concurrency + max_queue` requests are admitted at once; the
+    next one gets ChatbotBusy (429) right away instead of waiting without
+    bound. Admitted requests then wait for an llm stage slot and fail with
+    ChatbotTimeout (503) once they have spent `timeout` seconds in total.
+    Query encoding is bounded separately by Chatbot.llm.encode_batcher.
+    """
+
+    def __init__(self, llm_concurrency=2, max_queue=8, timeout=120.0):
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.capacity = llm_concurrency + max_queue
+        self._stages = {"llm": Stage(llm_concurrency)}
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._stats = {"accepted": 0, "rejected": 0, "timeouts": 0, "completed": 0}
+
+    def admit(self):
+        with self._lock:
+            if self._admitted >= self.capacity:
+                self._stats["rejected"] += 1
+                raise ChatbotBusy("Chatbot queue is full (%d requests)" % self.capacity)
+            self._admitted += 1
+            self._stats["accepted"] += 1
+        return Ticket(self, time.monotonic() + self.timeout)
+
+    def _release(self, ticket):
+        with self._lock:
+            if ticket._released:
+                return
+            ticket._released = True
+            self._admitted -= 1
+            self._stats["completed"] += 1
+
+    @contextmanager
+    def stage(self, name, ticket):
+        stage = self._stages[name]
+        start = time.monotonic()
+        with self._lock:
+            stage.waiting += 1
+        acquired = stage._slots.acquire(timeout=max(ticket.remaining(), 0))
+        waited = time.monotonic() - start
+        with self._lock:
+            stage.waiting -= 1
+            stage.wait_seconds += waited
+            stage.max_wait_seconds = max(stage.max_wait_seconds, waited)
+            if not acquired:
+                stage.timeouts += 1
+                self._stats["timeouts"] += 1
+            else:
+                stage.running += 1
+        if not acquired:
+            raise ChatbotTimeout("Timed out waiting for the chatbot %s stage" % name)
+        try:
+            yield
+        finally:
+            with self._lock:
+                stage.running -= 1
+                stage.completed += 1
+            stage._slots.release()
+
+    def stats(self):
+        with self._lock:
+            stages = {
+                name: {
+                    "concurrency": stage.concurrency,
+                    "queue_depth": stage.waiting,
+                    "running": stage.running,
+                    "completed": stage.completed,
+                    "timeouts": stage.timeouts,
+                    "avg_wait_seconds": round(stage.wait_seconds / (stage.completed + stage.running + stage.timeouts), 4)
+                    if stage.completed + stage.running + stage.timeouts else 0.0,
+                    "max_wait_seconds": round(stage.max_wait_seconds, 4),
+                }
+                for name, stage in self._stages.items()
+            }
+            return dict(
+                self._stats,
+                admitted=self._admitted,
+                capacity=self.capacity,
+                max_queue=self.max_queue,
+                timeout=self.timeout,
+                stages=stages,
+            )
+
+
+chatbot_scheduler = ChatbotScheduler(
+    llm_concurrency=int(os.environ.get("CHATBOT_LLM_CONCURRENCY", 2)),
+    max_queue=int(os.environ.get("CHATBOT_QUEUE_SIZE", 8)),
+    timeout=float(os.environ.get("CHATBOT_TIMEOUT", 120)),
+)
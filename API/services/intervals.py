@@ -0,0 +1,49 @@
+from bisect import bisect_left, insort
+
+
+def to_seconds(t):
+    """Seconds since midnight of a meeting start/end time (datetime or time)."""
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+class IntervalList:
+    """
+    Half-open [start, end) intervals kept sorted by start.
+
+    Overlap queries bisect to the last interval starting before `end` and
+    walk back only as far as the longest stored interval could reach, so a
+    lookup is O(log n + k) even if stored intervals overlap each other.
+    """
+
+    def __init__(self):
+        self._items = []
+        self._maxLength = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def add(self, start, end, owner):
+        insort(self._items, (start, end, owner))
+        self._maxLength = max(self._maxLength, end - start)
+
+    def remove(self, start, end, owner):
+        i = bisect_left(self._items, (start, end, owner))
+        if i < len(self._items) and self._items[i] == (start, end, owner):
+            del self._items[i]
+
+    def overlapping(self, start, end, exclude=None):
+        """Yields owners of stored intervals that overlap [start, end)."""
+        i = bisect_left(self._items, (end,))
+        lowest = start - self._maxLength
+        for j in range(i - 1, -1, -1):
+            s, e, owner = self._items[j]
+            if s < lowest:
+                break
+            if e > start and owner != exclude:
+                yield owner
+
+    def firstOverlap(self, start, end, exclude=None):
+        return next(self.overlapping(start, end, exclude), None)
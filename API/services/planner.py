@@ -0,0 +1,220 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from API.dao.classes import ClassDAO
+from API.services.requisite_graph import requisite_graph
+
+SEMESTERS = ["Fall", "Spring"]
+# class.term values name the semester of the academic year a class is offered in
+TERM_NAMES = {"Fall": "First Semester", "Spring": "Second Semester"}
+
+
+class CurriculumPlanner:
+    """
+    Plans the semesters needed to reach one or more target classes.
+
+    The class catalog is loaded once per process (refreshed after `ttl`
+    seconds or on class writes); requisites come from the shared requisite
+    graph. Each plan memoizes its subproblems (earliest feasible semester and
+    dependency height of every class) and whole plans are kept in a small LRU
+    keyed by the inputs and the graph version.
+    """
+
+    def __init__(self, ttl=300.0, maxsize=256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._loadedAt = None
+        self._catalogVersion = 0
+        self._classes = {}
+        self._codes = {}
+        self._plans = OrderedDict()
+
+    def _ensureLoaded(self):
+        if self._loadedAt is not None and time.monotonic() - self._loadedAt <= self.ttl:
+            return
+        with ClassDAO() as dao:
+            rows = dao.getAllClasses()
+        self._classes = {}
+        self._codes = {}
+        for cid, cname, ccode, _, term, years, cred, _ in rows:
+            self._classes[cid] = {"code": f"{cname} {ccode}", "term": term, "years": years, "cred": cred or 0}
+            self._codes[f"{cname}{ccode}".upper()] = cid
+        self._plans.clear()
+        self._catalogVersion += 1
+        self._loadedAt = time.monotonic()
+
+    def invalidate(self):
+        with self._lock:
+            self._loadedAt = None
+
+    def resolve(self, value):
+        """cid of a class given its cid or a code such as "CIIC 4151"; None if unknown."""
+        with self._lock:
+            self._ensureLoaded()
+            if isinstance(value, int):
+                return value if value in self._classes else None
+            if isinstance(value, str):
+                return self._codes.get(value.replace(" ", "").replace("-", "").upper())
+            return None
+
+    def isOffered(self, cid, semester, year):
+        info = self._classes[cid]
+        term, years = info["term"], info["years"]
+        # "None" marks catalog entries that are never scheduled (e.g. director authorization)
+        if term == "None":
+            return False
+        # Classes without a fixed term ("According to Demand") are assumed to be available
+        if term and term != "According to Demand":
+            if TERM_NAMES[semester] not in {p.strip() for p in term.split(",")}:
+                return False
+        if years == "Odd Years" and year % 2 == 0:
+            return False
+        if years == "Even Years" and year % 2 == 1:
+            return False
+        return True
+
+    def plan(self, targets, completed=(), max_credits=18, start_semester="Fall", start_year=2025, max_semesters=12):
+        """
+        Returns a dict with the semester-by-semester plan, the number of
+        semesters it takes, a lower bound on that number, the classes that
+        are not offered in any reachable semester (infeasible) and any
+        classes that could not be placed within `max_semesters`.
+        """
+        with self._lock:
+            self._ensureLoaded()
+            # Touching the graph loads it before its version is read
+            requisite_graph.ancestors(targets[0])
+            key = (
+                requisite_graph.version, self._catalogVersion, tuple(sorted(set(targets))),
+                frozenset(completed), max_credits, start_semester, start_year, max_semesters,
+            )
+            if key in self._plans:
+                self._plans.move_to_end(key)
+                return self._plans[key]
+            result = self._plan(targets, completed, max_credits, start_semester, start_year, max_semesters)
+            self._plans[key] = result
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+            return result
+
+    def _plan(self, targets, completed, max_credits, start_semester, start_year, max_semesters):
+        # Requisites of completed classes count as completed too
+        done = set(completed)
+        for cid in completed:
+            done.update(requisite_graph.ancestors(cid))
+        needed = set()
+        for cid in targets:
+            needed.add(cid)
+            needed.update(requisite_graph.ancestors(cid))
+        needed -= done
+
+        prereqs, coreqs, dependents = {}, {}, {}
+        for cid in needed:
+            prereqs[cid], coreqs[cid] = [], []
+            for reqid, prereq in requisite_graph.requisites(cid):
+                if reqid in needed:
+                    (prereqs if prereq else coreqs)[cid].append(reqid)
+                    dependents.setdefault(reqid, []).append(cid)
+
+        terms = []
+        index = SEMESTERS.index(start_semester)
+        year = start_year
+        for _ in range(max_semesters):
+            terms.append((SEMESTERS[index], year))
+            index = (index + 1) % len(SEMESTERS)
+            # Spring falls in the calendar year after its Fall
+            if SEMESTERS[index] == "Spring":
+                year += 1
+
+        height = {}
+
+        def getHeight(cid):
+            # Length of the longest chain of needed classes that depends on cid
+            if cid not in height:
+                height[cid] = 1 + max((getHeight(d) for d in dependents.get(cid, ())), default=0)
+            return height[cid]
+
+        earliest = {}
+
+        def getEarliest(cid):
+            # First semester cid could be taken if credit caps did not apply
+            if cid not in earliest:
+                earliest[cid] = len(terms)
+                first = max(
+                    [getEarliest(p) + 1 for p in prereqs[cid]] + [getEarliest(q) for q in coreqs[cid]],
+                    default=0,
+                )
+                for i in range(first, len(terms)):
+                    if self.isOffered(cid, *terms[i]):
+                        earliest[cid] = i
+                        break
+            return earliest[cid]
+
+        # Classes never offered in the horizon (or needing one that is not) cannot be placed at all
+        infeasible = {cid for cid in needed if getEarliest(cid) >= len(terms)}
+        # No bound exists when some needed class can never be taken
+        lower_bound = None if infeasible else 1 + max((getEarliest(cid) for cid in needed), default=-1)
+
+        scheduled = {}
+        plan = []
+        for i, (semester, year) in enumerate(terms):
+            if len(scheduled) == len(needed) - len(infeasible):
+                break
+            current, credits = [], 0
+            candidates = sorted(
+                (cid for cid in needed if cid not in scheduled and cid not in infeasible),
+                key=lambda cid: (-getHeight(cid), getEarliest(cid), cid),
+            )
+            for cid in candidates:
+                if cid in scheduled:
+                    continue
+                group = self._coreqGroup(cid, coreqs, scheduled)
+                group_credits = sum(self._classes[g]["cred"] for g in group)
+                if current and credits + group_credits > max_credits:
+                    continue
+                if not all(
+                    self.isOffered(g, semester, year)
+                    and all(scheduled.get(p, i) < i for p in prereqs[g])
+                    for g in group
+                ):
+                    continue
+                for g in group:
+                    scheduled[g] = i
+                    current.append(g)
+                credits += group_credits
+            plan.append({
+                "semester": semester,
+                "year": year,
+                "credits": credits,
+                "classes": [
+                    {"cid": cid, "code": self._classes[cid]["code"], "cred": self._classes[cid]["cred"]}
+                    for cid in current
+                ],
+            })
+        while plan and not plan[-1]["classes"]:
+            plan.pop()
+
+        return {
+            "semesters": len(plan),
+            "lower_bound": lower_bound,
+            "plan": plan,
+            "infeasible": sorted(infeasible),
+            "unscheduled": sorted(cid for cid in needed if cid not in scheduled),
+        }
+
+    def _coreqGroup(self, cid, coreqs, scheduled):
+        """cid plus the unscheduled co-requisites that must be taken with it."""
+        group, stack = [], [cid]
+        while stack:
+            g = stack.pop()
+            if g in group:
+                continue
+            group.append(g)
+            stack.extend(q for q in coreqs[g] if q not in scheduled)
+        return group
+
+
+curriculum_planner = CurriculumPlanner(ttl=float(os.environ.get("PLANNER_CATALOG_TTL", 300)))
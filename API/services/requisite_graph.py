@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+from collections import deque
+
+from API.dao.requisite import RequisiteDAO
+
+
+class RequisiteGraph:
+    """
+    In-memory requisite graph with its transitive closure.
+
+    An edge classid -> reqid means reqid is a requisite of classid. For every
+    class the closure keeps two bitsets (Python ints, one bit per cid):
+    `_requires` (every class reachable through requisites) and `_requiredBy`
+    (every class that transitively depends on it). Cycle checks are then a
+    single bit test, inserts update O(V) bitsets and deletes recompute only the
+    classes whose closure can change.
+    """
+
+    def __init__(self, ttl=300.0):
+        self.ttl = ttl
+        # Held by callers across check-then-write so two inserts cannot form a cycle together
+        self.lock = threading.RLock()
+        self._loadedAt = None
+        # Bumped on every change so callers can key memoized results on it
+        self.version = 0
+        self._bits = {}
+        self._cids = []
+        self._edges = {}
+        self._children = {}
+        self._parents = {}
+        self._requires = {}
+        self._requiredBy = {}
+
+    # --- Loading & maintenance ---
+
+    def _ensureLoaded(self):
+        if self._loadedAt is not None and time.monotonic() - self._loadedAt <= self.ttl:
+            return
+        with RequisiteDAO() as dao:
+            rows = dao.getAllRequisites()
+        self._bits = {}
+        self._cids = []
+        self._edges = {}
+        self._children = {}
+        self._parents = {}
+        for classid, reqid, prereq in rows:
+            self._link(classid, reqid, prereq)
+        self._requires = {}
+        self._requiredBy = {}
+        self._recompute(self._children.keys(), self._children, self._requires)
+        self._recompute(self._parents.keys(), self._parents, self._requiredBy)
+        self._loadedAt = time.monotonic()
+        self.version += 1
+
+    def _bit(self, cid):
+        if cid not in self._bits:
+            self._bits[cid] = 1 << len(self._cids)
+            self._cids.append(cid)
+        return self._bits[cid]
+
+    def _link(self, classid, reqid, prereq):
+        self._bit(classid)
+        self._bit(reqid)
+        self._edges[(classid, reqid)] = prereq
+        self._children.setdefault(classid, set()).add(reqid)
+        self._parents.setdefault(reqid, set()).add(classid)
+
+    def _recompute(self, nodes, adjacency, closure):
+        """Rebuilds `closure` for `nodes` from their neighbours, neighbours first."""
+        pending = set(nodes)
+        for cid in pending:
+            closure.pop(cid, None)
+
+        def visit(cid):
+            if cid in closure or cid not in pending:
+                return closure.get(cid, 0)
+            # Placeholder while visiting, so rows that already form a cycle cannot recurse forever
+            closure[cid] = 0
+            acc = 0
+            for other in adjacency.get(cid, ()):
+                acc |= self._bits[other] | visit(other)
+            closure[cid] = acc
+            return acc
+
+        for cid in pending:
+            visit(cid)
+
+    def _members(self, bits):
+        result = []
+        while bits:
+            low = bits & -bits
+            result.append(self._cids[low.bit_length() - 1])
+            bits ^= low
+        return sorted(result)
+
+    def addEdge(self, classid, reqid, prereq=True):
+        """Records a requisite already written to the database."""
+        with self.lock:
+            if self._loadedAt is None or (classid, reqid) in self._edges:
+                return
+            self._link(classid, reqid, prereq)
+            gained = self._bits[reqid] | self._requires.get(reqid, 0)
+            for cid in [classid] + self._members(self._requiredBy.get(classid, 0)):
+                self._requires[cid] = self._requires.get(cid, 0) | gained
+            gained = self._bits[classid] | self._requiredBy.get(classid, 0)
+            for cid in [reqid] + self._members(self._requires.get(reqid, 0)):
+                self._requiredBy[cid] = self._requiredBy.get(cid, 0) | gained
+            self.version += 1
+
+    def removeEdge(self, classid, reqid):
+        with self.lock:
+            if self._loadedAt is None or self._edges.pop((classid, reqid), None) is None:
+                return
+            upstream = [classid] + self._members(self._requiredBy.get(classid, 0))
+            downstream = [reqid] + self._members(self._requires.get(reqid, 0))
+            self._children[classid].discard(reqid)
+            self._parents[reqid].discard(classid)
+            self._recompute(upstream, self._children, self._requires)
+            self._recompute(downstream, self._parents, self._requiredBy)
+            self.version += 1
+
+    def invalidate(self):
+        with self.lock:
+            self._loadedAt = None
+
+    # --- Queries ---
+
+    def wouldCycle(self, classid, reqid):
+        """True if adding classid -> reqid would close a cycle (including self-loops)."""
+        with self.lock:
+            self._ensureLoaded()
+            if classid == reqid:
+                return True
+            return bool(self._requires.get(reqid, 0) & self._bits.get(classid, 0))
+
+    def cyclePath(self, classid, reqid):
+        """The existing path reqid -> ... -> classid that classid -> reqid would close, or None."""
+        with self.lock:
+            if not self.wouldCycle(classid, reqid):
+                return None
+            if classid == reqid:
+                return [classid]
+            previous = {reqid: None}
+            queue = deque([reqid])
+            while queue:
+                cid = queue.popleft()
+                if cid == classid:
+                    break
+                for child in self._children.get(cid, ()):
+                    if child not in previous:
+                        previous[child] = cid
+                        queue.append(child)
+            path = [classid]
+            while previous[path[-1]] is not None:
+                path.append(previous[path[-1]])
+            return path[::-1]
+
+    def requisites(self, cid):
+        """(reqid, prereq) of the direct requisites of a class."""
+        with self.lock:
+            self._ensureLoaded()
+            return sorted((reqid, self._edges[(cid, reqid)]) for reqid in self._children.get(cid, ()))
+
+    def ancestors(self, cid):
+        """Every class that must be taken (transitively) before or with `cid`."""
+        with self.lock:
+            self._ensureLoaded()
+            return self._members(self._requires.get(cid, 0))
+
+    def descendants(self, cid):
+        """Every class that (transitively) lists `cid` as a requisite."""
+        with self.lock:
+            self._ensureLoaded()
+            return self._members(self._requiredBy.get(cid, 0))
+
+
+requisite_graph = RequisiteGraph(ttl=float(os.environ.get("REQUISITE_GRAPH_TTL", 300)))
@@ -0,0 +1,215 @@
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+
+from API.dao.meeting import MeetingDAO
+from API.dao.room import RoomDAO
+from API.dao.section import SectionDAO
+from API.services.intervals import IntervalList, to_seconds
+
+
+class RoomScheduleIndex:
+    """
+    In-memory index of room occupancy.
+
+    Keeps one sorted IntervalList of meeting times per (roomid, semester,
+    years, cdays), plus the meeting times themselves and the rooms sorted by
+    capacity, so conflict checks, free-slot queries and availability searches
+    are answered in O(log n) per room without touching the database.
+    Section and meeting handlers keep it in sync on writes; the TTL bounds
+    staleness from writes made by other processes.
+    """
+
+    def __init__(self, ttl=300.0):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._loadedAt = None
+        self._meetings = {}
+        self._sections = {}
+        self._lists = {}
+        self._terms = {}
+        self._rooms = {}
+        self._byCapacity = []
+
+    # --- Loading & maintenance ---
+
+    def _ensureLoaded(self):
+        if self._loadedAt is not None and time.monotonic() - self._loadedAt <= self.ttl:
+            return
+        with MeetingDAO() as dao:
+            meetings = dao.getAllMeetings()
+        with SectionDAO() as dao:
+            sections = dao.getAllSections()
+        with RoomDAO() as dao:
+            rooms = dao.getAllRooms()
+        self._meetings = {}
+        self._sections = {}
+        self._lists = {}
+        self._terms = {}
+        self._rooms = {}
+        self._byCapacity = []
+        for rid, building, room_number, capacity in rooms:
+            self._addRoom(rid, building, room_number, capacity)
+        for mid, _, starttime, endtime, cdays in meetings:
+            self._meetings[mid] = (cdays, to_seconds(starttime), to_seconds(endtime))
+        for sid, roomid, _, mid, semester, years, _ in sections:
+            self._add(sid, roomid, mid, semester, years)
+        self._loadedAt = time.monotonic()
+
+    def _add(self, sid, roomid, mid, semester, years):
+        meeting = self._meetings.get(mid)
+        if roomid is None or meeting is None:
+            return
+        cdays, start, end = meeting
+        self._sections[sid] = (roomid, mid, semester, years)
+        self._lists.setdefault((roomid, semester, years, cdays), IntervalList()).add(start, end, sid)
+        self._terms.setdefault((roomid, cdays), set()).add((semester, years))
+
+    def _discard(self, sid):
+        entry = self._sections.pop(sid, None)
+        if entry is None:
+            return
+        roomid, mid, semester, years = entry
+        cdays, start, end = self._meetings[mid]
+        self._lists[(roomid, semester, years, cdays)].remove(start, end, sid)
+
+    def _addRoom(self, rid, building, room_number, capacity):
+        self._rooms[rid] = (building, room_number, capacity)
+        # Rooms without a recorded capacity sort (and match) as capacity 0
+        insort(self._byCapacity, (capacity or 0, rid))
+
+    def _discardRoom(self, rid):
+        room = self._rooms.pop(rid, None)
+        if room is None:
+            return
+        i = bisect_left(self._byCapacity, (room[2] or 0, rid))
+        if i < len(self._byCapacity) and self._byCapacity[i] == (room[2] or 0, rid):
+            del self._byCapacity[i]
+
+    def putSection(self, sid, roomid, mid, semester, years):
+        with self._lock:
+            if self._loadedAt is None:
+                return
+            self._discard(sid)
+            if mid not in self._meetings:
+                with MeetingDAO() as dao:
+                    meeting = dao.getMeetingByID(mid)
+                if meeting is None:
+                    return
+                self._meetings[mid] = (meeting[4], to_seconds(meeting[2]), to_seconds(meeting[3]))
+            self._add(sid, roomid, mid, semester, years)
+
+    def removeSection(self, sid):
+        with self._lock:
+            if self._loadedAt is not None:
+                self._discard(sid)
+
+    def putMeeting(self, mid, cdays, starttime, endtime):
+        """Records new meeting times and re-files every section that uses the meeting."""
+        with self._lock:
+            if self._loadedAt is None:
+                return
+            affected = [(sid, e) for sid, e in self._sections.items() if e[1] == mid]
+            for sid, _ in affected:
+                self._discard(sid)
+            self._meetings[mid] = (cdays, to_seconds(starttime), to_seconds(endtime))
+            for sid, (roomid, _, semester, years) in affected:
+                self._add(sid, roomid, mid, semester, years)
+
+    def removeMeeting(self, mid):
+        with self._lock:
+            if self._loadedAt is not None:
+                self._meetings.pop(mid, None)
+
+    def putRoom(self, rid, building, room_number, capacity):
+        with self._lock:
+            if self._loadedAt is not None:
+                self._discardRoom(rid)
+                self._addRoom(rid, building, room_number, capacity)
+
+    def removeRoom(self, rid):
+        with self._lock:
+            if self._loadedAt is not None:
+                self._discardRoom(rid)
+
+    def invalidate(self):
+        with self._lock:
+            self._loadedAt = None
+
+    # --- Queries ---
+
+    def meeting(self, mid):
+        """(cdays, start, end) of a meeting, times in seconds since midnight."""
+        with self._lock:
+            self._ensureLoaded()
+            return self._meetings.get(mid)
+
+    def findConflict(self, roomid, cdays, start, end, semester=None, years=None, exclude=None):
+        """
+        Returns the sid of a section in `roomid` overlapping [start, end) on
+        `cdays`, or None. Without semester/years every term is checked, which
+        matches SectionDAO.hasScheduleConflict.
+        """
+        with self._lock:
+            self._ensureLoaded()
+            if semester is not None and years is not None:
+                terms = [(semester, years)]
+            else:
+                terms = [
+                    t for t in self._terms.get((roomid, cdays), ())
+                    if (semester is None or t[0] == semester) and (years is None or t[1] == years)
+                ]
+            for term_semester, term_years in terms:
+                intervals = self._lists.get((roomid, term_semester, term_years, cdays))
+                if intervals is not None:
+                    sid = intervals.firstOverlap(start, end, exclude)
+                    if sid is not None:
+                        return sid
+            return None
+
+    def isFree(self, roomid, cdays, start, end, semester, years):
+        return self.findConflict(roomid, cdays, start, end, semester, years) is None
+
+    def freeSlots(self, roomid, cdays, semester, years, day_start, day_end, min_length=0):
+        """Gaps of at least `min_length` seconds in the room's day between day_start and day_end."""
+        with self._lock:
+            self._ensureLoaded()
+            intervals = self._lists.get((roomid, semester, years, cdays), ())
+            slots = []
+            cursor = day_start
+            for start, end, _ in intervals:
+                if end <= cursor:
+                    continue
+                if start >= day_end:
+                    break
+                if start - cursor >= max(min_length, 1):
+                    slots.append((cursor, start))
+                cursor = max(cursor, end)
+            if day_end - cursor >= max(min_length, 1):
+                slots.append((cursor, day_end))
+            return slots
+
+    def availableRooms(self, cdays, start, end, semester=None, years=None, min_capacity=0, building=None, limit=None):
+        """
+        Rooms with capacity >= `min_capacity` that have no section overlapping
+        [start, end) on `cdays`, ranked by tightest fit (smallest spare
+        capacity first), then building and room number. Returns a list of
+        (rid, building, room_number, capacity).
+        """
+        with self._lock:
+            self._ensureLoaded()
+            i = bisect_left(self._byCapacity, (min_capacity,))
+            result = []
+            for capacity, rid in self._byCapacity[i:]:
+                room_building, room_number, room_capacity = self._rooms[rid]
+                if building is not None and room_building != building:
+                    continue
+                if self.findConflict(rid, cdays, start, end, semester, years) is not None:
+                    continue
+                result.append((rid, room_building, room_number, room_capacity))
+            result.sort(key=lambda r: (r[3] or 0, r[1], r[2]))
+            return result[:limit] if limit is not None else result
+
+
+room_schedule = RoomScheduleIndex(ttl=float(os.environ.get("ROOM_SCHEDULE_TTL", 300)))
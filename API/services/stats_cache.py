@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Tables each /stats endpoint reads; a write to one of them invalidates the endpoint
+ENDPOINT_TABLES = {
+    "sections-by-day": {"section", "meeting"},
+    "top-departments-by-sections": {"section", "class"},
+    "top-rooms-by-utilization": {"section", "room"},
+    "multi-room-classes": {"section", "class"},
+    "top-classes-by-avg-duration": {"section", "class", "meeting"},
+    "classes-without-prereqs": {"class", "requisite"},
+}
+
+
+class StatsCache:
+    """
+    In-process LRU cache for /stats results.
+
+    Entries are keyed by endpoint and (year, semester, limit, orderby). Writes
+    invalidate only the endpoints that read the written table and, for section
+    writes, only the entries whose year/semester filter covers the touched term.
+    A TTL bounds staleness from writes that bypass the API (e.g. reload scripts).
+    """
+
+    def __init__(self, max_entries=512, ttl=300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def makeKey(endpoint, year=None, semester=None, limit=None, orderby=None):
+        year = str(year) if year is not None else None
+        orderby = orderby.lower() if isinstance(orderby, str) else orderby
+        return (endpoint, year, semester or None, limit, orderby)
+
+    def getOrCompute(self, endpoint, compute, year=None, semester=None, limit=None, orderby=None):
+        key = self.makeKey(endpoint, year, semester, limit, orderby)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+            generation = self._generation
+
+        value = compute()
+
+        with self._lock:
+            # Skip storing if a write invalidated the cache while we were computing
+            if generation == self._generation:
+                self._entries[key] = (now + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, table, terms=None):
+        """
+        Drops cached entries that depend on `table`.
+
+        `terms` is an optional list of (year, semester) pairs touched by a
+        section write; entries filtered to other terms are kept. Call it after
+        the data the endpoints compute from (stats_cube) has been updated, so
+        a read racing the write can't cache pre-write results under the new
+        generation.
+        """
+        endpoints = {e for e, tables in ENDPOINT_TABLES.items() if table in tables}
+        if terms is not None:
+            terms = [(str(y) if y is not None else None, s) for y, s in terms]
+        with self._lock:
+            self._generation += 1
+            for key in list(self._entries):
+                endpoint, year, semester = key[0], key[1], key[2]
+                if endpoint not in endpoints:
+                    continue
+                if terms is not None and not any(
+                    (year is None or year == ty) and (semester is None or semester == ts)
+                    for ty, ts in terms
+                ):
+                    continue
+                del self._entries[key]
+                self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self._invalidations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+
+stats_cache = StatsCache(
+    max_entries=int(os.environ.get("STATS_CACHE_SIZE", 512)),
+    ttl=float(os.environ.get("STATS_CACHE_TTL", 300)),
+)
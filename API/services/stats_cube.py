@@ -0,0 +1,242 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from collections import Counter, namedtuple
+from decimal import Decimal, ROUND_HALF_UP
+
+from API.dao.stats import StatsDAO
+
+# One denormalized section x room x class x meeting row (see StatsDAO.getSectionFacts)
+Fact = namedtuple(
+    "Fact",
+    [
+        "sid", "years", "semester", "capacity",
+        "rid", "building", "room_number", "room_capacity",
+        "cid", "cname", "ccode",
+        "mid", "cdays", "minutes",
+    ],
+)
+
+DAYS = ["L", "M", "W", "J", "V", "S", "D"]
+
+
+class Partition:
+    """Sections of a single (years, semester) with lazily built aggregates."""
+
+    def __init__(self):
+        self.facts = {}
+        self._aggregates = None
+
+    def put(self, fact):
+        self.facts[fact.sid] = fact
+        self._aggregates = None
+
+    def remove(self, sid):
+        self.facts.pop(sid, None)
+        self._aggregates = None
+
+    def aggregates(self):
+        if self._aggregates is None:
+            self._aggregates = self._build()
+        return self._aggregates
+
+    def _build(self):
+        days = Counter()
+        depts = Counter()
+        # rid -> [building, room_number, sum(section/room capacity), count of non-null ratios]
+        rooms = {}
+        # cid -> [fullcode, set(roomid)]
+        classRooms = {}
+        # cid -> [fullcode, sum(minutes), count of non-null durations]
+        classMinutes = {}
+
+        for f in self.facts.values():
+            if f.mid is not None and f.cdays:
+                for d in f.cdays:
+                    days[d] += 1
+            if f.cid is not None:
+                depts[f.cname[:4]] += 1
+                fullcode = f.cname + f.ccode
+                entry = classRooms.setdefault(f.cid, [fullcode, set()])
+                if f.rid is not None:
+                    entry[1].add(f.rid)
+                if f.mid is not None:
+                    entry = classMinutes.setdefault(f.cid, [fullcode, Decimal(0), 0])
+                    if f.minutes is not None:
+                        entry[1] += Decimal(f.minutes)
+                        entry[2] += 1
+            if f.rid is not None:
+                entry = rooms.setdefault(f.rid, [f.building, f.room_number, Decimal(0), 0])
+                if f.capacity is not None and f.room_capacity:
+                    entry[2] += Decimal(f.capacity) / Decimal(f.room_capacity)
+                    entry[3] += 1
+
+        return {
+            "days": days,
+            "depts": depts,
+            "rooms": rooms,
+            "classRooms": classRooms,
+            "classMinutes": classMinutes,
+        }
+
+
+class StatsCube:
+    """
+    In-memory stats engine answering the six /stats queries.
+
+    Section facts are loaded once and partitioned by (years, semester); each
+    partition keeps its own aggregates, so a query only merges the partitions
+    matching its filters. Section writes refresh a single fact row, while
+    class/room/meeting writes mark the cube for a full reload on next read.
+    The TTL bounds staleness from writes made by other processes.
+    """
+
+    def __init__(self, ttl=300.0):
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._partitions = {}
+        self._sectionKeys = {}
+        self._classCodes = {}
+        self._prereqClasses = set()
+        self._loadedAt = None
+        self._prereqsDirty = True
+
+    # --- Loading & maintenance ---
+
+    def _ensureLoaded(self):
+        with self._lock:
+            expired = self._loadedAt is None or time.monotonic() - self._loadedAt > self.ttl
+            if not expired and not self._prereqsDirty:
+                return
+            with StatsDAO() as dao:
+                if expired:
+                    self._partitions = {}
+                    self._sectionKeys = {}
+                    for row in dao.getSectionFacts():
+                        self._put(Fact(*row))
+                    self._classCodes = dict(dao.getClassCodes())
+                    self._loadedAt = time.monotonic()
+                    self._prereqsDirty = True
+                if self._prereqsDirty:
+                    self._prereqClasses = set(dao.getClassIDsWithPrereqs())
+                    self._prereqsDirty = False
+
+    def _put(self, fact):
+        key = (fact.years, fact.semester)
+        self._sectionKeys[fact.sid] = key
+        self._partitions.setdefault(key, Partition()).put(fact)
+
+    def _remove(self, sid):
+        key = self._sectionKeys.pop(sid, None)
+        if key is not None:
+            partition = self._partitions[key]
+            partition.remove(sid)
+            if not partition.facts:
+                del self._partitions[key]
+
+    def refreshSection(self, sid):
+        """Re-reads one section's fact row after it was inserted, updated or deleted."""
+        with self._lock:
+            if self._loadedAt is None:
+                return
+            with StatsDAO() as dao:
+                rows = dao.getSectionFacts(sid)
+            self._remove(sid)
+            for row in rows:
+                self._put(Fact(*row))
+
+    @contextmanager
+    def snapshot(self):
+        """Holds the cube steady so several queries see the same data."""
+        with self._lock:
+            self._ensureLoaded()
+            yield self
+
+    def invalidate(self, table):
+        with self._lock:
+            if table == "requisite":
+                self._prereqsDirty = True
+            else:
+                self._loadedAt = None
+
+    def _select(self, years, semester):
+        self._ensureLoaded()
+        years = str(years) if years is not None else None
+        return [
+            p.aggregates()
+            for (y, s), p in self._partitions.items()
+            if (years is None or y == years) and (semester is None or s == semester)
+        ]
+
+    # --- Queries ---
+
+    def getSectionsByDay(self, semester=None, years=None):
+        with self._lock:
+            total = Counter()
+            for agg in self._select(years, semester):
+                total.update(agg["days"])
+        return {d: total[d] for d in DAYS}
+
+    def getTopDepartments(self, semester=None, years=None, limit=1):
+        with self._lock:
+            total = Counter()
+            for agg in self._select(years, semester):
+                total.update(agg["depts"])
+        return sorted(total.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
+
+    def getTopRoomsByUtilization(self, year=None, semester=None, limit=5):
+        with self._lock:
+            rooms = {}
+            for agg in self._select(year, semester):
+                for rid, (building, number, ratio, n) in agg["rooms"].items():
+                    entry = rooms.setdefault(rid, [building, number, Decimal(0), 0])
+                    entry[2] += ratio
+                    entry[3] += n
+        result = []
+        for rid, (building, number, ratio, n) in rooms.items():
+            utilization = (ratio / n).quantize(Decimal("0.01"), ROUND_HALF_UP) if n else None
+            result.append((rid, building, number, utilization))
+        # Postgres sorts NULLs first on DESC
+        result.sort(key=lambda r: (r[3] is not None, -(r[3] or 0), r[0]))
+        return result[:limit]
+
+    def getMultiRoomClasses(self, year=None, semester=None, limit=5, orderby="desc"):
+        with self._lock:
+            classes = {}
+            for agg in self._select(year, semester):
+                for cid, (fullcode, roomids) in agg["classRooms"].items():
+                    classes.setdefault(cid, [fullcode, set()])[1].update(roomids)
+        result = [(cid, fullcode, len(roomids)) for cid, (fullcode, roomids) in classes.items()]
+        sign = 1 if orderby.lower() == "asc" else -1
+        result.sort(key=lambda r: (sign * r[2], r[0]))
+        return result[:limit]
+
+    def getLongestAverageMeetingDuration(self, year=None, semester=None, limit=5):
+        with self._lock:
+            classes = {}
+            for agg in self._select(year, semester):
+                for cid, (fullcode, minutes, n) in agg["classMinutes"].items():
+                    entry = classes.setdefault(cid, [fullcode, Decimal(0), 0])
+                    entry[1] += minutes
+                    entry[2] += n
+        result = [
+            (cid, fullcode, minutes / n if n else None)
+            for cid, (fullcode, minutes, n) in classes.items()
+        ]
+        result.sort(key=lambda r: (r[2] is not None, -(r[2] or 0), r[0]))
+        return result[:limit]
+
+    def getClassesWithoutPrereqs(self):
+        with self._lock:
+            self._ensureLoaded()
+            result = [
+                (cid, fullcode)
+                for cid, fullcode in self._classCodes.items()
+                if cid not in self._prereqClasses
+            ]
+        result.sort(key=lambda r: (r[1], r[0]))
+        return result
+
+
+stats_cube = StatsCube(ttl=float(os.environ.get("STATS_CUBE_TTL", 300)))
@@ -0,0 +1,110 @@
+import heapq
+from collections import namedtuple
+
+from API.services.intervals import to_seconds
+
+# Letters used in meeting.cdays (L=lunes ... V=viernes, S=sábado)
+DAY_INDEX = {"L": 0, "M": 1, "W": 2, "J": 3, "V": 4, "S": 5}
+MINUTES_PER_DAY = 24 * 60
+
+# One selectable time slot of a class; sections sharing it are interchangeable
+Option = namedtuple("Option", "cid mid cdays start end mask sids")
+
+
+def meeting_mask(cdays, start, end):
+    """
+    Bitmask with one bit per minute of the week the meeting occupies.
+    Two meetings overlap exactly when their masks intersect, which is the
+    same half-open rule SectionDAO.hasScheduleConflict applies in SQL.
+    """
+    first = start // 60
+    last = -(-end // 60)
+    span = (1 << max(last - first, 0)) - 1
+    mask = 0
+    for day in cdays:
+        mask |= span << (DAY_INDEX[day] * MINUTES_PER_DAY + first)
+    return mask
+
+
+def build_options(rows):
+    """
+    Groups SectionDAO.getSectionsWithMeetings rows into {cid: [Option]},
+    one option per distinct meeting time of a class.
+    """
+    grouped = {}
+    for sid, cid, _, _, mid, cdays, starttime, endtime in rows:
+        start, end = to_seconds(starttime), to_seconds(endtime)
+        key = (cid, cdays, start, end)
+        if key not in grouped:
+            grouped[key] = Option(cid, mid, cdays, start, end, meeting_mask(cdays, start, end), [])
+        grouped[key].sids.append(sid)
+    options = {}
+    for option in grouped.values():
+        options.setdefault(option.cid, []).append(option)
+    return options
+
+
+DAY_MASKS = [((1 << MINUTES_PER_DAY) - 1) << (day * MINUTES_PER_DAY) for day in range(len(DAY_INDEX))]
+
+
+def score(mask):
+    """
+    (idle minutes between classes summed over the week, earliest start in
+    minutes) of a timetable, read straight off its combined mask.
+    """
+    span = 0
+    earliest = MINUTES_PER_DAY
+    for day, day_mask in enumerate(DAY_MASKS):
+        bits = mask & day_mask
+        if bits:
+            first = (bits & -bits).bit_length() - 1
+            span += bits.bit_length() - first
+            earliest = min(earliest, first - day * MINUTES_PER_DAY)
+    return span - mask.bit_count(), earliest
+
+
+def generate_timetables(options, limit=20, max_combinations=100000):
+    """
+    Enumerates every conflict-free choice of one option per class by
+    backtracking over the classes with the fewest options first. After each
+    choice the remaining classes are forward-checked, so a branch is dropped
+    as soon as some class has no compatible option left.
+
+    Returns (count, truncated, best) where best holds up to `limit`
+    (gap_minutes, earliest_start_minute, [Option]) tuples, fewest gaps first,
+    then earliest start. Enumeration stops after `max_combinations` timetables.
+    """
+    order = sorted(options, key=lambda cid: len(options[cid]))
+    best = []
+    state = {"count": 0, "truncated": False}
+
+    def search(i, mask, chosen):
+        if state["truncated"]:
+            return
+        if i == len(order):
+            state["count"] += 1
+            gaps, earliest = score(mask)
+            entry = (-gaps, -earliest, state["count"], list(chosen))
+            if len(best) < limit:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+            if state["count"] >= max_combinations:
+                state["truncated"] = True
+            return
+        for option in options[order[i]]:
+            if option.mask & mask:
+                continue
+            combined = mask | option.mask
+            if all(
+                any(not other.mask & combined for other in options[order[j]])
+                for j in range(i + 1, len(order))
+            ):
+                chosen.append(option)
+                search(i + 1, combined, chosen)
+                chosen.pop()
+
+    if order:
+        search(0, 0, [])
+    ranked = sorted(best, reverse=True)
+    return state["count"], state["truncated"], [(-g, -e, chosen) for g, e, _, chosen in ranked]
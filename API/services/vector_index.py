@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from API.config.pgconfig import vector_config
+from API.dao.syllabus import SyllabusDAO, from_vector_binary
+
+
+class InMemoryVectorIndex:
+    """
+    In-process alternative to pgvector for syllabus retrieval.
+
+    All chunk embeddings live in one contiguous, L2-normalized float32
+    matrix ordered by (courseid, chunkid), so a course is a row range and a
+    query is one matrix-vector product plus argpartition. Ranking is by
+    cosine similarity, which orders results like pgvector's L2 distance for
+    the normalized sentence-transformer embeddings stored in syllabus.
+
+    The index reloads when syllabus_version changes (checked at most every
+    `check_interval` seconds). With `path` set, the matrix is saved as
+    <path>.npy and memory-mapped on the next start if the version matches.
+    """
+
+    def __init__(self, path=None, check_interval=5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._version = None
+        self._checkedAt = None
+        # (matrix, chunkids, courseids, chunks, ranges), swapped as a whole on reload
+        self._state = None
+
+    # --- Loading ---
+
+    def _refresh(self):
+        if self._checkedAt is not None and time.monotonic() - self._checkedAt <= self.check_interval:
+            return
+        with self._lock:
+            if self._checkedAt is not None and time.monotonic() - self._checkedAt <= self.check_interval:
+                return
+            with SyllabusDAO() as dao:
+                version = dao.getChunkVersion()
+                if version != self._version:
+                    state = self._loadFromDisk(version)
+                    if state is None:
+                        state = self._loadFromDatabase(dao)
+                        self._saveToDisk(version, state)
+                    self._state = state
+                    self._version = version
+                    print(f"Vector index loaded: {len(state[1])} chunks (version {version})")
+            self._checkedAt = time.monotonic()
+
+    def _loadFromDatabase(self, dao):
+        rows = [row for row in dao.streamChunks(include_embedding=True, binary=True) if row[3] is not None]
+        rows.sort(key=lambda r: (r[1] is None, r[1] or 0, r[0]))
+        matrix = np.empty((len(rows), self._dimension(rows)), dtype=np.float32)
+        for i, row in enumerate(rows):
+            matrix[i] = from_vector_binary(row[3])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+        chunkids = np.array([r[0] for r in rows], dtype=np.int64)
+        courseids = [r[1] for r in rows]
+        chunks = [r[2] for r in rows]
+        return matrix, chunkids, courseids, chunks, self._ranges(courseids)
+
+    def _dimension(self, rows):
+        return int.from_bytes(rows[0][3][:2], "big") if rows else 0
+
+    def _ranges(self, courseids):
+        ranges = {}
+        for i, courseid in enumerate(courseids):
+            if courseid is not None:
+                start, _ = ranges.get(courseid, (i, i))
+                ranges[courseid] = (start, i + 1)
+        return ranges
+
+    def _saveToDisk(self, version, state):
+        if not self.path:
+            return
+        matrix, chunkids, courseids, chunks, _ = state
+        # Written under temporary names and renamed so readers never see half a file
+        np.save(self.path + ".tmp.npy", matrix)
+        with open(self.path + ".tmp.json", "w") as f:
+            json.dump({"version": version, "chunkids": chunkids.tolist(), "courseids": courseids, "chunks": chunks}, f)
+        os.replace(self.path + ".tmp.npy", self.path + ".npy")
+        os.replace(self.path + ".tmp.json", self.path + ".json")
+
+    def _loadFromDisk(self, version):
+        if not self.path or not os.path.exists(self.path + ".json"):
+            return None
+        with open(self.path + ".json") as f:
+            meta = json.load(f)
+        if meta["version"] != version:
+            return None
+        matrix = np.load(self.path + ".npy", mmap_mode="r")
+        courseids = meta["courseids"]
+        return matrix, np.array(meta["chunkids"], dtype=np.int64), courseids, meta["chunks"], self._ranges(courseids)
+
+    def close(self):
+        """Nothing to release; lets callers treat the index like a SyllabusDAO."""
+
+    def invalidate(self):
+        """Makes the next search check syllabus_version instead of waiting for check_interval."""
+        self._checkedAt = None
+
+    # --- Queries ---
+
+    def search(self, embedding, limit=5, courseid=None):
+        """Rows shaped like SyllabusDAO.getFragments (embedding_text is not returned)."""
+        self._refresh()
+        matrix, chunkids, courseids, chunks, ranges = self._state
+        start, end = 0, len(chunkids)
+        if courseid is not None:
+            start, end = ranges.get(courseid, (0, 0))
+        if end <= start:
+            return []
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        scores = matrix[start:end] @ (query / norm if norm else query)
+        k = min(limit, end - start)
+        top = np.argpartition(-scores, k - 1)[:k] if k < end - start else np.arange(end - start)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(chunkids[start + i]), courseids[start + i], chunks[start + i], None) for i in top]
+
+    def getFragments(self, embedding, limit=5, **knobs):
+        return self.search(embedding, limit)
+
+    def getFragmentsByCourseAndEmbedding(self, courseid, embedding, limit=5, **knobs):
+        return self.search(embedding, limit, courseid)
+
+
+vector_index = InMemoryVectorIndex(vector_config["index_path"], vector_config["check_interval"])
+
+
+def get_retriever():
+    """Object with getFragments/getFragmentsByCourseAndEmbedding for the configured VECTOR_BACKEND."""
+    if vector_config["backend"] == "memory":
+        return vector_index
+    return SyllabusDAO()
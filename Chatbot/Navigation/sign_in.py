@@ -3,8 +3,6 @@ import re
 
 from API.dao.user import UserDAO
 
-dao = UserDAO()
-
 
 # Sign up page
 def sign_up_ui():
@@ -25,7 +23,8 @@ def sign_up_ui():
             ok, message = validate_signup(username, password1, password2)
 
             if ok:
-                dao.insertUser(username, password1)
+                with UserDAO() as dao:
+                    dao.insertUser(username, password1)
                 st.session_state.logged_in = True
                 st.session_state.username = username
                 st.success("Account created successfully!")
@@ -66,7 +65,9 @@ def validate_signup(username, pass1, pass2):
     if not re.match("^[a-zA-Z0-9_]+$", username):
         return False, "Username can only contain letters, numbers, and underscores."
 
-    if dao.getUserByUsername(username):
+    with UserDAO() as dao:
+        existing = dao.getUserByUsername(username)
+    if existing:
         return False, "Username already exists."
 
     if len(pass1) < 6:
@@ -79,7 +80,8 @@ def validate_signup(username, pass1, pass2):
 
 
 def validate_login(username, password):
-    result = dao.verifyUser(username, password)
+    with UserDAO() as dao:
+        result = dao.verifyUser(username, password)
 
     if result is None:
         return False, "Username does not exist."
@@ -1,6 +1,5 @@
 import streamlit as st
 from llm.chatollama import ChatOllamaBot
-import time
 
 # Ensure username exists
 if "username" not in st.session_state:
@@ -9,7 +8,14 @@ if "username" not in st.session_state:
 st.title("Chatbot")
 st.caption("Ask me about classes, meetings, sections, and more!")
 
-bot = ChatOllamaBot(st.session_state.username)
+
+@st.cache_resource
+def get_bot():
+    # One bot shared by every session and rerun; the username goes with each question
+    return ChatOllamaBot()
+
+
+bot = get_bot()
 
 if "messages" not in st.session_state:
     st.session_state.messages = [
@@ -32,14 +38,6 @@ if prompt:
         st.markdown(prompt)
 
     with st.chat_message("assistant"):
-        placeholder = st.empty()
-        response = bot.chat(prompt)
-        typed = ""
-
-        for chunk in response.split():
-            typed += chunk + " "
-            time.sleep(0.03)
-            placeholder.markdown(typed + "▌")
-
-        placeholder.markdown(typed)
-        st.session_state.messages.append({"role": "assistant", "content": typed})
+        # Renders tokens as the model produces them
+        response = st.write_stream(bot.stream(prompt, st.session_state.username))
+        st.session_state.messages.append({"role": "assistant", "content": response})
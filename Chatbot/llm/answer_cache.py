@@ -0,0 +1,117 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# Stands in for the username in cached answers so any user's greeting can be re-applied
+USERNAME_PLACEHOLDER = "\x00username\x00"
+
+
+class AnswerCache:
+    """
+    Semantic cache of LLM answers.
+
+    Answers are bucketed by (courseid, retrieved chunk ids): a question only
+    reuses an answer that was generated from exactly the same context, and
+    only if its query embedding is within `threshold` cosine similarity of
+    the cached question's. Re-ingested chunks get new ids, so edited
+    syllabi stop matching on their own; invalidateCourse() drops a course's
+    answers right away when the API changes its chunks.
+    """
+
+    def __init__(self, max_entries=512, ttl=3600.0, threshold=0.95):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        # (courseid, chunkids) -> [(expiry, unit embedding, body, courseids of the chunks)]
+        self._buckets = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _unit(embedding):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, courseid, fragments, embedding, username):
+        """Cached answer for `username`, or None."""
+        key = (courseid, tuple(f[0] for f in fragments))
+        query = self._unit(embedding)
+        now = time.time()
+        with self._lock:
+            entries = self._buckets.get(key)
+            if entries:
+                live = [entry for entry in entries if entry[0] > now]
+                self._size -= len(entries) - len(live)
+                if live:
+                    self._buckets[key] = live
+                else:
+                    del self._buckets[key]
+                for _, cached, body, _ in live:
+                    if float(cached @ query) >= self.threshold:
+                        self._buckets.move_to_end(key)
+                        self._hits += 1
+                        return body.replace(USERNAME_PLACEHOLDER, username)
+            self._misses += 1
+            return None
+
+    def put(self, courseid, fragments, embedding, username, answer):
+        key = (courseid, tuple(f[0] for f in fragments))
+        # Whole words only, so a username such as "ana" leaves "analysis" alone
+        body = re.sub(rf"(?<!\w){re.escape(username)}(?!\w)", USERNAME_PLACEHOLDER, answer) if username else answer
+        entry = (time.time() + self.ttl, self._unit(embedding), body, {f[1] for f in fragments} | {courseid})
+        with self._lock:
+            self._buckets.setdefault(key, []).append(entry)
+            self._buckets.move_to_end(key)
+            self._size += 1
+            while self._size > self.max_entries and self._buckets:
+                oldest = next(iter(self._buckets))
+                entries = self._buckets[oldest]
+                if entries:
+                    entries.pop(0)
+                    self._size -= 1
+                if not entries:
+                    del self._buckets[oldest]
+
+    def invalidateCourse(self, courseid):
+        """Drops answers built from, or scoped to, a course whose chunks changed."""
+        with self._lock:
+            for key in list(self._buckets):
+                entries = self._buckets[key]
+                kept = [entry for entry in entries if courseid not in entry[3]]
+                self._size -= len(entries) - len(kept)
+                if kept:
+                    self._buckets[key] = kept
+                else:
+                    del self._buckets[key]
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "entries": self._size,
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "threshold": self.threshold,
+            }
+
+
+answer_cache = AnswerCache(
+    max_entries=int(os.environ.get("ANSWER_CACHE_SIZE", 512)),
+    ttl=float(os.environ.get("ANSWER_CACHE_TTL", 3600)),
+    threshold=float(os.environ.get("ANSWER_CACHE_THRESHOLD", 0.95)),
+)
@@ -1,6 +1,33 @@
-from Chatbot.llm.chatollama import ChatOllamaBot
+import threading
 
-_bot = ChatOllamaBot(username="tester")
+_bot = None
+_bot_lock = threading.Lock()
 
-def chatbot_reply(question: str) -> str:
-    return _bot.chat(question)
\ No newline at end of file
+# Name the bot greets API callers with
+USERNAME = "tester"
+
+
+def get_bot():
+    """
+    Builds the shared ChatOllamaBot on first use.
+
+    Importing the bot pulls in sentence-transformers/torch and loads the
+    embedding model, so it is deferred until the first chatbot request
+    instead of being paid by every API worker at import time.
+    """
+    global _bot
+    if _bot is None:
+        with _bot_lock:
+            if _bot is None:
+                from Chatbot.llm.chatollama import ChatOllamaBot
+
+                _bot = ChatOllamaBot()
+    return _bot
+
+
+def chatbot_reply(question: str, ticket=None) -> str:
+    return get_bot().chat(question, USERNAME, ticket)
+
+
+def chatbot_stream(question: str, ticket=None):
+    return get_bot().stream(question, USERNAME, ticket)
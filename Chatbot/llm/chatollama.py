@@ -1,22 +1,78 @@
+import os
 import re
 import time
+from contextlib import nullcontext
 
 from sentence_transformers import SentenceTransformer
 from langchain_ollama import ChatOllama
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
-from API.dao.syllabus import SyllabusDAO
-from API.dao.classes import ClassDAO
+from API.services.vector_index import get_retriever
+from API.services.planner import curriculum_planner
+from Chatbot.llm.query_cache import embedding_cache
+from Chatbot.llm.answer_cache import answer_cache
+from Chatbot.llm.encode_batcher import query_batcher
+from API.services.chatbot_scheduler import ChatbotTimeout
 
 
 MODEL = "all-mpnet-base-v2"
+LLM_MODEL = "llama3.2:latest"
+# How long Ollama keeps llama3.2 loaded after a request
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+
+PROMPT = ChatPromptTemplate.from_template(
+    template="""
+            You are an assistant trained to answer questions based on syllabus documents.
+            You must always greet the user by their username {username}. 
+            Your role is to help users understand their syllabus, answer course-related questions, and provide information directly from the provided documents.
+
+        Instructions:
+        - Use the provided syllabus documents to answer questions as accurately as possible, only referencing the relevant course information.
+        - If the user asks about a specific course (e.g., CIIC 4151), focus on the syllabus information related to that course.
+        - Pay special attention to section labels like [Textbooks and Bibliography], [Grading System], [Prerequisites and Corequisites], etc.
+        - When asked about textbooks, books, bibliography, or reading materials, look for the [Textbooks and Bibliography] section.
+        - When asked about grading, grades, percentages, or evaluation, look for the [Evaluation Strategies] section.
+        - CRITICAL: Look for numbers followed by "percent" (e.g., "35 percent", "25 percent", "40 percent") - these are the actual grade percentages.
+        - IGNORE any standalone numbers that represent quantities or counts - only report percentages with the word "percent" or "%" symbol.
+        - Present grading information clearly, showing only the items with actual percentages assigned.
+        - When asked about prerequisites or corequisites, look for the [Prerequisites and Corequisites] section.
+        - If the question is about requisites, grading, or other course-specific information, ensure the answer matches the exact course in the question.
+        - If the syllabus does not contain the required information or the question cannot be answered, respond with: "Sorry, I don't know."
+        - Keep your answers concise, confident, and ideally under five sentences. Use bullet points for clarity when listing multiple points.
+        - Maintain a professional, helpful tone at all times.
+
+        Context:
+        {database_response}
+
+        Current Question:
+        {question}
+        
+        Answer:
+        """
+)
+
+
+def stage(ticket, name):
+    # Requests from the API hold a chatbot_scheduler ticket; the Streamlit app runs unscheduled
+    return ticket.stage(name) if ticket else nullcontext()
 
 
 class ChatOllamaBot:
-    def __init__(self, username):
-        self.username = username
+    """
+    Retrieval+generation pipeline kept for the life of the process: the
+    embedding model, the prompt, and one Ollama client (and therefore its
+    keep-alive HTTP connection) are built once and shared by every call and
+    every user; the username is passed with each question.
+    Database connections are borrowed from the pool per call.
+    """
+
+    def __init__(self):
         self.model = SentenceTransformer(MODEL)
+        # Bound once so every request hands query_batcher the same encode function
+        self._encode_batch = self.model.encode
+        self.llm = ChatOllama(model=LLM_MODEL, temperature=0, keep_alive=OLLAMA_KEEP_ALIVE)
+        self.chain = PROMPT | self.llm | StrOutputParser()
 
     def extract_course(self, question):
         match = re.search(r"(CIIC|ICOM|INSO)\s?(\d{4})", question.upper())
@@ -24,13 +80,8 @@ class ChatOllamaBot:
             return match.group(1), match.group(2)
         return None, None
 
-    def chat(self, question):
-        start_time = time.time()
-
-        # Extract course code from question
-        dept, code = self.extract_course(question)
-
-        # Enhance query for better embedding similarity
+    def enhance_query(self, question, dept, code):
+        """Adds the course code and section keywords for better embedding similarity."""
         enhanced_query = question
         if dept and code:
             enhanced_query = f"{dept} {code}: {question}"
@@ -56,20 +107,68 @@ class ChatOllamaBot:
             ]
         ):
             enhanced_query += " evaluation strategies grading percent breakdown"
+        return enhanced_query
 
-        emb = self.model.encode(enhanced_query)
-
-        dao = SyllabusDAO()
-        classdao = ClassDAO()
-
+    def find_course(self, dept, code):
+        # The planner's in-memory catalog is refreshed on class writes
         if dept and code:
-            courseid = classdao.getCourseIDByCode(dept, code)
+            return curriculum_planner.resolve(f"{dept} {code}")
+        return None
+
+    def retrieve(self, courseid, emb):
+        retriever = get_retriever()
+        try:
             if courseid:
-                fragments = dao.getFragmentsByCourseAndEmbedding(courseid, emb)
-            else:
-                fragments = dao.getFragments(emb)
-        else:
-            fragments = dao.getFragments(emb)
+                return retriever.getFragmentsByCourseAndEmbedding(courseid, emb)
+            return retriever.getFragments(emb)
+        finally:
+            retriever.close()
+
+    def chat(self, question, username, ticket=None):
+        return "".join(self.stream(question, username, ticket))
+
+    def encode(self, text, ticket=None):
+        # Batched with the queries of concurrent requests
+        try:
+            return query_batcher.encode(text, self._encode_batch, ticket.remaining() if ticket else None)
+        except TimeoutError:
+            raise ChatbotTimeout("Timed out waiting for the query embedding")
+
+    def stream(self, question, username, ticket=None):
+        """
+        Yields the answer to `username` as the LLM produces it. A cached answer is yielded
+        as a single chunk. With a scheduler `ticket`, encoding and generation
+        stop once the request's deadline passes, and generation waits for an
+        llm slot. Each call logs how long every stage took.
+        """
+        timings = {}
+        start_time = mark = time.perf_counter()
+
+        def lap(name):
+            nonlocal mark
+            now = time.perf_counter()
+            timings[name] = now - mark
+            mark = now
+
+        dept, code = self.extract_course(question)
+        enhanced_query = self.enhance_query(question, dept, code)
+        lap("extract")
+
+        emb = embedding_cache.getOrEncode(MODEL, enhanced_query, lambda text: self.encode(text, ticket))
+        lap("encode")
+
+        courseid = self.find_course(dept, code)
+        lap("lookup")
+
+        fragments = self.retrieve(courseid, emb)
+        cached = answer_cache.get(courseid, fragments, emb, username)
+        lap("retrieval")
+
+        if cached is not None:
+            timings["generation"] = 0.0
+            self.log_timings(timings, start_time, "answer cache hit")
+            yield cached
+            return
 
         context = []
         for i, f in enumerate(fragments):
@@ -77,60 +176,29 @@ class ChatOllamaBot:
 
         documents = "\\n".join(context)
 
-        prompt = ChatPromptTemplate.from_template(
-            template="""
-            You are an assistant trained to answer questions based on syllabus documents.
-            You must always greet the user by their username {username}. 
-            Your role is to help users understand their syllabus, answer course-related questions, and provide information directly from the provided documents.
-
-        Instructions:
-        - Use the provided syllabus documents to answer questions as accurately as possible, only referencing the relevant course information.
-        - If the user asks about a specific course (e.g., CIIC 4151), focus on the syllabus information related to that course.
-        - Pay special attention to section labels like [Textbooks and Bibliography], [Grading System], [Prerequisites and Corequisites], etc.
-        - When asked about textbooks, books, bibliography, or reading materials, look for the [Textbooks and Bibliography] section.
-        - When asked about grading, grades, percentages, or evaluation, look for the [Evaluation Strategies] section.
-        - CRITICAL: Look for numbers followed by "percent" (e.g., "35 percent", "25 percent", "40 percent") - these are the actual grade percentages.
-        - IGNORE any standalone numbers that represent quantities or counts - only report percentages with the word "percent" or "%" symbol.
-        - Present grading information clearly, showing only the items with actual percentages assigned.
-        - When asked about prerequisites or corequisites, look for the [Prerequisites and Corequisites] section.
-        - If the question is about requisites, grading, or other course-specific information, ensure the answer matches the exact course in the question.
-        - If the syllabus does not contain the required information or the question cannot be answered, respond with: "Sorry, I don't know."
-        - Keep your answers concise, confident, and ideally under five sentences. Use bullet points for clarity when listing multiple points.
-        - Maintain a professional, helpful tone at all times.
-
-        Context:
-        {database_response}
-
-        Current Question:
-        {question}
-        
-        Answer:
-        """
-        )
-
-        # print(prompt)
-        # print(
-        prompt.format(
-            question=question, database_response=documents, username=self.username
-        )
-        # )
-
-        llm = ChatOllama(
-            model="llama3.2:latest",
-            temperature=0,
-        )
-        rag_chain = prompt | llm | StrOutputParser()
-
-        answer = rag_chain.invoke(
-            {
-                "username": self.username,
-                "question": question,
-                "database_response": documents,
-            }
-        )
-
-        elapsed_time = time.time() - start_time
-        print(f"Response time with model {llm.model}: {elapsed_time:.2f} seconds")
-
-        # print(answer)
-        return answer
+        parts = []
+        first_token = None
+        with stage(ticket, "llm"):
+            for token in self.chain.stream(
+                {
+                    "username": username,
+                    "question": question,
+                    "database_response": documents,
+                }
+            ):
+                if ticket:
+                    ticket.check()
+                if first_token is None:
+                    first_token = time.perf_counter() - start_time
+                parts.append(token)
+                yield token
+        lap("generation")
+
+        answer = "".join(parts)
+        answer_cache.put(courseid, fragments, emb, username, answer)
+        self.log_timings(timings, start_time, f"first token {first_token * 1000 if first_token else 0:.0f}ms")
+
+    def log_timings(self, timings, start_time, note):
+        stages = " ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in timings.items())
+        total = time.perf_counter() - start_time
+        print(f"Chatbot latency with model {LLM_MODEL}: {stages} total={total * 1000:.0f}ms ({note})")
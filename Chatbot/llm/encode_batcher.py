@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class EncodeBatcher:
+    """
+    Dynamic batching of query embeddings across concurrent requests.
+
+    Callers queue their text and wait on a Future. A worker thread takes the
+    first waiting text, keeps collecting for up to `max_wait` seconds or
+    `max_batch` texts, runs one batched encode over them and hands each
+    caller its row. A single sentence-transformer forward pass over a batch
+    costs far less than one per query, so throughput grows with load while
+    an idle server only pays `max_wait` extra per query.
+
+    `workers` threads encode at once (CHATBOT_ENCODE_CONCURRENCY).
+    """
+
+    def __init__(self, max_batch=16, max_wait=0.005, workers=1):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.workers = workers
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._stats = {"requests": 0, "encoded": 0, "batches": 0, "encode_seconds": 0.0, "max_batch_seen": 0}
+
+    def encode(self, text, encode_batch, timeout=None):
+        """
+        Embedding of `text` computed by `encode_batch(list_of_texts)` together
+        with other waiting texts for the same function (compared with ==, so
+        `model.encode` bound afresh on each call still batches). Raises
+        TimeoutError after `timeout` seconds.
+        """
+        future = Future()
+        with self._cond:
+            if not self._threads:
+                self._start()
+            self._pending.append((text, encode_batch, future))
+            self._stats["requests"] += 1
+            self._cond.notify()
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def _start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"encode-batcher-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _take(self):
+        """Waits for the next batch of (text, future) sharing one encode function."""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.monotonic() + self.max_wait
+            while len(self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            encode_batch = self._pending[0][1]
+            batch, rest = [], deque()
+            while self._pending and len(batch) < self.max_batch:
+                item = self._pending.popleft()
+                if item[1] == encode_batch:
+                    batch.append(item)
+                else:
+                    rest.append(item)
+            self._pending.extendleft(reversed(rest))
+            return encode_batch, batch
+
+    def _run(self):
+        while True:
+            encode_batch, batch = self._take()
+            # Callers that already timed out no longer need their embedding
+            batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            start = time.perf_counter()
+            try:
+                vectors = np.asarray(encode_batch([text for text, _, _ in batch]), dtype=np.float32)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            with self._cond:
+                self._stats["batches"] += 1
+                self._stats["encoded"] += len(batch)
+                self._stats["encode_seconds"] += time.perf_counter() - start
+                self._stats["max_batch_seen"] = max(self._stats["max_batch_seen"], len(batch))
+            for (_, _, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+    def stats(self):
+        with self._cond:
+            batches = self._stats["batches"]
+            return {
+                "requests": self._stats["requests"],
+                "batches": batches,
+                "avg_batch_size": round(self._stats["encoded"] / batches, 2) if batches else 0.0,
+                "max_batch_seen": self._stats["max_batch_seen"],
+                "encode_seconds": round(self._stats["encode_seconds"], 3),
+                "queue_depth": len(self._pending),
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000,
+                "workers": self.workers,
+            }
+
+
+query_batcher = EncodeBatcher(
+    max_batch=int(os.environ.get("EMBED_BATCH_SIZE", 16)),
+    max_wait=float(os.environ.get("EMBED_BATCH_WAIT_MS", 5)) / 1000,
+    workers=int(os.environ.get("CHATBOT_ENCODE_CONCURRENCY", 1)),
+)
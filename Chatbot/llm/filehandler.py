@@ -1,5 +1,10 @@
+import argparse
+import hashlib
 import re
 import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 from pypdf import PdfReader
 from os import listdir
@@ -8,14 +13,40 @@ from langchain_text_splitters import (
     RecursiveCharacterTextSplitter,
     SentenceTransformersTokenTextSplitter,
 )
-from sentence_transformers import SentenceTransformer
 from API.dao.syllabus import SyllabusDAO
 from API.dao.classes import ClassDAO
 
-model = SentenceTransformer("all-mpnet-base-v2")
+MODEL = "all-mpnet-base-v2"
 
-# TODO cambiar al path correcto de tu computadora
-PDF_DIR = r"C:\personal-projects\rumad_2.0\syllabus"
+PDF_DIR = os.environ.get(
+    "SYLLABUS_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "syllabus"),
+)
+
+# Embeddings computed per model.encode call
+ENCODE_BATCH_SIZE = int(os.environ.get("INGEST_BATCH_SIZE", 64))
+
+_model = None
+_token_splitter = None
+
+
+def get_model():
+    """The embedding model is only loaded by the process that encodes, never by PDF workers."""
+    global _model
+    if _model is None:
+        from sentence_transformers import SentenceTransformer
+
+        _model = SentenceTransformer(MODEL)
+    return _model
+
+
+def get_token_splitter():
+    global _token_splitter
+    if _token_splitter is None:
+        _token_splitter = SentenceTransformersTokenTextSplitter(
+            chunk_overlap=0, tokens_per_chunk=256, model_name=f"sentence-transformers/{MODEL}"
+        )
+    return _token_splitter
 
 
 def extract_dept_code(filename):
@@ -71,93 +102,204 @@ def preprocess_syllabus(pdf_texts):
     return cleaned_data
 
 
-def process_pdf(filepath, courseid, dept=None, code=None):
-    """Process a single syllabus file and store it in the database."""
-    try:
-        print(f"Processing file: {filepath}")
-        reader = PdfReader(filepath)
-        pdf_texts = [
-            page.extract_text().strip() for page in reader.pages if page.extract_text()
-        ]
-
-        if not pdf_texts:
-            print(f"No valid text found in {filepath}. Skipping.")
-            return
-
-        # Try to extract structured sections from syllabus
-        processed_data = preprocess_syllabus(pdf_texts)
-        combined_text = "\n\n".join(processed_data.values())
-
-        # Use processed data if available, otherwise fall back to raw text
-        character_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=800,
-            chunk_overlap=80,
-            length_function=len,
-            is_separator_regex=False,
-        )
-
-        if len(combined_text) > 0:
-            character_split_texts = character_splitter.split_text(combined_text)
-            print(f"Successfully extracted {len(processed_data)} structured sections")
+def extract_pdf(filepath):
+    """
+    Reads a syllabus PDF and splits it into character chunks.
+    Runs in a worker process: pure CPU work, no model and no database.
+    Returns (page_count, character_chunks).
+    """
+    reader = PdfReader(filepath)
+    pdf_texts = [
+        page.extract_text().strip() for page in reader.pages if page.extract_text()
+    ]
+    if not pdf_texts:
+        return len(reader.pages), []
+
+    # Try to extract structured sections from syllabus
+    processed_data = preprocess_syllabus(pdf_texts)
+    combined_text = "\n\n".join(processed_data.values())
+
+    # Use processed data if available, otherwise fall back to raw text
+    character_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=800,
+        chunk_overlap=80,
+        length_function=len,
+        is_separator_regex=False,
+    )
+    if len(combined_text) > 0:
+        return len(reader.pages), character_splitter.split_text(combined_text)
+    return len(reader.pages), character_splitter.split_text("\n\n".join(pdf_texts))
+
+
+def split_chunks(character_split_texts, dept=None, code=None):
+    """Token-splits character chunks and prepends the course code for accurate retrieval."""
+    token_splitter = get_token_splitter()
+    course_prefix = f"{dept} {code}: " if dept and code else ""
+    return [
+        course_prefix + chunk
+        for text in character_split_texts
+        for chunk in token_splitter.split_text(text)
+    ]
+
+
+def sha256(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(filepath):
+    with open(filepath, "rb") as f:
+        return sha256(f.read())
+
+
+def diff_chunks(chunks, existing):
+    """
+    Compares a course's new chunks with its stored (chunkid, chunk_hash, model)
+    rows. Chunks whose text is already stored with the current model are kept;
+    returns (delete_ids, new) where new holds (chunk, chunk_hash) to embed.
+    """
+    stored = defaultdict(list)
+    delete_ids = []
+    for chunkid, chunk_hash, model in existing:
+        if model == MODEL:
+            stored[chunk_hash].append(chunkid)
         else:
-            character_split_texts = character_splitter.split_text(
-                "\n\n".join(pdf_texts)
-            )
-            print("Using raw text (structured sections not found)")
-
-        print(f"Total character chunks: {len(character_split_texts)}")
-
-        # Token splitting
-        token_splitter = SentenceTransformersTokenTextSplitter(
-            chunk_overlap=0, tokens_per_chunk=256
-        )
-
-        token_split_texts = [
-            chunk
-            for text in character_split_texts
-            for chunk in token_splitter.split_text(text)
-        ]
-
-        print(f"Total token chunks: {len(token_split_texts)}")
-
-        # Insert chunks into database
-        dao = SyllabusDAO()
+            delete_ids.append(chunkid)
+    new = []
+    for chunk in chunks:
+        chunk_hash = sha256(chunk)
+        if stored[chunk_hash]:
+            stored[chunk_hash].pop()
+        else:
+            new.append((chunk, chunk_hash))
+    # Whatever was not matched belongs to text that is no longer in the PDF
+    delete_ids.extend(chunkid for ids in stored.values() for chunkid in ids)
+    return delete_ids, new
+
+
+def ingest(jobs, workers=None, batch_size=ENCODE_BATCH_SIZE, prune=False):
+    """
+    Incrementally ingests (filepath, courseid, dept, code) jobs:
+
+      1. PDFs whose content hash and model match the last run are skipped
+      2. changed PDFs are read and character-split in a process pool
+      3. only chunks whose text is not stored yet are embedded, in batches
+      4. each course's diff (delete removed chunks, insert new ones, record
+         the file hash) is applied in a single transaction; a course without
+         a file record has all its earlier chunks replaced
+
+    With prune=True, courses whose PDF is no longer among the jobs lose their
+    ingested chunks. Prints and returns throughput counters.
+    """
+    stats = {"files": 0, "skipped": 0, "failed": 0, "pages": 0, "chunks": 0,
+             "reused": 0, "embeddings": 0, "deleted": 0}
+    started = time.perf_counter()
+
+    with SyllabusDAO() as dao:
+        ingested = dao.getIngestedFiles()
+        changed = []
+        for filepath, courseid, dept, code in jobs:
+            digest = file_hash(filepath)
+            previous = ingested.get(courseid)
+            if previous and previous[1] == digest and previous[2] == MODEL:
+                stats["skipped"] += 1
+                continue
+            changed.append((filepath, courseid, dept, code, digest))
+
+        courses = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [(job, pool.submit(extract_pdf, job[0])) for job in changed]
+            for (filepath, courseid, dept, code, digest), future in futures:
+                try:
+                    pages, character_split_texts = future.result()
+                except Exception as e:
+                    print(f"✗ Error processing {filepath}: {e}")
+                    stats["failed"] += 1
+                    continue
+                stats["files"] += 1
+                stats["pages"] += pages
+                if not character_split_texts:
+                    print(f"No valid text found in {filepath}. Skipping.")
+                    continue
+                chunks = split_chunks(character_split_texts, dept, code)
+                # Without a file record the course's chunks predate chunk hashes (or were
+                # added by hand); they cannot be matched, so the course is replaced outright
+                replace = courseid not in ingested
+                delete_ids, new = diff_chunks(chunks, [] if replace else dao.getChunkHashes(courseid))
+                stats["chunks"] += len(chunks)
+                stats["reused"] += len(chunks) - len(new)
+                courses.append((courseid, os.path.basename(filepath), digest, delete_ids, new, replace))
+        extracted = time.perf_counter()
+
+        texts = [chunk for *_, new, _ in courses for chunk, _ in new]
+        embeddings = get_model().encode(texts, batch_size=batch_size, convert_to_numpy=True) if texts else []
+        stats["embeddings"] = len(texts)
+        encoded = time.perf_counter()
+
+        offset = 0
+        for courseid, filename, digest, delete_ids, new, replace in courses:
+            rows = [(chunk, chunk_hash, embeddings[offset + i]) for i, (chunk, chunk_hash) in enumerate(new)]
+            offset += len(new)
+            dao.syncCourseChunks(courseid, delete_ids, rows, filename, digest, MODEL, replace=replace)
+            stats["deleted"] += len(delete_ids)
+        if prune:
+            current = {job[1] for job in jobs}
+            for courseid in ingested:
+                if courseid not in current:
+                    stats["deleted"] += dao.deleteIngestedCourse(courseid)
+    finished = time.perf_counter()
+
+    stats["extract_seconds"] = extracted - started
+    stats["encode_seconds"] = encoded - extracted
+    stats["write_seconds"] = finished - encoded
+    stats["total_seconds"] = finished - started
+    print(
+        f"Ingested {stats['files']} files ({stats['skipped']} unchanged, {stats['failed']} failed) "
+        f"in {stats['total_seconds']:.1f}s: "
+        f"{stats['pages'] / max(stats['extract_seconds'], 1e-9):.1f} pages/s, "
+        f"{stats['chunks'] / max(stats['extract_seconds'], 1e-9):.1f} chunks/s, "
+        f"{stats['embeddings'] / max(stats['encode_seconds'], 1e-9):.1f} embeddings/s; "
+        f"{stats['reused']} chunks reused, {stats['embeddings']} embedded, {stats['deleted']} deleted"
+    )
+    return stats
 
-        # Create course prefix to prepend to each chunk for better retrieval
-        course_prefix = f"{dept} {code}: " if dept and code else ""
 
-        for i, chunk in enumerate(token_split_texts):
-            # Prepend course code to chunk for accurate retrieval
-            enhanced_chunk = course_prefix + chunk
-            emb = model.encode(enhanced_chunk).tolist()
-            print(f"Inserting chunk {i + 1}/{len(token_split_texts)}")
-            dao.insertChunk(courseid, enhanced_chunk, emb)
+def process_pdf(filepath, courseid, dept=None, code=None):
+    """Process a single syllabus file and store it in the database."""
+    return ingest([(filepath, courseid, dept, code)], workers=1)
 
-        print(f"✓ Finished processing file: {filepath}\n")
 
-    except Exception as e:
-        print(f"✗ Error processing {filepath}: {e}\n")
+def find_jobs(pdf_dir=PDF_DIR):
+    with ClassDAO() as classdao:
+        jobs = []
+        for filename in sorted(listdir(pdf_dir)):
+            if not filename.lower().endswith(".pdf"):
+                continue
 
+            dept, code = extract_dept_code(filename)
+            if not dept:
+                print(
+                    f"Could not extract department and code from filename: {filename}. Skipping."
+                )
+                continue
+            courseid = classdao.getCourseIDByCode(dept, code)
+            if not courseid:
+                print(f"No course found for {dept} {code}. Skipping file: {filename}.")
+                continue
+            jobs.append((os.path.join(pdf_dir, filename), courseid, dept, code))
+    return jobs
 
-def process_all_pdfs():
-    classdao = ClassDAO()
-    for filename in listdir(PDF_DIR):
-        if not filename.lower().endswith(".pdf"):
-            continue
 
-        dept, code = extract_dept_code(filename)
-        if not dept:
-            print(
-                f"Could not extract department and code from filename: {filename}. Skipping."
-            )
-            continue
-        courseid = classdao.getCourseIDByCode(dept, code)
-        if not courseid:
-            print(f"No course found for {dept} {code}. Skipping file: {filename}.")
-            continue
-        filepath = os.path.join(PDF_DIR, filename)
-        process_pdf(filepath, courseid, dept, code)
+def process_all_pdfs(pdf_dir=PDF_DIR, workers=None, batch_size=ENCODE_BATCH_SIZE):
+    """Syncs the table with the folder: unchanged PDFs are skipped and removed PDFs pruned."""
+    return ingest(find_jobs(pdf_dir), workers, batch_size, prune=True)
 
 
 if __name__ == "__main__":
-    process_all_pdfs()
+    parser = argparse.ArgumentParser(description="Ingest syllabus PDFs into the syllabus table")
+    parser.add_argument("--dir", default=PDF_DIR, help="Folder with the syllabus PDFs")
+    parser.add_argument("--workers", type=int, default=None, help="PDF extraction processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=ENCODE_BATCH_SIZE, help="Chunks per encode batch")
+    args = parser.parse_args()
+    process_all_pdfs(args.dir, args.workers, args.batch_size)
@@ -0,0 +1,122 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    LRU+TTL cache of chatbot query embeddings.
+
+    Keys are (model, normalized query), so "CIIC 4020 textbook?" and
+    "ciic 4020  textbook" share an entry. Misses fall through to an optional
+    SQLite file (`path`) before encoding, so embeddings survive restarts;
+    entries older than `ttl` are ignored in both tiers.
+    """
+
+    def __init__(self, max_entries=1024, ttl=86400.0, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._memoryHits = 0
+        self._diskHits = 0
+        self._misses = 0
+        self._encodeSeconds = 0.0
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (model TEXT, query TEXT, vector BLOB, created REAL, PRIMARY KEY (model, query))"
+            )
+            self._db.execute("DELETE FROM embeddings WHERE created < ?", (time.time() - ttl,))
+            self._db.commit()
+
+    @staticmethod
+    def normalize(query):
+        query = re.sub(r"\s+", " ", query.strip().lower())
+        return query.rstrip("?!. ")
+
+    def getOrEncode(self, model, query, encode):
+        """Embedding of `query` from the cache, or `encode(query)` on a miss."""
+        key = (model, self.normalize(query))
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._memoryHits += 1
+                return entry[1]
+            vector = self._diskGet(key, now)
+            if vector is not None:
+                self._diskHits += 1
+                self._store(key, vector, now)
+                return vector
+            self._misses += 1
+
+        start = time.perf_counter()
+        vector = np.asarray(encode(query), dtype=np.float32)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._encodeSeconds += elapsed
+            self._store(key, vector, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                    (key[0], key[1], vector.tobytes(), now),
+                )
+                self._db.commit()
+        return vector
+
+    def _store(self, key, vector, now):
+        self._entries[key] = (now + self.ttl, vector)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _diskGet(self, key, now):
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT vector FROM embeddings WHERE model = ? AND query = ? AND created >= ?",
+            (key[0], key[1], now - self.ttl),
+        ).fetchone()
+        return np.frombuffer(row[0], dtype=np.float32) if row else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            hits = self._memoryHits + self._diskHits
+            lookups = hits + self._misses
+            disk_entries = self._db.execute("SELECT count(*) FROM embeddings").fetchone()[0] if self._db else None
+            return {
+                "memory_hits": self._memoryHits,
+                "disk_hits": self._diskHits,
+                "misses": self._misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                # average encode time times hits: CPU time the cache avoided
+                "encode_seconds_saved": round(hits * self._encodeSeconds / self._misses, 3) if self._misses else 0.0,
+                "entries": len(self._entries),
+                "disk_entries": disk_entries,
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+
+embedding_cache = EmbeddingCache(
+    max_entries=int(os.environ.get("EMBEDDING_CACHE_SIZE", 1024)),
+    ttl=float(os.environ.get("EMBEDDING_CACHE_TTL", 86400)),
+    path=os.environ.get("EMBEDDING_CACHE_PATH"),
+)
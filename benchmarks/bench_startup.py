@@ -0,0 +1,76 @@
+"""
+Cold-start benchmark for the Flask API process.
+
+Each scenario runs in a fresh interpreter so import caches do not leak
+between runs:
+
+  crud   - import API.main (what a gunicorn worker does before serving CRUD)
+  eager  - import API.main and build the chatbot right away (the old
+           import-time behaviour of Chatbot/llm/chatbot_for_Collection.py)
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "crud": "import API.main",
+    "eager": (
+        "import API.main\n"
+        "from Chatbot.llm.chatbot_for_Collection import get_bot\n"
+        "get_bot()"
+    ),
+}
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "maxrss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "sentence_transformers": "sentence_transformers" in sys.modules,
+    "torch": "torch" in sys.modules,
+}}))
+"""
+
+
+def run_once(code):
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(code=code)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append")
+    args = parser.parse_args()
+
+    for name in args.scenario or ["crud", "eager"]:
+        samples = [run_once(SCENARIOS[name]) for _ in range(args.runs)]
+        seconds = [s["seconds"] for s in samples]
+        rss = [s["maxrss_mb"] for s in samples]
+        print(
+            f"{name:6s} median={statistics.median(seconds):.3f}s "
+            f"min={min(seconds):.3f}s rss={statistics.median(rss):.0f}MB "
+            f"torch_loaded={samples[-1]['torch']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
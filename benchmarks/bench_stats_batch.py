@@ -0,0 +1,123 @@
+"""
+Sequential versus thread fan-out timing for POST /stats/batch.
+
+Builds a StatsCube from the shipped reload/data CSVs (repeated --scale
+times, each copy in its own years) without touching the database, then
+answers the six stats of a batch two ways:
+
+  sequential - one after another inside stats_cube.snapshot(), as the
+               endpoint does
+  threads    - one thread per stat through a ThreadPoolExecutor
+
+Both are timed with warm aggregates and right after a write (cold
+aggregates, the case a reload or section write leaves behind).
+
+Usage:
+    python benchmarks/bench_stats_batch.py --scale 200 --runs 20
+"""
+
+import argparse
+import csv
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from API.services.stats_cube import Fact, StatsCube  # noqa: E402
+
+DATA = os.path.join(ROOT, "reload", "data")
+
+
+def read(name):
+    with open(os.path.join(DATA, name + ".csv")) as f:
+        return list(csv.DictReader(f))
+
+
+def build_cube(scale):
+    rooms = {int(r["rid"]): r for r in read("room")}
+    classes = {int(c["cid"]): c for c in read("class")}
+    meetings = {int(m["mid"]): m for m in read("meeting")}
+    cube = StatsCube(ttl=float("inf"))
+    sid = 0
+    for copy in range(scale):
+        for s in read("section"):
+            sid += 1
+            r = rooms.get(int(s["roomid"]), {})
+            c = classes.get(int(s["cid"]), {})
+            m = meetings.get(int(s["mid"]))
+            minutes = None
+            if m:
+                start = datetime.strptime(m["starttime"], "%H:%M:%S")
+                end = datetime.strptime(m["endtime"], "%H:%M:%S")
+                minutes = (end - start).seconds / 60
+            cube._put(Fact(
+                sid, str(int(s["years"]) + copy), s["semester"], int(s["capacity"]),
+                int(s["roomid"]), r.get("building"), r.get("room_number"), int(r["capacity"]) if r else None,
+                int(s["cid"]), c.get("cname"), c.get("ccode"),
+                int(s["mid"]), m["cdays"] if m else None, minutes,
+            ))
+    cube._classCodes = {cid: c["cname"] + c["ccode"] for cid, c in classes.items()}
+    cube._prereqClasses = {int(r["classid"]) for r in read("requisite") if r["prereq"] == "true"}
+    cube._loadedAt = time.monotonic()
+    cube._prereqsDirty = False
+    return cube, sid
+
+
+def batch(cube):
+    return [
+        lambda: cube.getSectionsByDay(),
+        lambda: cube.getTopDepartments(limit=3),
+        lambda: cube.getTopRoomsByUtilization(),
+        lambda: cube.getMultiRoomClasses(),
+        lambda: cube.getLongestAverageMeetingDuration(),
+        lambda: cube.getClassesWithoutPrereqs(),
+    ]
+
+
+def sequential(cube):
+    with cube.snapshot():
+        return [stat() for stat in batch(cube)]
+
+
+def threads(cube, pool):
+    return [f.result() for f in [pool.submit(stat) for stat in batch(cube)]]
+
+
+def cool(cube):
+    for partition in cube._partitions.values():
+        partition._aggregates = None
+
+
+def measure(label, run, runs, before=None):
+    times = []
+    for _ in range(runs):
+        if before:
+            before()
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000)
+    print(f"{label:22s} p50={statistics.median(times):.2f}ms max={max(times):.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    cube, sections = build_cube(args.scale)
+    print(f"{sections} sections in {len(cube._partitions)} partitions, {args.runs} runs")
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        measure("sequential warm", lambda: sequential(cube), args.runs)
+        measure("threads warm", lambda: threads(cube, pool), args.runs)
+        measure("sequential cold", lambda: sequential(cube), args.runs, lambda: cool(cube))
+        measure("threads cold", lambda: threads(cube, pool), args.runs, lambda: cool(cube))
+
+
+if __name__ == "__main__":
+    main()
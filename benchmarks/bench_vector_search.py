@@ -0,0 +1,110 @@
+"""
+Recall-versus-latency benchmark for syllabus vector search.
+
+Uses stored chunk embeddings (plus a little noise) as queries, takes the
+exact sequential scan as ground truth and reports recall@k and latency for
+each search-time knob of the ANN index that matches --metric:
+
+  hnsw     - sweeps hnsw.ef_search
+  ivfflat  - sweeps ivfflat.probes
+
+It then repeats the queries filtered to the course each one was taken from
+(the chatbot's search) and reports recall and how many of the k rows came
+back. Filtered searches skip the ANN index, so they should always be full.
+
+Build the index first (create_tables.sql or POST /lacy/api/syllabus/index).
+Keep a single index per metric while measuring, otherwise the planner picks
+one of them for every knob value.
+
+Usage:
+    python benchmarks/bench_vector_search.py --queries 50 --k 5 --metric l2
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from API.dao.syllabus import SyllabusDAO, from_vector_binary  # noqa: E402
+
+SWEEPS = {
+    "hnsw": ("ef_search", [10, 20, 40, 80, 160, 320]),
+    "ivfflat": ("probes", [1, 2, 5, 10, 20, 50]),
+}
+
+
+def sample_queries(dao, count, noise, seed):
+    rows = [row for row in dao.streamChunks(include_embedding=True, binary=True) if row[3] is not None]
+    if not rows:
+        sys.exit("syllabus table has no embeddings to query with")
+    rng = random.Random(seed)
+    picked = rng.sample(rows, min(count, len(rows)))
+    queries = [[x + rng.gauss(0, noise) for x in from_vector_binary(row[3]).tolist()] for row in picked]
+    return queries, [row[1] for row in picked]
+
+
+def timed_search(dao, queries, k, courseids=None, **knobs):
+    results, latencies = [], []
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        if courseids is None:
+            rows = dao.getFragments(query, k, **knobs)
+        else:
+            rows = dao.getFragmentsByCourseAndEmbedding(courseids[i], query, k, **knobs)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({row[0] for row in rows})
+    return results, latencies
+
+
+def report(label, latencies, recall=None, filled=None):
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    recall_text = f"recall@k={recall:.3f} " if recall is not None else ""
+    filled_text = f"rows/k={filled:.3f} " if filled is not None else ""
+    print(f"{label:22s} {recall_text}{filled_text}p50={statistics.median(latencies):.2f}ms p95={p95:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--metric", choices=["l2", "cosine", "ip"], default="l2")
+    parser.add_argument("--noise", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dao = SyllabusDAO()
+    queries, courseids = sample_queries(dao, args.queries, args.noise, args.seed)
+    print(f"{len(queries)} queries, k={args.k}, metric={args.metric}")
+
+    truth, latencies = timed_search(dao, queries, args.k, metric=args.metric, exact=True)
+    report("exact scan", latencies)
+
+    methods = {definition.split(" USING ")[1].split(" ")[0] for name, definition in dao.getVectorIndexes()
+               if name.endswith(f"_{args.metric}")}
+    if not methods:
+        print(f"no HNSW/IVFFlat index for metric {args.metric}; nothing to compare")
+    for method in sorted(methods):
+        knob, values = SWEEPS[method]
+        for value in values:
+            found, latencies = timed_search(dao, queries, args.k, metric=args.metric, **{knob: value})
+            recall = statistics.mean(len(f & t) / len(t) for f, t in zip(found, truth) if t)
+            report(f"{method} {knob}={value}", latencies, recall)
+
+    # Filtered by course: ground truth is the exact scan over that course's chunks
+    truth, latencies = timed_search(dao, queries, args.k, courseids, metric=args.metric, exact=True)
+    report("course exact", latencies)
+    found, latencies = timed_search(dao, queries, args.k, courseids, metric=args.metric)
+    recall = statistics.mean(len(f & t) / len(t) for f, t in zip(found, truth) if t)
+    filled = statistics.mean(len(f) / len(t) for f, t in zip(found, truth) if t)
+    report("course filtered", latencies, recall, filled)
+    dao.close()
+
+
+if __name__ == "__main__":
+    main()
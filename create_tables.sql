@@ -46,8 +46,49 @@ CREATE TABLE IF NOT EXISTS syllabus (
     chunkid SERIAL PRIMARY KEY,
     courseid INT REFERENCES class (cid),
     embedding_text vector (768),
-    chunk TEXT
+    chunk TEXT,
+    -- set by the ingestion pipeline (NULL for chunks added through the API)
+    chunk_hash CHAR(64),
+    model VARCHAR(100)
 );
+-- Databases created before ingestion tracked content hashes
+ALTER TABLE syllabus ADD COLUMN IF NOT EXISTS chunk_hash CHAR(64);
+ALTER TABLE syllabus ADD COLUMN IF NOT EXISTS model VARCHAR(100);
+
+-- Last ingested syllabus PDF of each course
+CREATE TABLE IF NOT EXISTS syllabus_file (
+    courseid INT PRIMARY KEY REFERENCES class (cid),
+    filename VARCHAR(250) NOT NULL,
+    file_hash CHAR(64) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    chunk_count INT NOT NULL,
+    ingested_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+-- Approximate nearest-neighbour index for syllabus retrieval (L2, the default
+-- VECTOR_METRIC). Other metrics/methods can be built via POST /syllabus/index.
+CREATE INDEX IF NOT EXISTS syllabus_embedding_hnsw_l2 ON syllabus
+    USING hnsw (embedding_text vector_l2_ops) WITH (m = 16, ef_construction = 64);
+CREATE INDEX IF NOT EXISTS syllabus_courseid_idx ON syllabus (courseid);
+
+-- Bumped on every change to syllabus so in-process vector indexes know when to reload
+CREATE TABLE IF NOT EXISTS syllabus_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL DEFAULT 0
+);
+INSERT INTO syllabus_version (id, version) VALUES (TRUE, 0) ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_syllabus_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE syllabus_version SET version = version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS syllabus_version_bump ON syllabus;
+CREATE TRIGGER syllabus_version_bump
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON syllabus
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_syllabus_version();
 
 CREATE TABLE IF NOT EXISTS requisite (
     classid INT REFERENCES class (cid),
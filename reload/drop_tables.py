@@ -4,6 +4,8 @@ from db import DB
 
 DROP_ORDER = [
     "syllabus",
+    "syllabus_version",
+    "syllabus_file",
     "db_user",
     "section",
     "requisite",
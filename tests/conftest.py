@@ -0,0 +1,30 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# API.config.pgconfig reads this at import time; the tests never open a connection
+os.environ.setdefault("DB_PORT", "5432")
+
+
+class FakeDAO:
+    """
+    Stands in for a DAO class: calling it returns itself, it works as a
+    with-block, and each keyword becomes a method.
+    """
+
+    def __init__(self, **methods):
+        self.__dict__.update(methods)
+
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def close(self):
+        pass
@@ -0,0 +1,69 @@
+import Chatbot.llm.answer_cache as answer_cache_module
+from Chatbot.llm.answer_cache import AnswerCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def fragments(*chunkids, courseid=1):
+    return [(chunkid, courseid, f"chunk {chunkid}") for chunkid in chunkids]
+
+
+def test_hit_needs_same_chunks_and_similar_question():
+    cache = AnswerCache(threshold=0.95)
+    cache.put(1, fragments(1, 2), [1.0, 0.0], "ana", "Answer")
+    assert cache.get(1, fragments(1, 2), [1.0, 0.01], "ana") == "Answer"
+    assert cache.get(1, fragments(1, 3), [1.0, 0.0], "ana") is None
+    assert cache.get(1, fragments(1, 2), [0.0, 1.0], "ana") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_username_replaced_as_whole_word_only():
+    cache = AnswerCache()
+    cache.put(1, fragments(1), [1.0, 0.0], "ana", "Hi ana! Data analysis with banana.")
+    assert cache.get(1, fragments(1), [1.0, 0.0], "luis") == "Hi luis! Data analysis with banana."
+
+
+def test_expired_entries_then_overflow(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(answer_cache_module.time, "time", clock)
+    cache = AnswerCache(max_entries=2, ttl=10)
+    cache.put(1, fragments(1), [1.0, 0.0], "ana", "first")
+    cache.put(1, fragments(2), [1.0, 0.0], "ana", "second")
+    clock.now += 11
+    # Both lookups find only expired entries, which empties their buckets
+    assert cache.get(1, fragments(1), [1.0, 0.0], "ana") is None
+    assert cache.get(1, fragments(2), [1.0, 0.0], "ana") is None
+    assert cache.stats()["entries"] == 0
+
+    for chunkid in range(3, 7):
+        cache.put(1, fragments(chunkid), [1.0, 0.0], "ana", f"answer {chunkid}")
+    assert cache.stats()["entries"] == 2
+    assert cache.get(1, fragments(5), [1.0, 0.0], "ana") == "answer 5"
+    assert cache.get(1, fragments(6), [1.0, 0.0], "ana") == "answer 6"
+    assert cache.get(1, fragments(3), [1.0, 0.0], "ana") is None
+
+
+def test_eviction_is_least_recently_used():
+    cache = AnswerCache(max_entries=2)
+    cache.put(1, fragments(1), [1.0, 0.0], "ana", "one")
+    cache.put(1, fragments(2), [1.0, 0.0], "ana", "two")
+    assert cache.get(1, fragments(1), [1.0, 0.0], "ana") == "one"
+    cache.put(1, fragments(3), [1.0, 0.0], "ana", "three")
+    assert cache.get(1, fragments(2), [1.0, 0.0], "ana") is None
+    assert cache.get(1, fragments(1), [1.0, 0.0], "ana") == "one"
+
+
+def test_invalidate_course_drops_answers_built_from_it():
+    cache = AnswerCache()
+    cache.put(1, fragments(1, courseid=2), [1.0, 0.0], "ana", "uses course 2")
+    cache.put(1, fragments(3), [1.0, 0.0], "ana", "course 1 only")
+    cache.invalidateCourse(2)
+    assert cache.get(1, fragments(1, courseid=2), [1.0, 0.0], "ana") is None
+    assert cache.get(1, fragments(3), [1.0, 0.0], "ana") == "course 1 only"
+    assert cache.stats()["entries"] == 1
@@ -0,0 +1,77 @@
+import threading
+
+import numpy as np
+import pytest
+
+from Chatbot.llm.encode_batcher import EncodeBatcher
+
+CALLERS = 8
+
+
+class FakeModel:
+    """SentenceTransformer stand-in: one row per text, [len(text), index in batch]."""
+
+    def __init__(self, *args, **kwargs):
+        self.batches = []
+
+    def encode(self, texts, **kwargs):
+        self.batches.append(len(texts))
+        return np.array([[len(text), i] for i, text in enumerate(texts)], dtype=np.float32)
+
+
+def run_concurrently(encode):
+    """Calls encode(text) from CALLERS threads released at once; returns {text: vector}."""
+    barrier = threading.Barrier(CALLERS)
+    results = {}
+
+    def call(text):
+        barrier.wait()
+        results[text] = encode(text)
+
+    threads = [threading.Thread(target=call, args=("q" * (i + 1),)) for i in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_bound_methods_of_one_model_share_a_batch():
+    model = FakeModel()
+    batcher = EncodeBatcher(max_batch=16, max_wait=0.2)
+    # model.encode is a new bound-method object on every call, as in ChatOllamaBot
+    results = run_concurrently(lambda text: batcher.encode(text, model.encode, timeout=5))
+    assert batcher.stats()["max_batch_seen"] > 1
+    assert batcher.stats()["batches"] < CALLERS
+    for text, vector in results.items():
+        assert vector[0] == len(text)
+
+
+def test_different_functions_are_not_mixed():
+    first, second = FakeModel(), FakeModel()
+    batcher = EncodeBatcher(max_batch=16, max_wait=0.2)
+    results = run_concurrently(
+        lambda text: batcher.encode(text, (first if len(text) % 2 else second).encode, timeout=5)
+    )
+    assert sum(first.batches) == sum(second.batches) == CALLERS // 2
+    for text, vector in results.items():
+        assert vector[0] == len(text)
+
+
+def test_chatbot_encode_batches_concurrent_queries(monkeypatch):
+    pytest.importorskip("sentence_transformers")
+    pytest.importorskip("langchain_ollama")
+    from langchain_core.runnables import RunnableLambda
+    import Chatbot.llm.chatollama as chatollama
+
+    monkeypatch.setattr(chatollama, "SentenceTransformer", FakeModel)
+    monkeypatch.setattr(chatollama, "ChatOllama", lambda **kwargs: RunnableLambda(str))
+    batcher = EncodeBatcher(max_batch=16, max_wait=0.2)
+    monkeypatch.setattr(chatollama, "query_batcher", batcher)
+    bot = chatollama.ChatOllamaBot()
+
+    results = run_concurrently(bot.encode)
+    assert batcher.stats()["max_batch_seen"] > 1
+    assert len(bot.model.batches) < CALLERS
+    for text, vector in results.items():
+        assert vector[0] == len(text)
@@ -0,0 +1,56 @@
+import psycopg2.extensions
+import psycopg2.pool
+
+from API.config.pgpool import PgPool
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.info = self
+
+    @property
+    def transaction_status(self):
+        return psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+    def rollback(self):
+        pass
+
+
+def make_pool(monkeypatch, minconn, maxconn):
+    opened = []
+
+    def connect(*args, **kwargs):
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    monkeypatch.setattr(psycopg2.pool.psycopg2, "connect", connect)
+    return PgPool(minconn, maxconn), opened
+
+
+def test_returned_connections_stay_open_up_to_maxconn(monkeypatch):
+    pg_pool, opened = make_pool(monkeypatch, minconn=1, maxconn=4)
+    assert len(opened) == 1
+    for _ in range(5):
+        # Four requests at once, then all of them return their connection
+        conns = [pg_pool.getconn() for _ in range(4)]
+        for conn in conns:
+            pg_pool.putconn(conn)
+    # Only the first burst had to connect
+    assert len(opened) == 4
+    assert not any(conn.closed for conn in opened)
+    stats = pg_pool.stats()
+    assert stats["idle"] == 4
+    assert stats["in_use"] == 0
+
+
+def test_closed_connections_are_replaced(monkeypatch):
+    pg_pool, opened = make_pool(monkeypatch, minconn=1, maxconn=2)
+    conn = pg_pool.getconn()
+    conn.close()
+    pg_pool.putconn(conn)
+    assert pg_pool.getconn() is not conn
+    assert len(opened) == 2
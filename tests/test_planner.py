@@ -0,0 +1,118 @@
+import API.services.planner as planner_module
+import API.services.requisite_graph as requisite_module
+from API.services.planner import CurriculumPlanner
+from API.services.requisite_graph import RequisiteGraph
+from conftest import FakeDAO
+
+# cid: (term, years, cred)
+CATALOG = {
+    1: ("First Semester, Second Semester", "Every Year", 3),
+    2: ("First Semester", "Every Year", 3),
+    3: ("Second Semester", "Even Years", 3),
+    4: ("Second Semester", "Odd Years", 3),
+    5: ("First Semester", "Even Years", 3),
+    6: ("None", "None", 0),
+    7: ("According to Demand", "According to Demand", 3),
+    8: ("First Semester", "Every Year", 1),
+}
+
+
+def make_planner(monkeypatch, requisites=()):
+    rows = [(cid, "CIIC", str(3000 + cid), "", term, years, cred, None)
+            for cid, (term, years, cred) in CATALOG.items()]
+    monkeypatch.setattr(planner_module, "ClassDAO", FakeDAO(getAllClasses=lambda: rows))
+    monkeypatch.setattr(requisite_module, "RequisiteDAO", FakeDAO(getAllRequisites=lambda: list(requisites)))
+    graph = RequisiteGraph()
+    monkeypatch.setattr(planner_module, "requisite_graph", graph)
+    return CurriculumPlanner()
+
+
+def placed(result):
+    """cid -> (semester, year) of every class in the plan."""
+    return {c["cid"]: (term["semester"], term["year"]) for term in result["plan"] for c in term["classes"]}
+
+
+def test_odd_and_even_years(monkeypatch):
+    planner = make_planner(monkeypatch)
+    planner._ensureLoaded()
+    # Spring 2026 is an even year, Spring 2027 an odd one
+    assert planner.isOffered(3, "Spring", 2026)
+    assert not planner.isOffered(3, "Spring", 2027)
+    assert planner.isOffered(4, "Spring", 2027)
+    assert not planner.isOffered(4, "Spring", 2026)
+    assert planner.isOffered(5, "Fall", 2026)
+    assert not planner.isOffered(5, "Fall", 2025)
+    assert not planner.isOffered(5, "Spring", 2026)
+
+
+def test_even_years_class_waits_for_even_year(monkeypatch):
+    planner = make_planner(monkeypatch)
+    # Fall 2025, Spring 2026, Fall 2026: the Fall even-year class lands in Fall 2026
+    result = planner.plan([5], start_semester="Fall", start_year=2025)
+    assert placed(result) == {5: ("Fall", 2026)}
+    assert result["lower_bound"] == 3
+    assert result["semesters"] == 3
+    assert result["infeasible"] == []
+
+
+def test_never_offered_class_is_infeasible(monkeypatch):
+    planner = make_planner(monkeypatch, [(1, 6, True)])
+    planner._ensureLoaded()
+    assert not planner.isOffered(6, "Fall", 2025)
+    assert not planner.isOffered(6, "Spring", 2026)
+    result = planner.plan([1])
+    # Neither the authorization nor the class that needs it is placed
+    assert result["infeasible"] == [1, 6]
+    assert result["unscheduled"] == [1, 6]
+    assert result["lower_bound"] is None
+    assert result["plan"] == []
+
+
+def test_target_outside_horizon_is_infeasible(monkeypatch):
+    planner = make_planner(monkeypatch)
+    # Fall 2025 only: the even-year Fall class is not offered within one semester
+    result = planner.plan([5, 2], start_semester="Fall", start_year=2025, max_semesters=1)
+    assert result["infeasible"] == [5]
+    assert result["lower_bound"] is None
+    assert placed(result) == {2: ("Fall", 2025)}
+
+
+def test_according_to_demand_is_always_offered(monkeypatch):
+    planner = make_planner(monkeypatch)
+    result = planner.plan([7], start_semester="Spring", start_year=2026)
+    assert placed(result) == {7: ("Spring", 2026)}
+
+
+def test_corequisite_is_taken_in_the_same_semester(monkeypatch):
+    planner = make_planner(monkeypatch, [(1, 2, False)])
+    result = planner.plan([1], start_semester="Fall", start_year=2025)
+    assert placed(result) == {1: ("Fall", 2025), 2: ("Fall", 2025)}
+    assert result["lower_bound"] == 1
+    assert result["semesters"] == 1
+
+
+def test_prerequisite_is_taken_in_an_earlier_semester(monkeypatch):
+    planner = make_planner(monkeypatch, [(1, 2, True)])
+    result = planner.plan([1], start_semester="Fall", start_year=2025)
+    assert placed(result) == {2: ("Fall", 2025), 1: ("Spring", 2026)}
+    assert result["lower_bound"] == 2
+
+
+def test_corequisite_never_after_its_class(monkeypatch):
+    # 1 needs 4 (Spring, odd years) with it and 8 (Fall) before it
+    planner = make_planner(monkeypatch, [(1, 4, False), (1, 8, True)])
+    result = planner.plan([1], max_credits=3, start_semester="Fall", start_year=2025)
+    terms = placed(result)
+    order = [(term["semester"], term["year"]) for term in result["plan"]]
+    assert order.index(terms[8]) < order.index(terms[1])
+    assert order.index(terms[4]) <= order.index(terms[1])
+    assert terms[4] == ("Spring", 2027)
+    assert all(term["credits"] <= 3 for term in result["plan"])
+    assert result["unscheduled"] == []
+
+
+def test_corequisite_of_infeasible_class_is_infeasible(monkeypatch):
+    planner = make_planner(monkeypatch, [(1, 6, False)])
+    result = planner.plan([1])
+    assert result["infeasible"] == [1, 6]
+    assert result["lower_bound"] is None
@@ -0,0 +1,91 @@
+import random
+
+import flask
+import pytest
+
+import API.handlers.requisite as requisite_handler
+import API.services.requisite_graph as requisite_module
+from API.services.requisite_graph import RequisiteGraph
+from conftest import FakeDAO
+
+
+def load(monkeypatch, edges):
+    rows = [(classid, reqid, True) for classid, reqid in edges]
+    monkeypatch.setattr(requisite_module, "RequisiteDAO", FakeDAO(getAllRequisites=lambda: rows))
+    graph = RequisiteGraph()
+    graph.requisites(0)
+    return graph
+
+
+def reachable(edges, start):
+    """Brute-force set of classes reachable from `start` along edges."""
+    seen, stack = set(), [start]
+    while stack:
+        cid = stack.pop()
+        for classid, reqid in edges:
+            if classid == cid and reqid not in seen:
+                seen.add(reqid)
+                stack.append(reqid)
+    return seen
+
+
+def test_rejects_cycles_of_any_length(monkeypatch):
+    graph = load(monkeypatch, [(1, 2), (2, 3), (3, 4)])
+    assert graph.wouldCycle(4, 1)
+    assert graph.cyclePath(4, 1) == [1, 2, 3, 4]
+    assert graph.wouldCycle(2, 1)
+    assert graph.wouldCycle(3, 3)
+    assert not graph.wouldCycle(1, 4)
+    assert graph.cyclePath(1, 4) is None
+
+
+def test_closure_after_delete(monkeypatch):
+    graph = load(monkeypatch, [(1, 2), (2, 3), (1, 3), (3, 4)])
+    graph.removeEdge(2, 3)
+    assert graph.ancestors(1) == [2, 3, 4]
+    assert graph.ancestors(2) == []
+    assert graph.descendants(3) == [1]
+    graph.removeEdge(1, 3)
+    assert graph.ancestors(1) == [2]
+    assert graph.descendants(4) == [3]
+    assert not graph.wouldCycle(4, 1)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_closure_matches_brute_force_under_random_edits(monkeypatch, seed):
+    rng = random.Random(seed)
+    nodes = list(range(1, 13))
+    edges = set()
+    graph = load(monkeypatch, [])
+    for _ in range(80):
+        classid, reqid = rng.sample(nodes, 2)
+        if edges and rng.random() < 0.35:
+            classid, reqid = rng.choice(sorted(edges))
+            edges.discard((classid, reqid))
+            graph.removeEdge(classid, reqid)
+        elif not graph.wouldCycle(classid, reqid):
+            assert classid not in reachable(edges, reqid)
+            edges.add((classid, reqid))
+            graph.addEdge(classid, reqid)
+        else:
+            assert classid in reachable(edges, reqid)
+        for cid in nodes:
+            assert graph.ancestors(cid) == sorted(reachable(edges, cid))
+            assert graph.descendants(cid) == sorted(c for c in nodes if cid in reachable(edges, c))
+
+
+def test_database_guard_rejects_cycle_missed_by_stale_graph(monkeypatch):
+    # This process's graph has not seen 2 -> 1, which another worker already wrote
+    graph = load(monkeypatch, [])
+    monkeypatch.setattr(requisite_handler, "requisite_graph", graph)
+    dao = FakeDAO(classExists=lambda cid: (cid,), pairExists=lambda classid, reqid: None,
+                  insertRequisite=lambda classid, reqid, prereq: -1)
+    monkeypatch.setattr(requisite_handler, "RequisiteDAO", dao)
+    monkeypatch.setattr(requisite_module, "RequisiteDAO", FakeDAO(getAllRequisites=lambda: [(2, 1, True)]))
+
+    with flask.Flask(__name__).app_context():
+        response, status = requisite_handler.RequisiteHandler().insertRequisite(
+            {"classid": 1, "reqid": 2, "prereq": True}
+        )
+    assert status == 409
+    assert response.get_json() == "CONFLICT: cycle detected (1 -> 2 -> 1)"
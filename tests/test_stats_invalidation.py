@@ -0,0 +1,62 @@
+import flask
+
+import API.handlers.classes as class_handler
+import API.handlers.section as section_handler
+from API.services.stats_cache import StatsCache
+from conftest import FakeDAO
+
+
+class FakeCube:
+    """
+    Stands in for stats_cube. Every update runs a /stats read right before
+    and right after it changes the data, the way a concurrent request could.
+    """
+
+    def __init__(self, cache, endpoint):
+        self.cache = cache
+        self.endpoint = endpoint
+        self.value = "before"
+
+    def read(self):
+        return self.cache.getOrCompute(self.endpoint, lambda: self.value)
+
+    def update(self, *args):
+        self.read()
+        self.value = "after"
+        self.read()
+
+    refreshSection = update
+    invalidate = update
+
+
+def install(monkeypatch, module, endpoint):
+    cache = StatsCache()
+    cube = FakeCube(cache, endpoint)
+    monkeypatch.setattr(module, "stats_cache", cache)
+    monkeypatch.setattr(module, "stats_cube", cube)
+    return cube
+
+
+def test_section_write_does_not_cache_pre_write_stats(monkeypatch):
+    cube = install(monkeypatch, section_handler, "sections-by-day")
+    monkeypatch.setattr(section_handler, "room_schedule", FakeDAO(removeSection=lambda sid: None))
+    monkeypatch.setattr(section_handler, "SectionDAO", FakeDAO(
+        getSectionByID=lambda sid: (sid, 1, 1, 1, "Fall", "2025", 30),
+        deleteSection=lambda sid: sid,
+    ))
+    cube.read()
+    with flask.Flask(__name__).app_context():
+        _, status = section_handler.SectionHandler().deleteSection(7)
+    assert status == 204
+    assert cube.read() == "after"
+
+
+def test_class_write_does_not_cache_pre_write_stats(monkeypatch):
+    cube = install(monkeypatch, class_handler, "classes-without-prereqs")
+    monkeypatch.setattr(class_handler, "ClassDAO", FakeDAO(deleteClass=lambda cid: cid))
+    monkeypatch.setattr(class_handler, "curriculum_planner", FakeDAO(invalidate=lambda: None))
+    cube.read()
+    with flask.Flask(__name__).app_context():
+        _, status = class_handler.ClassHandler().deleteClass(3)
+    assert status == 204
+    assert cube.read() == "after"
@@ -0,0 +1,102 @@
+import itertools
+import random
+from datetime import time
+
+import pytest
+
+from API.services.timetable import build_options, generate_timetables, meeting_mask, score
+
+DAYS = ["LWV", "MJ", "L", "W", "MJS", "LMWJV"]
+
+
+def overlaps(a, b):
+    """Plain day/interval comparison, independent of the bitmasks."""
+    return bool(set(a.cdays) & set(b.cdays)) and a.start < b.end and b.start < a.end
+
+
+def brute_force(options):
+    """Every conflict-free choice of one option per class, by itertools.product."""
+    found = []
+    for choice in itertools.product(*options.values()):
+        if not any(overlaps(a, b) for a, b in itertools.combinations(choice, 2)):
+            found.append(choice)
+    return found
+
+
+def random_rows(rng, classes, sections):
+    rows, sid = [], 0
+    for cid in range(1, classes + 1):
+        for _ in range(rng.randint(1, sections)):
+            sid += 1
+            start = rng.randint(7, 18) * 60 + rng.choice([0, 30])
+            length = rng.choice([50, 80, 110])
+            rows.append((
+                sid, cid, 1, 40, sid, rng.choice(DAYS),
+                time(start // 60, start % 60), time((start + length) // 60, (start + length) % 60),
+            ))
+    return rows
+
+
+def test_mask_overlap_is_half_open():
+    ten, eleven, noon = 10 * 3600, 11 * 3600, 12 * 3600
+    assert not meeting_mask("L", ten, eleven) & meeting_mask("L", eleven, noon)
+    assert meeting_mask("L", ten, eleven + 60) & meeting_mask("L", eleven, noon)
+    assert not meeting_mask("L", ten, noon) & meeting_mask("M", ten, noon)
+
+
+def test_score_counts_gaps_and_earliest_start():
+    # 8:00-9:00 and 10:00-11:00 on Monday leave one idle hour
+    mask = meeting_mask("L", 8 * 3600, 9 * 3600) | meeting_mask("L", 10 * 3600, 11 * 3600)
+    assert score(mask) == (60, 8 * 60)
+    assert score(mask | meeting_mask("M", 7 * 3600, 8 * 3600)) == (60, 7 * 60)
+
+
+def test_sections_with_the_same_meeting_share_an_option():
+    rows = [
+        (1, 10, 1, 40, 5, "LWV", time(8), time(8, 50)),
+        (2, 10, 2, 40, 6, "LWV", time(8), time(8, 50)),
+        (3, 10, 3, 40, 7, "MJ", time(8), time(9, 20)),
+    ]
+    options = build_options(rows)
+    assert [option.sids for option in options[10]] == [[1, 2], [3]]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_count_and_ranking_match_brute_force(seed):
+    rng = random.Random(seed)
+    options = build_options(random_rows(rng, rng.randint(1, 5), 5))
+    expected = brute_force(options)
+
+    count, truncated, best = generate_timetables(options, limit=len(expected) + 1)
+    assert count == len(expected)
+    assert not truncated
+    for gaps, earliest, chosen in best:
+        assert not any(overlaps(a, b) for a, b in itertools.combinations(chosen, 2))
+        assert sorted(option.cid for option in chosen) == sorted(options)
+        mask = 0
+        for option in chosen:
+            mask |= option.mask
+        assert (gaps, earliest) == score(mask)
+    # Fewest gaps first, then earliest start; conflict-free masks are disjoint, so summing ORs them
+    expected_scores = sorted(score(sum(option.mask for option in choice)) for choice in expected)
+    assert [(gaps, earliest) for gaps, earliest, _ in best] == expected_scores
+
+
+def test_limit_keeps_the_best_timetables():
+    rng = random.Random(7)
+    options = build_options(random_rows(rng, 4, 6))
+    expected = brute_force(options)
+    _, _, everything = generate_timetables(options, limit=len(expected))
+    count, _, best = generate_timetables(options, limit=3)
+    assert count == len(expected)
+    assert [(g, e) for g, e, _ in best] == [(g, e) for g, e, _ in everything[:3]]
+
+
+def test_truncates_at_max_combinations():
+    rows = [(cid * 10 + day, cid, 1, 40, cid * 10 + day, cdays, time(7 + cid * 2), time(8 + cid * 2))
+            for cid in range(1, 4) for day, cdays in enumerate(["L", "M", "W", "J"])]
+    options = build_options(rows)
+    assert len(brute_force(options)) == 64
+    count, truncated, _ = generate_timetables(options, max_combinations=10)
+    assert count == 10
+    assert truncated